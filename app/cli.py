@@ -0,0 +1,279 @@
+"""Offline maintenance commands that work on the database directly, without Telegram.
+
+    python -m app.cli import words data/prohibited_words.txt --group 0
+    python -m app.cli import members members.csv.gz
+    python -m app.cli export events --group -1001234567890 --format csv --output events.csv.gz
+    python -m app.cli maintenance
+    python -m app.cli evaluate corpus.jsonl --words data/new_words.txt --workers 8
+    python -m app.cli word-stats --group 0 --unused-days 90
+
+Files ending in .gz are compressed and decompressed on the fly. Running bots pick up
+imported words on their next cache refresh or restart.
+"""
+import argparse
+import asyncio
+import contextlib
+import gzip
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.logging_config import setup_logging
+from app.services.export import EXPORT_FORMATS, EXPORTS, write_export
+from app.services.groups import GLOBAL_SCOPE
+from app.services.moderation_maintenance import run_maintenance
+from app.services.prohibited import normalize_input, parse_words_from_file
+from app.services.word_eval import EvalResult, evaluate_corpus
+from app.services.word_import import DOWNLOAD_CHUNK_SIZE, IMPORT_FORMATS, ImportResult, document_words, import_words
+from app.services.word_stats import disable_unused_words, noisiest_words, unused_words
+
+logger = logging.getLogger(__name__)
+
+CREATE_MEMBER_STAGING_SQL = """
+CREATE TEMP TABLE member_import (
+    group_id BIGINT NOT NULL,
+    user_id BIGINT NOT NULL,
+    approved_at TIMESTAMPTZ NOT NULL
+) ON COMMIT DROP
+"""
+
+MERGE_MEMBERS_SQL = """
+INSERT INTO approved_members (group_id, user_id, approved_at)
+SELECT DISTINCT ON (group_id, user_id) group_id, user_id, approved_at
+FROM member_import
+ORDER BY group_id, user_id, approved_at
+ON CONFLICT (group_id, user_id) DO NOTHING
+"""
+
+
+def open_file(path: Path, mode: str) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    return path.open(mode)
+
+
+def data_suffix(path: Path) -> str:
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    return suffixes[-1] if suffixes else ""
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    # Decompression and disk reads run in a thread, one chunk at a time.
+    source = await asyncio.to_thread(open_file, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(source.read, DOWNLOAD_CHUNK_SIZE):
+            yield chunk
+    finally:
+        source.close()
+
+
+async def driver_connection(session: AsyncSession):
+    # COPY is only exposed by asyncpg itself; it must share the session's transaction.
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+async def begin_bulk(session: AsyncSession) -> None:
+    # DB_STATEMENT_TIMEOUT_MS is meant for the bot's per-update queries.
+    await session.execute(text("SET LOCAL statement_timeout = 0"))
+
+
+async def report(progress: ImportResult) -> None:
+    print("merging…" if progress.merging else f"read {progress.read}", file=sys.stderr)
+
+
+async def import_word_file(path: Path, group_id: int) -> None:
+    suffix = data_suffix(path)
+    if suffix not in IMPORT_FORMATS:
+        raise SystemExit(f"Unsupported word file: {path} (expected {', '.join(IMPORT_FORMATS)})")
+    async with AsyncSessionLocal() as session:
+        await begin_bulk(session)
+        result = await import_words(
+            session, group_id, 0, document_words(read_chunks(path), suffix), normalize_input, progress=report
+        )
+    print(
+        f"read={result.read} added={result.added} reenabled={result.reenabled} "
+        f"unchanged={result.unchanged} duplicates={result.duplicates} skipped={result.skipped}"
+    )
+
+
+async def import_member_file(path: Path) -> None:
+    # CSV in the layout of `export members --format csv`.
+    async with AsyncSessionLocal() as session:
+        await begin_bulk(session)
+        await session.execute(text(CREATE_MEMBER_STAGING_SQL))
+        connection = await driver_connection(session)
+        await connection.copy_to_table(
+            "member_import", source=read_chunks(path), columns=list(EXPORTS["members"].columns), format="csv", header=True
+        )
+        staged = await session.scalar(text("SELECT count(*) FROM member_import"))
+        result = await session.execute(text(MERGE_MEMBERS_SQL))
+        await session.commit()
+    print(f"read={staged} added={result.rowcount}")
+
+
+async def import_event_file(path: Path) -> None:
+    # CSV in the layout of `export events --format csv`; rows are routed to the monthly
+    # partitions, or the default one when a month is missing.
+    async with AsyncSessionLocal() as session:
+        await begin_bulk(session)
+        connection = await driver_connection(session)
+        status = await connection.copy_to_table(
+            "moderation_events", source=read_chunks(path), columns=list(EXPORTS["events"].columns), format="csv", header=True
+        )
+        await session.commit()
+    print(f"added={status.split()[-1]}")
+
+
+async def export_file(name: str, group_id: int, fmt: str, output: Path | None) -> None:
+    # Only a file opened here is closed here; stdout stays usable afterwards.
+    target_context = open_file(output, "wb") if output else contextlib.nullcontext(sys.stdout.buffer)
+    with target_context as target:
+        async with AsyncSessionLocal() as session:
+            await begin_bulk(session)
+            if fmt != "csv":
+                count = await write_export(session, name, group_id, fmt, target)
+            else:
+                # CSV is produced by the server with COPY, with no per-row work in Python.
+                query = EXPORTS[name].query(group_id).compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+
+                async def write(data: bytes) -> None:
+                    await asyncio.to_thread(target.write, data)
+
+                connection = await driver_connection(session)
+                try:
+                    status = await connection.copy_from_query(str(query), output=write, format="csv", header=True)
+                finally:
+                    await asyncio.to_thread(target.flush)
+                count = int(status.split()[-1])
+            await session.commit()
+    print(f"exported={count}", file=sys.stderr)
+
+
+async def word_stats(group_id: int, top: int, unused_days: int, disable: bool) -> None:
+    now = datetime.now(tz=timezone.utc)
+    async with AsyncSessionLocal() as session:
+        noisy = await noisiest_words(session, group_id, top)
+        unused = await unused_words(session, group_id, unused_days, now)
+        print(f"Most hits (top {top}):")
+        for usage in noisy:
+            last = f"{usage.last_hit_at:%Y-%m-%d}" if usage.last_hit_at else "never"
+            print(f"  {usage.hits:>8}  {usage.original}  (last {last})")
+        print(f"\nNo hits in {unused_days} days: {len(unused)}")
+        for usage in unused:
+            print(f"            {usage.original}")
+        if disable and unused:
+            disabled = await disable_unused_words(session, group_id, unused_days, now)
+            print(f"\ndisabled={disabled}")
+
+
+def print_evaluation(result: EvalResult, words: int, top: int) -> None:
+    print(
+        f"messages={result.messages} invalid={result.invalid} words={words} "
+        f"matched={result.matched} ({result.matched / max(result.messages, 1):.2%})"
+    )
+    if result.labelled:
+        print(f"labelled prohibited={result.labelled} caught={result.caught} ({result.caught / result.labelled:.2%})")
+    print(f"throughput={result.per_second:.0f} msg/s elapsed={result.elapsed:.2f}s")
+    print(f"\nHits per word (top {top}):")
+    for word, count in result.hits.most_common(top):
+        print(f"  {count:>8}  {word}")
+    print(f"\nFalse-positive candidates (hits on messages not labelled prohibited, top {top}):")
+    for word, count in result.unexpected.most_common(top):
+        print(f"  {count:>8}  {word}")
+        for sample in result.samples.get(word, []):
+            print(f"            | {sample}")
+
+
+def evaluate(args: argparse.Namespace) -> None:
+    words = parse_words_from_file(str(args.words))
+    if not words:
+        raise SystemExit(f"No words in {args.words}")
+    result = evaluate_corpus(args.corpus, words, args.workers)
+    print_evaluation(result, len(words), args.top)
+
+
+async def run(args: argparse.Namespace) -> None:
+    try:
+        if args.command == "import":
+            if args.dataset == "words":
+                await import_word_file(args.path, args.group)
+            elif args.dataset == "members":
+                await import_member_file(args.path)
+            else:
+                await import_event_file(args.path)
+        elif args.command == "export":
+            await export_file(args.dataset, args.group, args.format, args.output)
+        elif args.command == "word-stats":
+            await word_stats(args.group, args.top, args.unused_days, args.disable_unused)
+        else:
+            await run_maintenance(AsyncSessionLocal)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="bulk-load a file with COPY")
+    importer.add_argument("dataset", choices=sorted(EXPORTS))
+    importer.add_argument("path", type=Path)
+    importer.add_argument(
+        "--group", type=int, default=GLOBAL_SCOPE, help="word list scope (0 is the global list); words only"
+    )
+
+    exporter = commands.add_parser("export", help="stream a table to a file or stdout")
+    exporter.add_argument("dataset", choices=sorted(EXPORTS))
+    exporter.add_argument(
+        "--group", type=int, default=GLOBAL_SCOPE, help="group chat id; 0 exports the global words or every group"
+    )
+    exporter.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="txt is lossy: words keep only the spelling with its STEM mark, other datasets a few columns; "
+        "use csv or json for a full copy",
+    )
+    exporter.add_argument("--output", type=Path, help="file to write (gzip if it ends in .gz); stdout by default")
+
+    commands.add_parser("maintenance", help="roll up stats, rotate partitions and purge claims once")
+
+    stats = commands.add_parser("word-stats", help="show the most and least used words of a scope")
+    stats.add_argument("--group", type=int, default=GLOBAL_SCOPE, help="word list scope (0 is the global list)")
+    stats.add_argument("--top", type=int, default=20)
+    stats.add_argument("--unused-days", type=int, default=90)
+    stats.add_argument("--disable-unused", action="store_true", help="disable the words with no hits in that window")
+
+    evaluator = commands.add_parser("evaluate", help="run a candidate word list over a JSONL message corpus")
+    evaluator.add_argument("corpus", type=Path, help='one {"text": ..., "prohibited": false} object per line')
+    evaluator.add_argument("--words", type=Path, default=Path(settings.PROHIBITED_WORDS_PATH), help=".txt or .json list")
+    evaluator.add_argument("--workers", type=int, help="processes; CPU count by default, 1 runs inline")
+    evaluator.add_argument("--top", type=int, default=20)
+
+    args = parser.parse_args()
+    setup_logging()
+    if args.command == "evaluate":
+        # CPU-bound and offline; needs no database.
+        evaluate(args)
+        return
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
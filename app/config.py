@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,14 +7,36 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     BOT_TOKEN: str
-    GROUP_ID: int
+    # Seeds the groups table on first start; further groups are added from the admin panel.
+    GROUP_ID: int | None = None
     SECRET_KEY: str
 
     REMIND_AFTER_MIN: int = 10
     EXPIRE_AFTER_MIN: int = 60
     MAX_REMINDERS: int = 2
+    REMINDER_POLL_INTERVAL_SEC: int = 20
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_CONCURRENCY: int = 8
+
+    EXPIRY_KICK_ENABLED: bool = True
+    EXPIRY_SWEEP_INTERVAL_SEC: int = 60
+    EXPIRY_SWEEP_BATCH_SIZE: int = 100
+    SESSION_RETENTION_DAYS: int = 7
+
+    TELEGRAM_GLOBAL_RATE_PER_SEC: float = 25.0
+    TELEGRAM_GROUP_RATE_PER_MIN: float = 20.0
 
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEC: float = 30
+    DB_POOL_RECYCLE_SEC: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 2
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_SLOW_QUERY_MS: int = 500
+    FASTPATH_POOL_SIZE: int = 5
 
     ADMIN_ID: int | None = None
     PROHIBITED_WORDS_PATH: str
@@ -33,22 +57,76 @@ class Settings(BaseSettings):
     AI_PROHIBITED_LABELS: str = "gambling,fraud"
     AI_CONFIDENCE_THRESHOLD: float = 0.7
 
+    # Raw moderation events are kept this long (0 = forever); daily rollups are kept.
+    MODERATION_RETENTION_DAYS: int = 365
+    MODERATION_PARTITIONS_AHEAD: int = 3
+    MODERATION_MAINTENANCE_INTERVAL_SEC: int = 3600
+
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_MS: int = 500
+    AUDIT_SPILL_PATH: str = "data/audit_spill.jsonl"
+
+    WORD_STATS_FLUSH_INTERVAL_SEC: int = 60
+
+    # Shards of the per-user ordering state and its metrics; not a concurrency limit.
+    UPDATE_LANES: int = 16
+    # Updates handled at once across all users, whatever UPDATE_LANES is.
+    UPDATE_CONCURRENCY: int = 32
+    UPDATE_LOW_PRIORITY_SHARE: float = 0.75
+
+    DEGRADATION_ENABLED: bool = True
+    DEGRADATION_LAG_STEPS: str = "30,120,300,900"
+    DEGRADATION_DEPTH_STEPS: str = "200,500,1000,2000"
+    DEGRADATION_RECOVER_SEC: int = 30
+    DEGRADATION_ESCALATE_SEC: int = 10
+
+    STARTUP_STALE_AGE_SEC: int = 300
+    STARTUP_STALE_MODE: Literal["keyword", "skip"] = "keyword"
+    STARTUP_DRAIN_MAX_SEC: int = 600
+
+    APP_ROLE: Literal["standalone", "ingest", "worker"] = "standalone"
+    QUEUE_WORKER_CONCURRENCY: int = 32
+    QUEUE_POLL_INTERVAL_MS: int = 200
+    QUEUE_VISIBILITY_TIMEOUT_SEC: int = 300
+    CACHE_REFRESH_INTERVAL_SEC: int = 60
+
+    LEADER_ELECTION_ENABLED: bool = True
+    LEADER_LOCK_KEY: int = 7_231_001
+    LEADER_HEARTBEAT_SEC: int = 5
+
+    BOT_MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_BASE_URL: str | None = None
+    WEBHOOK_PATH: str = "/telegram/webhook"
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_HEALTH_PATH: str = "/healthz"
+
     LOG_LEVEL: str = "INFO"
+    METRICS_LOG_INTERVAL_SEC: int = 300
+
+
+def parse_id_list(raw: str | None) -> list[int]:
+    ids: list[int] = []
+    if not raw:
+        return ids
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            ids.append(int(item))
+        except ValueError:
+            continue
+    return ids
 
 
 def get_admin_ids() -> set[int]:
     ids: set[int] = set()
     if settings.ADMIN_ID:
         ids.add(int(settings.ADMIN_ID))
-    if settings.ADMIN_IDS:
-        for item in settings.ADMIN_IDS.split(","):
-            item = item.strip()
-            if not item:
-                continue
-            try:
-                ids.add(int(item))
-            except ValueError:
-                continue
+    ids.update(parse_id_list(settings.ADMIN_IDS))
     return ids
 
 
@@ -3,8 +3,13 @@ from app.db.models import (
     VerificationSession,
     UserProfile,
     ProhibitedWord,
+    ProhibitedWordStat,
     ModerationEvent,
+    ModerationClaim,
+    ModerationDailyStat,
     AppSetting,
+    Group,
+    QueuedUpdate,
     Base,
 )
 from app.db.session import AsyncSessionLocal, engine
@@ -14,8 +19,13 @@ __all__ = [
     "VerificationSession",
     "UserProfile",
     "ProhibitedWord",
+    "ProhibitedWordStat",
     "ModerationEvent",
+    "ModerationClaim",
+    "ModerationDailyStat",
     "AppSetting",
+    "Group",
+    "QueuedUpdate",
     "Base",
     "AsyncSessionLocal",
     "engine",
@@ -0,0 +1,103 @@
+import logging
+from datetime import datetime, timedelta
+
+import asyncpg
+from aiogram.types import User as TgUser
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.db.models import SessionState
+
+logger = logging.getLogger(__name__)
+
+IS_APPROVED_SQL = "SELECT EXISTS (SELECT 1 FROM approved_members WHERE group_id = $1 AND user_id = $2)"
+
+SESSION_STATE_SQL = "SELECT state::text FROM verification_sessions WHERE group_id = $1 AND user_id = $2"
+
+# Skips the row write when nothing changed; most messages come from known users.
+UPSERT_PROFILE_SQL = """
+INSERT INTO user_profiles (user_id, first_name, last_name, username, phone_number, updated_at)
+VALUES ($1, $2, $3, $4, $5, $6)
+ON CONFLICT (user_id) DO UPDATE SET
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    username = EXCLUDED.username,
+    phone_number = COALESCE(EXCLUDED.phone_number, user_profiles.phone_number),
+    updated_at = EXCLUDED.updated_at
+WHERE (user_profiles.first_name, user_profiles.last_name, user_profiles.username)
+      IS DISTINCT FROM (EXCLUDED.first_name, EXCLUDED.last_name, EXCLUDED.username)
+   OR (EXCLUDED.phone_number IS NOT NULL
+       AND EXCLUDED.phone_number IS DISTINCT FROM user_profiles.phone_number)
+"""
+
+# Check-and-set in one statement, so two concurrent messages cannot both pass the
+# cooldown. Users without a profile row have no cooldown, as in the ORM path.
+CLAIM_AI_CHECK_SQL = """
+WITH claimed AS (
+    UPDATE user_profiles SET last_ai_check_at = $2
+    WHERE user_id = $1 AND (last_ai_check_at IS NULL OR last_ai_check_at <= $3)
+    RETURNING 1
+)
+SELECT EXISTS (SELECT 1 FROM claimed)
+    OR NOT EXISTS (SELECT 1 FROM user_profiles WHERE user_id = $1)
+"""
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class FastPath:
+    """Raw asyncpg access for the fixed-shape queries run on every group message.
+
+    Skips the ORM's identity map and unit of work. asyncpg prepares each statement once
+    per connection and reuses it from its statement cache. The ORM models stay the
+    schema source and are used everywhere else.
+    """
+
+    def __init__(self) -> None:
+        self.pool: asyncpg.Pool | None = None
+
+    async def start(self) -> None:
+        server_settings = {"application_name": "verify-gate-bot-fastpath"}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        self.pool = await asyncpg.create_pool(
+            asyncpg_dsn(settings.DATABASE_URL),
+            min_size=1,
+            max_size=max(1, settings.FASTPATH_POOL_SIZE),
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            server_settings=server_settings,
+        )
+        logger.info("Fast path pool started size=%s", settings.FASTPATH_POOL_SIZE)
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def is_approved(self, group_id: int, user_id: int) -> bool:
+        return await self.pool.fetchval(IS_APPROVED_SQL, group_id, user_id)
+
+    async def get_session_state(self, group_id: int, user_id: int) -> SessionState | None:
+        state = await self.pool.fetchval(SESSION_STATE_SQL, group_id, user_id)
+        return SessionState(state) if state else None
+
+    async def upsert_profile(self, user: TgUser, now: datetime, phone_number: str | None = None) -> None:
+        await self.pool.execute(
+            UPSERT_PROFILE_SQL,
+            user.id,
+            user.first_name or "",
+            user.last_name,
+            user.username,
+            phone_number,
+            now,
+        )
+
+    async def claim_ai_check(self, user_id: int, now: datetime, cooldown_sec: int) -> bool:
+        return await self.pool.fetchval(
+            CLAIM_AI_CHECK_SQL, user_id, now, now - timedelta(seconds=cooldown_sec)
+        )
+
+
+fastpath = FastPath()
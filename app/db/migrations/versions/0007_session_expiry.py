@@ -0,0 +1,35 @@
+"""session reminder messages and expiry index
+
+Revision ID: 0007_session_expiry
+Revises: 0006_app_settings
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0007_session_expiry"
+down_revision: Union[str, None] = "0006_app_settings"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "verification_sessions",
+        sa.Column(
+            "reminder_message_ids",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+    )
+    op.create_index("ix_session_state_expires", "verification_sessions", ["state", "expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_session_state_expires", table_name="verification_sessions")
+    op.drop_column("verification_sessions", "reminder_message_ids")
@@ -0,0 +1,45 @@
+"""shared update queue
+
+Revision ID: 0008_update_queue
+Revises: 0007_session_expiry
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0008_update_queue"
+down_revision: Union[str, None] = "0007_session_expiry"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "update_queue",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("update_id", sa.BigInteger(), nullable=False),
+        sa.Column("shard_key", sa.BigInteger(), nullable=True),
+        sa.Column("priority", sa.SmallInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("claimed_by", sa.String(length=64), nullable=True),
+        sa.UniqueConstraint("update_id", name="uq_update_queue_update_id"),
+    )
+    op.create_index("ix_update_queue_shard", "update_queue", ["shard_key", "id"])
+    op.create_index(
+        "ix_update_queue_unclaimed",
+        "update_queue",
+        ["priority", "id"],
+        postgresql_where=sa.text("claimed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_update_queue_unclaimed", table_name="update_queue")
+    op.drop_index("ix_update_queue_shard", table_name="update_queue")
+    op.drop_table("update_queue")
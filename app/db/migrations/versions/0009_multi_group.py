@@ -0,0 +1,55 @@
+"""multi-group support
+
+Revision ID: 0009_multi_group
+Revises: 0008_update_queue
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0009_multi_group"
+down_revision: Union[str, None] = "0008_update_queue"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "groups",
+        sa.Column("chat_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("title", sa.String(length=256), nullable=True),
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.text("true")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_by", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+
+    op.add_column(
+        "prohibited_words",
+        sa.Column("group_id", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    op.drop_constraint("uq_prohibited_word", "prohibited_words", type_="unique")
+    op.create_unique_constraint("uq_prohibited_group_word", "prohibited_words", ["group_id", "word"])
+
+    op.add_column(
+        "app_settings",
+        sa.Column("group_id", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    op.drop_constraint("app_settings_pkey", "app_settings", type_="primary")
+    op.create_primary_key("app_settings_pkey", "app_settings", ["group_id", "key"])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM app_settings WHERE group_id <> 0")
+    op.drop_constraint("app_settings_pkey", "app_settings", type_="primary")
+    op.create_primary_key("app_settings_pkey", "app_settings", ["key"])
+    op.drop_column("app_settings", "group_id")
+
+    op.execute("DELETE FROM prohibited_words WHERE group_id <> 0")
+    op.drop_constraint("uq_prohibited_group_word", "prohibited_words", type_="unique")
+    op.create_unique_constraint("uq_prohibited_word", "prohibited_words", ["word"])
+    op.drop_column("prohibited_words", "group_id")
+
+    op.drop_table("groups")
@@ -0,0 +1,33 @@
+"""unique moderation event per message
+
+Revision ID: 0010_moderation_dedup
+Revises: 0009_multi_group
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0010_moderation_dedup"
+down_revision: Union[str, None] = "0009_multi_group"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the first event of messages that were already punished twice.
+    op.execute(
+        """
+        DELETE FROM moderation_events a
+        USING moderation_events b
+        WHERE a.group_id = b.group_id AND a.message_id = b.message_id AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_moderation_group_message", "moderation_events", ["group_id", "message_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_moderation_group_message", "moderation_events", type_="unique")
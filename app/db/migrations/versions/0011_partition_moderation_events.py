@@ -0,0 +1,140 @@
+"""monthly partitions for moderation events, claims and daily rollup
+
+Revision ID: 0011_partition_moderation_events
+Revises: 0010_moderation_dedup
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0011_partition_moderation_events"
+down_revision: Union[str, None] = "0010_moderation_dedup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+COLUMNS = (
+    "id, group_id, user_id, message_id, action, reason_type, matched_word, "
+    "ai_label, ai_confidence, ai_summary, created_at"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Free the names the partitioned table will use.
+    op.drop_constraint("uq_moderation_group_message", "moderation_events", type_="unique")
+    op.rename_table("moderation_events", "moderation_events_old")
+    op.execute("ALTER INDEX moderation_events_pkey RENAME TO moderation_events_old_pkey")
+    op.execute("ALTER SEQUENCE moderation_events_id_seq RENAME TO moderation_events_old_id_seq")
+
+    op.execute(
+        """
+        CREATE TABLE moderation_events (
+            id BIGSERIAL NOT NULL,
+            group_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            message_id BIGINT NOT NULL,
+            action moderation_action NOT NULL,
+            reason_type moderation_reason NOT NULL,
+            matched_word VARCHAR(256),
+            ai_label VARCHAR(32),
+            ai_confidence FLOAT,
+            ai_summary VARCHAR(256),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index("ix_moderation_events_group_created", "moderation_events", ["group_id", "created_at"])
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM moderation_events_old")).scalar()
+    current = datetime.now(tz=timezone.utc).date().replace(day=1)
+    month = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else current
+    while month <= add_months(current, PARTITIONS_AHEAD):
+        following = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE moderation_events_p{month:%Y%m} PARTITION OF moderation_events "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{following.isoformat()} 00:00:00+00')"
+        )
+        month = following
+    op.execute("CREATE TABLE moderation_events_default PARTITION OF moderation_events DEFAULT")
+
+    op.execute(f"INSERT INTO moderation_events ({COLUMNS}) SELECT {COLUMNS} FROM moderation_events_old")
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('moderation_events', 'id'), "
+        "COALESCE((SELECT max(id) FROM moderation_events), 0) + 1, false)"
+    )
+
+    op.create_table(
+        "moderation_claims",
+        sa.Column("group_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("message_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_moderation_claims_created_at", "moderation_claims", ["created_at"])
+    op.execute(
+        "INSERT INTO moderation_claims (group_id, message_id, created_at) "
+        "SELECT group_id, message_id, created_at FROM moderation_events_old"
+    )
+    op.drop_table("moderation_events_old")
+
+    # Filled by the maintenance job on its first run.
+    reason_enum = postgresql.ENUM("KEYWORD", "AI", name="moderation_reason", create_type=False)
+    op.create_table(
+        "moderation_daily_stats",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("group_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("reason_type", reason_enum, primary_key=True),
+        sa.Column("label", sa.String(length=32), primary_key=True),
+        sa.Column("word", sa.String(length=256), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("moderation_daily_stats")
+
+    op.rename_table("moderation_events", "moderation_events_partitioned")
+    op.execute("ALTER INDEX moderation_events_pkey RENAME TO moderation_events_partitioned_pkey")
+    op.execute("ALTER SEQUENCE moderation_events_id_seq RENAME TO moderation_events_partitioned_id_seq")
+    action_enum = postgresql.ENUM("NONE", "MUTED", name="moderation_action", create_type=False)
+    reason_enum = postgresql.ENUM("KEYWORD", "AI", name="moderation_reason", create_type=False)
+    op.create_table(
+        "moderation_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("group_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("action", action_enum, nullable=False),
+        sa.Column("reason_type", reason_enum, nullable=False),
+        sa.Column("matched_word", sa.String(length=256), nullable=True),
+        sa.Column("ai_label", sa.String(length=32), nullable=True),
+        sa.Column("ai_confidence", sa.Float(), nullable=True),
+        sa.Column("ai_summary", sa.String(length=256), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        f"INSERT INTO moderation_events ({COLUMNS}) "
+        f"SELECT DISTINCT ON (group_id, message_id) {COLUMNS} FROM moderation_events_partitioned "
+        "ORDER BY group_id, message_id, id"
+    )
+    op.drop_table("moderation_events_partitioned")
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('moderation_events', 'id'), "
+        "COALESCE((SELECT max(id) FROM moderation_events), 0) + 1, false)"
+    )
+    op.create_unique_constraint(
+        "uq_moderation_group_message", "moderation_events", ["group_id", "message_id"]
+    )
+    op.drop_table("moderation_claims")
@@ -0,0 +1,31 @@
+"""trigram index for prohibited word search
+
+Revision ID: 0012_word_trigram_index
+Revises: 0011_partition_moderation_events
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0012_word_trigram_index"
+down_revision: Union[str, None] = "0011_partition_moderation_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_prohibited_words_word_trgm",
+        "prohibited_words",
+        ["word"],
+        postgresql_using="gin",
+        postgresql_ops={"word": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it.
+    op.drop_index("ix_prohibited_words_word_trgm", table_name="prohibited_words")
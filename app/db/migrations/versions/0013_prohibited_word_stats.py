@@ -0,0 +1,29 @@
+"""per-word hit counters
+
+Revision ID: 0013_prohibited_word_stats
+Revises: 0012_word_trigram_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0013_prohibited_word_stats"
+down_revision: Union[str, None] = "0012_word_trigram_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prohibited_word_stats",
+        sa.Column("word_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("hits", sa.BigInteger(), nullable=False),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("prohibited_word_stats")
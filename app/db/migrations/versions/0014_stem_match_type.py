@@ -0,0 +1,26 @@
+"""stem match type for prohibited words
+
+Revision ID: 0014_stem_match_type
+Revises: 0013_prohibited_word_stats
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0014_stem_match_type"
+down_revision: Union[str, None] = "0013_prohibited_word_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block before PG 12.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE match_type ADD VALUE IF NOT EXISTS 'STEM'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value; STEM words fall back to exact matching.
+    op.execute("UPDATE prohibited_words SET match_type = 'TOKEN' WHERE match_type = 'STEM'")
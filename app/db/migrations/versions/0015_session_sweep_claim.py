@@ -0,0 +1,27 @@
+"""expiry sweeper claim on verification sessions
+
+Revision ID: 0015_session_sweep_claim
+Revises: 0014_stem_match_type
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0015_session_sweep_claim"
+down_revision: Union[str, None] = "0014_stem_match_type"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "verification_sessions",
+        sa.Column("sweep_claimed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("verification_sessions", "sweep_claimed_until")
@@ -1,9 +1,20 @@
 import enum
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, DateTime, Enum, Index, Integer, String, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -37,6 +48,7 @@ class VerificationSession(Base):
     state: Mapped[SessionState] = mapped_column(Enum(SessionState, name="session_state"))
     magic_word: Mapped[str] = mapped_column(String(64))
     welcome_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    reminder_message_ids: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), default=list)
     reminder_count: Mapped[int] = mapped_column(Integer, default=0)
     remind_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -51,10 +63,13 @@ class VerificationSession(Base):
     last_seen_in_group_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Set while the expiry sweeper is kicking the user; other sweepers skip the row.
+    sweep_claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     __table_args__ = (
         UniqueConstraint("group_id", "user_id", name="uq_session_group_user"),
         Index("ix_session_state", "state"),
+        Index("ix_session_state_expires", "state", "expires_at"),
     )
 
 
@@ -80,6 +95,8 @@ class UserProfile(Base):
 class MatchType(str, enum.Enum):
     TOKEN = "TOKEN"
     PHRASE = "PHRASE"
+    # The token itself or the token followed by Uzbek suffixes (kazino, kazinolarda).
+    STEM = "STEM"
 
 
 class ProhibitedWord(Base):
@@ -94,8 +111,28 @@ class ProhibitedWord(Base):
         DateTime(timezone=True), default=lambda: datetime.now(tz=timezone.utc)
     )
     created_by: Mapped[int] = mapped_column(BigInteger)
+    # 0 is the global list shared by every group.
+    group_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
-    __table_args__ = (UniqueConstraint("word", name="uq_prohibited_word"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "word", name="uq_prohibited_group_word"),
+        # Substring and similarity search in the admin panel (pg_trgm).
+        Index(
+            "ix_prohibited_words_word_trgm",
+            "word",
+            postgresql_using="gin",
+            postgresql_ops={"word": "gin_trgm_ops"},
+        ),
+    )
+
+
+class ProhibitedWordStat(Base):
+    __tablename__ = "prohibited_word_stats"
+
+    # prohibited_words.id; the row is deleted together with the word.
+    word_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    hits: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_hit_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
 
 class ModerationAction(str, enum.Enum):
@@ -111,7 +148,8 @@ class ModerationReason(str, enum.Enum):
 class ModerationEvent(Base):
     __tablename__ = "moderation_events"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Range-partitioned by month on created_at, so the partition key is part of the key.
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     group_id: Mapped[int] = mapped_column(BigInteger)
     user_id: Mapped[int] = mapped_column(BigInteger)
     message_id: Mapped[int] = mapped_column(BigInteger)
@@ -126,16 +164,84 @@ class ModerationEvent(Base):
     ai_confidence: Mapped[float | None] = mapped_column(nullable=True)
     ai_summary: Mapped[str | None] = mapped_column(String(256), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(tz=timezone.utc)
+        DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(tz=timezone.utc)
     )
 
+    __table_args__ = (
+        Index("ix_moderation_events_group_created", "group_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class ModerationClaim(Base):
+    __tablename__ = "moderation_claims"
+
+    # One row per moderated message; the partitioned events table cannot enforce this.
+    group_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class ModerationDailyStat(Base):
+    __tablename__ = "moderation_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    group_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    reason_type: Mapped[ModerationReason] = mapped_column(
+        Enum(ModerationReason, name="moderation_reason"), primary_key=True
+    )
+    # Empty string rather than NULL so the columns can be part of the key.
+    label: Mapped[str] = mapped_column(String(32), primary_key=True, default="")
+    word: Mapped[str] = mapped_column(String(256), primary_key=True, default="")
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
 
 class AppSetting(Base):
     __tablename__ = "app_settings"
 
+    # 0 holds the global values; other rows override them for one group.
+    group_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False, default=0)
     key: Mapped[str] = mapped_column(String(64), primary_key=True)
     value: Mapped[str] = mapped_column(String(256), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(tz=timezone.utc)
     )
     updated_by: Mapped[int] = mapped_column(BigInteger)
+
+
+class Group(Base):
+    __tablename__ = "groups"
+
+    chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    title: Mapped[str | None] = mapped_column(String(256), nullable=True)
+    enabled: Mapped[bool] = mapped_column(nullable=False, default=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(tz=timezone.utc)
+    )
+    created_by: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class QueuedUpdate(Base):
+    __tablename__ = "update_queue"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    update_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    shard_key: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(tz=timezone.utc)
+    )
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    claimed_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("update_id", name="uq_update_queue_update_id"),
+        Index("ix_update_queue_shard", "shard_key", "id"),
+        Index(
+            "ix_update_queue_unclaimed",
+            "priority",
+            "id",
+            postgresql_where=text("claimed_at IS NULL"),
+        ),
+    )
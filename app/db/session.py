@@ -1,9 +1,104 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.counter("db_pool_timeouts_total").inc()
+            raise
+        finally:
+            metrics.histogram("db_pool_checkout_seconds").observe(time.perf_counter() - started)
+
+
+def build_connect_args() -> dict:
+    server_settings = {"application_name": "verify-gate-bot"}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return {
+        # asyncpg's own cache and SQLAlchemy's prepared statement cache; both must be 0
+        # behind a transaction-mode pgbouncer.
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": server_settings,
+    }
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    pool = engine.sync_engine.pool
+    in_use = metrics.gauge("db_pool_in_use")
+    overflow = metrics.gauge("db_pool_overflow")
+    metrics.gauge("db_pool_size").set(pool.size())
+
+    def update_pool_gauges(*_args) -> None:
+        in_use.set(pool.checkedout())
+        overflow.set(max(0, pool.overflow()))
+
+    event.listen(pool, "checkout", update_pool_gauges)
+    event.listen(pool, "checkin", update_pool_gauges)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        metrics.histogram("db_query_seconds").observe(elapsed)
+        if settings.DB_SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            metrics.counter("db_slow_queries_total").inc()
+            logger.warning("Slow query %.0fms: %s", elapsed * 1000, " ".join(statement.split())[:500])
+
+
+def pool_status(engine: AsyncEngine) -> str:
+    pool = engine.sync_engine.pool
+    return f"in use {pool.checkedout()}/{pool.size()}, overflow {max(0, pool.overflow())}, idle {pool.checkedin()}"
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    # All connections are held until the end; releasing each one right away would
+    # just reuse the first.
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    started = time.perf_counter()
+    opened = await asyncio.gather(*(engine.connect().start() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        for conn in opened:
+            await conn.close()
+    logger.info("DB pool warmed up connections=%s elapsed=%.2fs", connections, time.perf_counter() - started)
 
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    future=True,
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=build_connect_args(),
+)
+instrument_engine(engine)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
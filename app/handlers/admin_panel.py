@@ -1,18 +1,36 @@
 import logging
+import os
 from datetime import datetime, timezone
 from html import escape
+from pathlib import Path
 from typing import Optional
 
 from aiogram import Bot, Router, F
 from aiogram.filters import Command
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message, CallbackQuery
-from sqlalchemy import select, func
+from aiogram.types import FSInputFile, InlineKeyboardButton, InlineKeyboardMarkup, Message, CallbackQuery
+from sqlalchemy import delete, func, select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings, get_admin_ids
-from app.db.models import MatchType, ProhibitedWord
-from app.services.prohibited import ProhibitedCache, normalize_word
+from app.db.models import MatchType, ModerationReason, ProhibitedWord, ProhibitedWordStat
+from app.db.session import engine, pool_status
+from app.services.degradation import DegradationController
+from app.services.export import EXPORT_FORMATS, EXPORTS, export_filename, export_to_file
+from app.services.groups import GLOBAL_SCOPE, GroupRegistry, add_group
+from app.services.leader import LeaderElector
+from app.services.moderation_maintenance import get_moderation_stats
+from app.services.prohibited import match_type_for, normalize_input, normalize_word, search_words, similar_words
+from app.services.startup_drain import StartupDrain
+from app.services.word_import import (
+    IMPORT_FORMATS,
+    ImportResult,
+    document_words,
+    import_words,
+    stream_file,
+    text_words,
+)
+from app.services.word_stats import get_word_hits
 from app.services.runtime_settings import (
     SUPPORTED_KEYS,
     apply_runtime_settings,
@@ -24,10 +42,38 @@ logger = logging.getLogger(__name__)
 
 router = Router()
 ADMIN_STATE: dict[int, dict[str, str]] = {}
+# Group whose words and settings the admin chat is editing; 0 is the global list.
+ADMIN_SCOPE: dict[int, int] = {}
+WORDS_PER_PAGE = 10
+STATS_WINDOWS = [("Today", 1), ("7 days", 7), ("30 days", 30)]
+
+
+def is_admin(user_id: int, group_registry: GroupRegistry) -> bool:
+    return group_registry.is_admin(user_id)
+
+
+def can_manage(user_id: int, scope: int, group_registry: GroupRegistry) -> bool:
+    if user_id in get_admin_ids():
+        return True
+    group = group_registry.get(scope)
+    return group is not None and user_id in group.admin_ids
 
 
-def is_admin(user_id: int) -> bool:
-    return user_id in get_admin_ids()
+def get_scope(chat_id: int, user_id: int, group_registry: GroupRegistry) -> int:
+    scope = ADMIN_SCOPE.get(chat_id)
+    if scope is not None and can_manage(user_id, scope, group_registry):
+        return scope
+    if user_id in get_admin_ids():
+        return GLOBAL_SCOPE
+    groups = group_registry.admin_groups(user_id)
+    return groups[0].chat_id if groups else GLOBAL_SCOPE
+
+
+def scope_name(scope: int, group_registry: GroupRegistry) -> str:
+    if scope == GLOBAL_SCOPE:
+        return "Global"
+    group = group_registry.get(scope)
+    return group.name if group else str(scope)
 
 
 def admin_menu_kb() -> InlineKeyboardMarkup:
@@ -39,39 +85,63 @@ def admin_menu_kb() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="📥 Bulk import", callback_data="admin:bulk")],
         [InlineKeyboardButton(text="📤 Export", callback_data="admin:export")],
         [InlineKeyboardButton(text="⚙️ Settings", callback_data="admin:settings")],
+        [InlineKeyboardButton(text="📊 Status", callback_data="admin:status")],
+        [InlineKeyboardButton(text="📈 Moderation stats", callback_data="admin:stats")],
+        [InlineKeyboardButton(text="👥 Groups", callback_data="admin:groups")],
         [InlineKeyboardButton(text="❌ Close", callback_data="admin:close")],
     ]
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def list_kb(page: int, total_pages: int, items: list[tuple[int, str, bool]]) -> InlineKeyboardMarkup:
+def list_kb(
+    page: int, items: list[tuple[int, str, bool]], prev_id: int | None, next_id: int | None
+) -> InlineKeyboardMarkup:
     rows = []
     for word_id, display, enabled in items:
         status = "✅" if enabled else "🚫"
         rows.append(
             [InlineKeyboardButton(text=f"{status} {display}", callback_data=f"admin:detail:id={word_id}")]
         )
+    # Cursors are row ids: words can be too long for the 64-byte callback_data.
     nav = []
-    if page > 1:
-        nav.append(InlineKeyboardButton(text="◀ Prev", callback_data=f"admin:list:p={page-1}"))
-    if page < total_pages:
-        nav.append(InlineKeyboardButton(text="Next ▶", callback_data=f"admin:list:p={page+1}"))
+    if prev_id is not None:
+        nav.append(InlineKeyboardButton(text="◀ Prev", callback_data=f"admin:list:b={prev_id}:p={page-1}"))
+    if next_id is not None:
+        nav.append(InlineKeyboardButton(text="Next ▶", callback_data=f"admin:list:a={next_id}:p={page+1}"))
     if nav:
         rows.append(nav)
     rows.append([InlineKeyboardButton(text="⬅ Back", callback_data="admin:menu")])
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def detail_kb(word_id: int, enabled: bool) -> InlineKeyboardMarkup:
+def detail_kb(word_id: int, enabled: bool, match_type: MatchType) -> InlineKeyboardMarkup:
     toggle_text = "🚫 Disable" if enabled else "✅ Enable"
     rows = [
         [InlineKeyboardButton(text=toggle_text, callback_data=f"admin:toggle:id={word_id}")],
+    ]
+    if match_type != MatchType.PHRASE:
+        stem_text = "🔤 Match exact word" if match_type == MatchType.STEM else "🔤 Match with suffixes"
+        rows.append([InlineKeyboardButton(text=stem_text, callback_data=f"admin:stem:id={word_id}")])
+    rows += [
         [InlineKeyboardButton(text="🗑 Remove", callback_data=f"admin:remove:id={word_id}")],
         [InlineKeyboardButton(text="⬅ Back to list", callback_data="admin:backlist")],
     ]
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+def word_detail_text(row: ProhibitedWord, hits: int, last_hit_at: datetime | None) -> str:
+    status = "✅ enabled" if row.enabled else "🚫 disabled"
+    display = escape(row.original or row.word)
+    last_hit = f" (last: {last_hit_at:%Y-%m-%d %H:%M} UTC)" if last_hit_at else ""
+    return (
+        f"Word: {display}\n"
+        f"Normalized: {escape(row.word)}\n"
+        f"Status: {status}\n"
+        f"Match: {row.match_type.value}\n"
+        f"Hits: {hits}{last_hit}"
+    )
+
+
 def confirm_remove_kb(word_id: int) -> InlineKeyboardMarkup:
     rows = [
         [
@@ -82,11 +152,33 @@ def confirm_remove_kb(word_id: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def normalize_input(text: str) -> Optional[str]:
-    norm = normalize_word(text)
-    if not norm or len(norm) < 2:
-        return None
-    return norm
+def export_kb() -> InlineKeyboardMarkup:
+    rows = [
+        [
+            InlineKeyboardButton(text=f"{spec.name.capitalize()} · {fmt}", callback_data=f"admin:export:{spec.name}:{fmt}")
+            for fmt in EXPORT_FORMATS
+        ]
+        for spec in EXPORTS.values()
+    ]
+    rows.append([InlineKeyboardButton(text="⬅ Back", callback_data="admin:menu")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def groups_kb(user_id: int, scope: int, group_registry: GroupRegistry) -> InlineKeyboardMarkup:
+    rows = []
+    options: list[tuple[int, str]] = []
+    if user_id in get_admin_ids():
+        options.append((GLOBAL_SCOPE, "Global"))
+    options.extend((group.chat_id, group.name) for group in group_registry.admin_groups(user_id))
+    for chat_id, name in options:
+        marker = "• " if chat_id == scope else ""
+        rows.append(
+            [InlineKeyboardButton(text=f"{marker}{name}", callback_data=f"admin:scope:g={chat_id}")]
+        )
+    if user_id in get_admin_ids():
+        rows.append([InlineKeyboardButton(text="➕ Add group", callback_data="admin:groupadd")])
+    rows.append([InlineKeyboardButton(text="⬅ Back", callback_data="admin:menu")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def parse_callback_param(data: str, key: str) -> Optional[str]:
@@ -96,21 +188,112 @@ def parse_callback_param(data: str, key: str) -> Optional[str]:
     return None
 
 
-def remember_list_page(chat_id: int, page: int) -> None:
-    ADMIN_STATE.setdefault(chat_id, {})["last_list_page"] = str(page)
+def remember_list_page(chat_id: int, page: int, first: ProhibitedWord | None) -> None:
+    state = ADMIN_STATE.setdefault(chat_id, {})
+    state["last_list_page"] = str(page)
+    state["last_list_word"] = first.word if first else ""
+    state["last_list_id"] = str(first.id) if first else "0"
+
+
+async def load_word_page(
+    session: AsyncSession, scope: int, key: tuple[str, int] | None, before: bool = False, inclusive: bool = False
+) -> tuple[list[ProhibitedWord], bool]:
+    """One page in (word, id) order, seeking from `key` instead of skipping rows with OFFSET.
+
+    Returns the rows and whether more rows exist past the page in the direction read.
+    """
+    stmt = select(ProhibitedWord).where(ProhibitedWord.group_id == scope)
+    if key is not None:
+        position = tuple_(ProhibitedWord.word, ProhibitedWord.id)
+        if before:
+            stmt = stmt.where(position < tuple_(*key))
+        else:
+            stmt = stmt.where(position >= tuple_(*key) if inclusive else position > tuple_(*key))
+    if before:
+        stmt = stmt.order_by(ProhibitedWord.word.desc(), ProhibitedWord.id.desc())
+    else:
+        stmt = stmt.order_by(ProhibitedWord.word, ProhibitedWord.id)
+    result = await session.execute(stmt.limit(WORDS_PER_PAGE + 1))
+    rows = list(result.scalars().all())
+    more = len(rows) > WORDS_PER_PAGE
+    rows = rows[:WORDS_PER_PAGE]
+    if before:
+        rows.reverse()
+    return rows, more
+
+
+async def count_words(session: AsyncSession, scope: int, group_registry: GroupRegistry) -> int:
+    cache = group_registry.words_for(scope)
+    if cache is not None and cache.stored is not None:
+        return cache.stored
+    total = await session.scalar(
+        select(func.count()).select_from(ProhibitedWord).where(ProhibitedWord.group_id == scope)
+    )
+    return total or 0
+
+
+async def show_word_list(
+    callback: CallbackQuery,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group_registry: GroupRegistry,
+    scope: int,
+    page: int,
+    cursor_id: int | None = None,
+    before: bool = False,
+    key: tuple[str, int] | None = None,
+) -> None:
+    async with sessionmaker() as session:
+        if cursor_id is not None:
+            row = await session.get(ProhibitedWord, cursor_id)
+            if row is not None and row.group_id == scope:
+                key = (row.word, row.id)
+            else:
+                # The cursor row is gone; start over.
+                page, before = 1, False
+        if key is None:
+            page, before = 1, False
+        rows, more = await load_word_page(session, scope, key, before=before, inclusive=cursor_id is None)
+        if before and not more:
+            # Reached the start; read it forward so the first page is full.
+            page, before = 1, False
+            rows, more = await load_word_page(session, scope, None)
+        elif before:
+            page = max(page, 2)
+        total = await count_words(session, scope, group_registry)
+    if not rows and page > 1:
+        # The page emptied out (e.g. its last word was removed); show the first one.
+        await show_word_list(callback, sessionmaker, group_registry, scope, 1)
+        return
+    total_pages = max(page, (total + WORDS_PER_PAGE - 1) // WORDS_PER_PAGE)
+    lines = [f"Taqiqlangan so'zlar — {escape(scope_name(scope, group_registry))} (page {page}/{total_pages}):"]
+    items = [(row.id, escape(row.original or row.word), row.enabled) for row in rows]
+    has_next = more if not before else True
+    prev_id = rows[0].id if rows and page > 1 else None
+    next_id = rows[-1].id if rows and has_next else None
+    remember_list_page(callback.message.chat.id, page, rows[0] if rows else None)
+    await callback.message.edit_text("\n".join(lines), reply_markup=list_kb(page, items, prev_id, next_id))
 
 
-def get_list_page(chat_id: int) -> int:
-    return int(ADMIN_STATE.get(chat_id, {}).get("last_list_page", "1"))
+def last_list_position(chat_id: int) -> tuple[int, tuple[str, int] | None]:
+    state = ADMIN_STATE.get(chat_id, {})
+    page = int(state.get("last_list_page", "1"))
+    word = state.get("last_list_word")
+    if page <= 1 or not word:
+        return 1, None
+    return page, (word, int(state.get("last_list_id", "0")))
 
 
 @router.message(Command("admin"))
-async def admin_entry(message: Message) -> None:
+async def admin_entry(message: Message, group_registry: GroupRegistry) -> None:
     logger.info("Handler admin_entry chat_id=%s user_id=%s", message.chat.id, message.from_user.id if message.from_user else None)
     if message.chat.type != "private":
         logger.info("admin_entry stop: not private")
         return
-    if not settings.ADMIN_PANEL_ENABLED or message.from_user is None or not is_admin(message.from_user.id):
+    if (
+        not settings.ADMIN_PANEL_ENABLED
+        or message.from_user is None
+        or not is_admin(message.from_user.id, group_registry)
+    ):
         logger.info("admin_entry stop: access denied")
         return
     await message.answer("Admin panel:", reply_markup=admin_menu_kb())
@@ -121,19 +304,23 @@ async def admin_callbacks(
     callback: CallbackQuery,
     bot: Bot,
     sessionmaker: async_sessionmaker[AsyncSession],
-    prohibited_cache: ProhibitedCache,
+    group_registry: GroupRegistry,
+    degradation: DegradationController,
+    startup_drain: StartupDrain,
+    leader_elector: LeaderElector | None = None,
 ) -> None:
     logger.info("Handler admin_callbacks data=%s user_id=%s", callback.data, callback.from_user.id if callback.from_user else None)
     if not settings.ADMIN_PANEL_ENABLED:
         await callback.answer("Access denied", show_alert=True)
         logger.info("admin_callbacks stop: panel disabled")
         return
-    if callback.from_user is None or not is_admin(callback.from_user.id):
+    if callback.from_user is None or not is_admin(callback.from_user.id, group_registry):
         await callback.answer("Access denied", show_alert=True)
         logger.info("admin_callbacks stop: access denied")
         return
 
     data = callback.data or ""
+    scope = get_scope(callback.message.chat.id, callback.from_user.id, group_registry)
     if data.startswith("admin:menu"):
         await callback.message.edit_text("Admin panel:", reply_markup=admin_menu_kb())
         await callback.answer()
@@ -148,26 +335,19 @@ async def admin_callbacks(
         return
 
     if data.startswith("admin:list"):
-        page_str = parse_callback_param(data, "p") or "1"
-        page = max(1, int(page_str))
-        per_page = 10
-        async with sessionmaker() as session:
-            total = await session.scalar(select(func.count()).select_from(ProhibitedWord))
-            result = await session.execute(
-                select(ProhibitedWord)
-                .order_by(ProhibitedWord.created_at.desc(), ProhibitedWord.id.desc())
-                .offset((page - 1) * per_page)
-                .limit(per_page)
-            )
-            rows = result.scalars().all()
-        total_pages = max(1, (total + per_page - 1) // per_page) if total is not None else 1
-        lines = [f"Taqiqlangan so'zlar (page {page}/{total_pages}):"]
-        items = []
-        for row in rows:
-            display = escape(row.original or row.word)
-            items.append((row.id, display, row.enabled))
-        remember_list_page(callback.message.chat.id, page)
-        await callback.message.edit_text("\n".join(lines), reply_markup=list_kb(page, total_pages, items))
+        page = max(1, int(parse_callback_param(data, "p") or "1"))
+        after_id = parse_callback_param(data, "a")
+        before_id = parse_callback_param(data, "b")
+        cursor_id = before_id or after_id
+        await show_word_list(
+            callback,
+            sessionmaker,
+            group_registry,
+            scope,
+            page,
+            cursor_id=int(cursor_id) if cursor_id else None,
+            before=before_id is not None,
+        )
         await callback.answer()
         return
 
@@ -178,40 +358,19 @@ async def admin_callbacks(
             return
         async with sessionmaker() as session:
             row = await session.get(ProhibitedWord, int(word_id))
-            if not row:
+            if not row or row.group_id != scope:
                 await callback.answer("Not found", show_alert=True)
                 return
-        status = "✅ enabled" if row.enabled else "🚫 disabled"
-        display = escape(row.original or row.word)
-        text = (
-            f"Word: {display}\n"
-            f"Normalized: {escape(row.word)}\n"
-            f"Status: {status}\n"
-            f"Match: {row.match_type}"
+            hits, last_hit_at = await get_word_hits(session, row.id)
+        await callback.message.edit_text(
+            word_detail_text(row, hits, last_hit_at), reply_markup=detail_kb(row.id, row.enabled, row.match_type)
         )
-        await callback.message.edit_text(text, reply_markup=detail_kb(row.id, row.enabled))
         await callback.answer()
         return
 
     if data.startswith("admin:backlist"):
-        page = get_list_page(callback.message.chat.id)
-        per_page = 10
-        async with sessionmaker() as session:
-            total = await session.scalar(select(func.count()).select_from(ProhibitedWord))
-            result = await session.execute(
-                select(ProhibitedWord)
-                .order_by(ProhibitedWord.created_at.desc(), ProhibitedWord.id.desc())
-                .offset((page - 1) * per_page)
-                .limit(per_page)
-            )
-            rows = result.scalars().all()
-        total_pages = max(1, (total + per_page - 1) // per_page) if total is not None else 1
-        lines = [f"Taqiqlangan so'zlar (page {page}/{total_pages}):"]
-        items = []
-        for row in rows:
-            display = escape(row.original or row.word)
-            items.append((row.id, display, row.enabled))
-        await callback.message.edit_text("\n".join(lines), reply_markup=list_kb(page, total_pages, items))
+        page, key = last_list_position(callback.message.chat.id)
+        await show_word_list(callback, sessionmaker, group_registry, scope, page, key=key)
         await callback.answer()
         return
 
@@ -222,28 +381,43 @@ async def admin_callbacks(
             return
         async with sessionmaker() as session:
             row = await session.get(ProhibitedWord, int(word_id))
-            if not row:
+            if not row or row.group_id != scope:
                 await callback.answer("Not found", show_alert=True)
                 return
             row.enabled = not row.enabled
             await session.commit()
-        await prohibited_cache.refresh()
+            hits, last_hit_at = await get_word_hits(session, row.id)
+        await group_registry.refresh_words(scope)
         logger.info("Prohibited cache refreshed after toggle id=%s enabled=%s", row.id, row.enabled)
-        status = "✅ enabled" if row.enabled else "🚫 disabled"
-        display = escape(row.original or row.word)
-        text = (
-            f"Word: {display}\n"
-            f"Normalized: {escape(row.word)}\n"
-            f"Status: {status}\n"
-            f"Match: {row.match_type}"
-        )
         try:
-            await callback.message.edit_text(text, reply_markup=detail_kb(row.id, row.enabled))
+            await callback.message.edit_text(
+                word_detail_text(row, hits, last_hit_at), reply_markup=detail_kb(row.id, row.enabled, row.match_type)
+            )
         except Exception:
             pass
         await callback.answer("Updated")
         return
 
+    if data.startswith("admin:stem"):
+        word_id = parse_callback_param(data, "id")
+        if not word_id:
+            await callback.answer()
+            return
+        async with sessionmaker() as session:
+            row = await session.get(ProhibitedWord, int(word_id))
+            if not row or row.group_id != scope or row.match_type == MatchType.PHRASE:
+                await callback.answer("Not found", show_alert=True)
+                return
+            row.match_type = MatchType.TOKEN if row.match_type == MatchType.STEM else MatchType.STEM
+            await session.commit()
+            hits, last_hit_at = await get_word_hits(session, row.id)
+        await group_registry.refresh_words(scope)
+        await callback.message.edit_text(
+            word_detail_text(row, hits, last_hit_at), reply_markup=detail_kb(row.id, row.enabled, row.match_type)
+        )
+        await callback.answer()
+        return
+
     if data.startswith("admin:remove:id="):
         word_id = parse_callback_param(data, "id")
         if not word_id:
@@ -251,7 +425,7 @@ async def admin_callbacks(
             return
         async with sessionmaker() as session:
             row = await session.get(ProhibitedWord, int(word_id))
-            if not row:
+            if not row or row.group_id != scope:
                 await callback.answer("Not found", show_alert=True)
                 return
         display = escape(row.original or row.word)
@@ -271,37 +445,25 @@ async def admin_callbacks(
             return
         async with sessionmaker() as session:
             row = await session.get(ProhibitedWord, int(word_id))
-            if not row:
+            if not row or row.group_id != scope:
                 await callback.answer("Not found", show_alert=True)
                 return
             await session.delete(row)
+            await session.execute(delete(ProhibitedWordStat).where(ProhibitedWordStat.word_id == row.id))
             await session.commit()
-        await prohibited_cache.refresh()
+        await group_registry.refresh_words(scope)
         await callback.answer("Deleted")
 
         # return to list
-        page = get_list_page(callback.message.chat.id)
-        per_page = 10
-        async with sessionmaker() as session:
-            total = await session.scalar(select(func.count()).select_from(ProhibitedWord))
-            result = await session.execute(
-                select(ProhibitedWord)
-                .order_by(ProhibitedWord.created_at.desc(), ProhibitedWord.id.desc())
-                .offset((page - 1) * per_page)
-                .limit(per_page)
-            )
-            rows = result.scalars().all()
-        total_pages = max(1, (total + per_page - 1) // per_page) if total is not None else 1
-        lines = [f"Taqiqlangan so'zlar (page {page}/{total_pages}):"]
-        items = []
-        for row in rows:
-            display = escape(row.original or row.word)
-            items.append((row.id, display, row.enabled))
-        await callback.message.edit_text("\n".join(lines), reply_markup=list_kb(page, total_pages, items))
+        page, key = last_list_position(callback.message.chat.id)
+        await show_word_list(callback, sessionmaker, group_registry, scope, page, key=key)
         return
 
     if data.startswith("admin:add"):
-        await callback.message.edit_text("Yangi so‘zni yuboring (1 ta so‘z yoki phrase). Bekor qilish: /cancel")
+        await callback.message.edit_text(
+            "Yangi so‘zni yuboring (1 ta so‘z yoki phrase). Qo‘shimchalari bilan ham topilishi uchun "
+            "oxiriga * qo‘ying (kazino*). Bekor qilish: /cancel"
+        )
         await callback.answer()
         ADMIN_STATE[callback.message.chat.id] = {"mode": "add"}
         return
@@ -319,35 +481,132 @@ async def admin_callbacks(
         return
 
     if data.startswith("admin:bulk"):
-        await callback.message.edit_text("Bir nechta so‘z/phrase yuboring (har qator bitta). # izohlar e’tiborga olinmaydi.")
+        await callback.message.edit_text(
+            "Bir nechta so‘z/phrase yuboring (har qator bitta) yoki .txt, .csv, .json fayl yuklang. "
+            "# izohlar e’tiborga olinmaydi."
+        )
         await callback.answer()
         ADMIN_STATE[callback.message.chat.id] = {"mode": "bulk"}
         return
 
+    if data.startswith("admin:export:"):
+        _, _, name, fmt = data.split(":", 3)
+        if name not in EXPORTS or fmt not in EXPORT_FORMATS:
+            await callback.answer("Unknown export", show_alert=True)
+            return
+        if name != "words" and scope == GLOBAL_SCOPE and callback.from_user.id not in get_admin_ids():
+            # The global scope exports every group's events and members.
+            await callback.answer("Access denied", show_alert=True)
+            return
+        await callback.answer("Preparing export…")
+        async with sessionmaker() as session:
+            path, count = await export_to_file(session, name, scope, fmt)
+        try:
+            filename = export_filename(name, scope, fmt, datetime.now(tz=timezone.utc))
+            await callback.message.answer_document(
+                FSInputFile(path, filename=filename),
+                caption=f"{EXPORTS[name].title} — {escape(scope_name(scope, group_registry))}: {count}",
+            )
+        finally:
+            os.unlink(path)
+        return
+
     if data.startswith("admin:export"):
+        await callback.message.edit_text(
+            f"Export — {escape(scope_name(scope, group_registry))}. Gzip bilan siqilgan fayl yuboriladi:",
+            reply_markup=export_kb(),
+        )
+        await callback.answer()
+        return
+
+    if data.startswith("admin:stats"):
         async with sessionmaker() as session:
-            result = await session.execute(
-                select(ProhibitedWord).where(ProhibitedWord.enabled.is_(True)).order_by(ProhibitedWord.word)
+            windows = [(label, await get_moderation_stats(session, scope, days)) for label, days in STATS_WINDOWS]
+        lines = [f"Moderation stats — {escape(scope_name(scope, group_registry))}:"]
+        for label, stats in windows:
+            lines.append(
+                f"- {label}: {stats.total} "
+                f"(keyword {stats.by_reason.get(ModerationReason.KEYWORD, 0)}, "
+                f"AI {stats.by_reason.get(ModerationReason.AI, 0)})"
             )
-            rows = result.scalars().all()
-        lines = [row.original or row.word for row in rows]
-        chunk = []
-        current = ""
-        for line in lines:
-            if len(current) + len(line) + 1 > 3500:
-                chunk.append(current)
-                current = ""
-            current += (line + "\n")
-        if current:
-            chunk.append(current)
-        for part in chunk:
-            await callback.message.answer(part.strip())
+        _, month = windows[-1]
+        if month.top_words:
+            lines.append("\nTop words (30 days):")
+            lines.extend(f"- {escape(word)}: {count}" for word, count in month.top_words)
+        if month.top_labels:
+            lines.append("\nTop AI labels (30 days):")
+            lines.extend(f"- {escape(label)}: {count}" for label, count in month.top_labels)
+        lines.append("\nUpdated by the maintenance job; recent events may not be counted yet.")
+        buttons = [
+            [InlineKeyboardButton(text="🔄 Refresh", callback_data="admin:stats")],
+            [InlineKeyboardButton(text="⬅ Back", callback_data="admin:menu")],
+        ]
+        try:
+            await callback.message.edit_text("\n".join(lines), reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons))
+        except Exception:
+            pass
+        await callback.answer()
+        return
+
+    if data.startswith("admin:status"):
+        text = (
+            "Status:\n"
+            f"- Moderation level: {escape(degradation.describe())}\n"
+            f"- Groups: {len(group_registry)}\n"
+            f"- Prohibited words loaded ({escape(scope_name(scope, group_registry))}): "
+            f"{len(group_registry.words_for(scope) or [])}\n"
+            f"- Startup drain: {escape(startup_drain.report or 'in progress')}\n"
+            f"- DB pool: {pool_status(engine)}\n"
+            f"- Replica: {escape(leader_elector.describe() if leader_elector else 'leader election disabled')}"
+        )
+        buttons = [
+            [InlineKeyboardButton(text="🔄 Refresh", callback_data="admin:status")],
+            [InlineKeyboardButton(text="⬅ Back", callback_data="admin:menu")],
+        ]
+        try:
+            await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons))
+        except Exception:
+            pass
+        await callback.answer()
+        return
+
+    if data.startswith("admin:groups"):
+        await callback.message.edit_text(
+            f"Groups (current: {escape(scope_name(scope, group_registry))}):",
+            reply_markup=groups_kb(callback.from_user.id, scope, group_registry),
+        )
+        await callback.answer()
+        return
+
+    if data.startswith("admin:scope"):
+        value = parse_callback_param(data, "g")
+        if value is None or not can_manage(callback.from_user.id, int(value), group_registry):
+            await callback.answer("Access denied", show_alert=True)
+            return
+        scope = int(value)
+        ADMIN_SCOPE[callback.message.chat.id] = scope
+        ADMIN_STATE.pop(callback.message.chat.id, None)
+        await callback.message.edit_text(
+            f"Admin panel ({escape(scope_name(scope, group_registry))}):", reply_markup=admin_menu_kb()
+        )
+        await callback.answer()
+        return
+
+    if data.startswith("admin:groupadd"):
+        if callback.from_user.id not in get_admin_ids():
+            await callback.answer("Access denied", show_alert=True)
+            return
+        await callback.message.edit_text(
+            "Guruh ID va nomini yuboring, masalan: -1001234567890 Guruh nomi. Bekor qilish: /cancel"
+        )
         await callback.answer()
+        ADMIN_STATE[callback.message.chat.id] = {"mode": "group_add"}
         return
 
     if data.startswith("admin:settings"):
-        current = get_current_settings()
-        lines = ["Settings:"]
+        group = group_registry.get(scope)
+        current = group.current_settings() if group else get_current_settings()
+        lines = [f"Settings ({escape(scope_name(scope, group_registry))}):"]
         for key in sorted(SUPPORTED_KEYS):
             lines.append(f"- {key} = {current.get(key)}")
         buttons = [
@@ -373,16 +632,18 @@ async def admin_callbacks(
 @router.message(lambda message: message.chat.type == "private" and message.chat.id in ADMIN_STATE)
 async def admin_text_input(
     message: Message,
+    bot: Bot,
     sessionmaker: async_sessionmaker[AsyncSession],
-    prohibited_cache: ProhibitedCache,
+    group_registry: GroupRegistry,
 ) -> None:
     logger.info("Handler admin_text_input chat_id=%s user_id=%s", message.chat.id, message.from_user.id if message.from_user else None)
     if not settings.ADMIN_PANEL_ENABLED:
         logger.info("admin_text_input stop: panel disabled")
         return
-    if message.from_user is None or not is_admin(message.from_user.id):
+    if message.from_user is None or not is_admin(message.from_user.id, group_registry):
         logger.info("admin_text_input stop: access denied")
         return
+    scope = get_scope(message.chat.id, message.from_user.id, group_registry)
 
     state = ADMIN_STATE.get(message.chat.id)
     if not state:
@@ -401,7 +662,19 @@ async def admin_text_input(
         if not norm:
             await message.answer("Noto‘g‘ri so‘z. /cancel")
             return
-        match_type = MatchType.PHRASE if " " in norm else MatchType.TOKEN
+        if state.get("pending") != norm:
+            async with sessionmaker() as session:
+                similar = await similar_words(session, scope, norm)
+            if similar:
+                # Sending the same word again confirms it.
+                state["pending"] = norm
+                names = ", ".join(escape(row.original or row.word) for row in similar)
+                await message.answer(
+                    f"O‘xshash so‘zlar bor: {names}\n"
+                    "Baribir qo‘shish uchun so‘zni yana yuboring. Bekor qilish: /cancel"
+                )
+                return
+        match_type = match_type_for(raw, norm)
         now = datetime.now(tz=timezone.utc)
         async with sessionmaker() as session:
             stmt = pg_insert(ProhibitedWord).values(
@@ -411,17 +684,37 @@ async def admin_text_input(
                 match_type=match_type,
                 created_at=now,
                 created_by=message.from_user.id,
+                group_id=scope,
             ).on_conflict_do_update(
-                index_elements=["word"],
-                set_={"enabled": True, "original": raw},
+                index_elements=["group_id", "word"],
+                set_={"enabled": True, "original": raw, "match_type": match_type},
             )
             await session.execute(stmt)
             await session.commit()
-        await prohibited_cache.refresh()
+        await group_registry.refresh_words(scope)
         ADMIN_STATE.pop(message.chat.id, None)
         await message.answer("Saved ✅", reply_markup=admin_menu_kb())
         return
 
+    if mode == "group_add":
+        if message.from_user.id not in get_admin_ids():
+            ADMIN_STATE.pop(message.chat.id, None)
+            await message.answer("Access denied")
+            return
+        parts = (message.text or "").strip().split(maxsplit=1)
+        try:
+            chat_id = int(parts[0])
+        except (IndexError, ValueError):
+            await message.answer("Noto‘g‘ri guruh ID. /cancel")
+            return
+        title = parts[1] if len(parts) > 1 else None
+        await add_group(sessionmaker, chat_id, title, message.from_user.id)
+        await group_registry.refresh()
+        ADMIN_STATE.pop(message.chat.id, None)
+        ADMIN_SCOPE[message.chat.id] = chat_id
+        await message.answer(f"Group saved ✅ ({escape(title or str(chat_id))})", reply_markup=admin_menu_kb())
+        return
+
     if mode == "setting":
         key = state.get("key")
         if not key:
@@ -432,15 +725,20 @@ async def admin_text_input(
         if not raw:
             await message.answer("Noto‘g‘ri qiymat. /cancel")
             return
+        if key == "ADMIN_IDS" and scope != GLOBAL_SCOPE and message.from_user.id not in get_admin_ids():
+            await message.answer("Access denied. /cancel")
+            return
         try:
             async with sessionmaker() as session:
-                await upsert_setting(session, key, raw, message.from_user.id)
+                await upsert_setting(session, key, raw, message.from_user.id, group_id=scope)
                 await session.commit()
                 overrides = {key: raw}
-                apply_runtime_settings(overrides)
+                if scope == GLOBAL_SCOPE:
+                    apply_runtime_settings(overrides)
+                else:
+                    group_registry.apply_overrides(scope, overrides)
             ADMIN_STATE.pop(message.chat.id, None)
-            note = ""
-            await message.answer(f"Saved: {key} = {raw}{note}", reply_markup=admin_menu_kb())
+            await message.answer(f"Saved: {key} = {raw}", reply_markup=admin_menu_kb())
         except Exception:
             logger.exception("Failed to save setting %s", key)
             await message.answer("Xatolik. /cancel")
@@ -453,14 +751,16 @@ async def admin_text_input(
             await message.answer("Noto‘g‘ri so‘z. /cancel")
             return
         async with sessionmaker() as session:
-            result = await session.execute(select(ProhibitedWord).where(ProhibitedWord.word == norm))
+            result = await session.execute(
+                select(ProhibitedWord).where(ProhibitedWord.group_id == scope, ProhibitedWord.word == norm)
+            )
             row = result.scalar_one_or_none()
             if not row:
                 await message.answer("Topilmadi")
             else:
                 row.enabled = False
                 await session.commit()
-                await prohibited_cache.refresh()
+                await group_registry.refresh_words(scope)
                 await message.answer("Disabled ✅")
         ADMIN_STATE.pop(message.chat.id, None)
         await message.answer("Admin panel:", reply_markup=admin_menu_kb())
@@ -472,76 +772,62 @@ async def admin_text_input(
             await message.answer("Noto‘g‘ri so‘z. /cancel")
             return
         query_norm = normalize_word(query)
+        if not query_norm:
+            await message.answer("Noto‘g‘ri so‘z. /cancel")
+            return
         async with sessionmaker() as session:
-            result = await session.execute(
-                select(ProhibitedWord).where(ProhibitedWord.word.ilike(f"%{query_norm}%"))
-            )
-            rows = result.scalars().all()
-        if not rows:
+            results = await search_words(session, scope, query_norm)
+        if not results:
             await message.answer("Topilmadi")
         else:
-            lines = ["Search results:"]
-            for row in rows[:50]:
+            lines = ["Search results (≈ similar):"]
+            for row in results:
                 status = "✅" if row.enabled else "🚫"
                 display = escape(row.original or row.word)
-                lines.append(f"- {display} {status} (id:{row.id})")
+                marker = "" if query_norm in row.word else "≈ "
+                lines.append(f"- {marker}{display} {status} (id:{row.id})")
             await message.answer("\n".join(lines))
         ADMIN_STATE.pop(message.chat.id, None)
         await message.answer("Admin panel:", reply_markup=admin_menu_kb())
         return
 
     if mode == "bulk":
-        lines = (message.text or "").splitlines()
-        added = 0
-        reenabled = 0
-        skipped = 0
-        now = datetime.now(tz=timezone.utc)
-        rows = []
-        norms = []
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            norm = normalize_input(line)
-            if not norm:
-                skipped += 1
-                continue
-            match_type = MatchType.PHRASE if " " in norm else MatchType.TOKEN
-            norms.append(norm)
-            rows.append(
-                {
-                    "word": norm,
-                    "original": line,
-                    "enabled": True,
-                    "match_type": match_type,
-                    "created_at": now,
-                    "created_by": message.from_user.id,
-                }
-            )
-        async with sessionmaker() as session:
-            if rows:
-                existing = {}
-                result = await session.execute(
-                    select(ProhibitedWord.word, ProhibitedWord.enabled).where(ProhibitedWord.word.in_(norms))
-                )
-                for word, enabled in result.all():
-                    existing[word] = enabled
-                stmt = pg_insert(ProhibitedWord).values(rows)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["word"],
-                    set_={"enabled": True, "original": "excluded.original"},
-                )
-                await session.execute(stmt)
-                await session.commit()
-                for norm in norms:
-                    if norm not in existing:
-                        added += 1
-                    elif existing.get(norm) is False:
-                        reenabled += 1
-        await prohibited_cache.refresh()
+        if message.document is not None:
+            suffix = Path(message.document.file_name or "").suffix.lower()
+            if suffix not in IMPORT_FORMATS:
+                await message.answer("Faqat .txt, .csv yoki .json fayl yuboring. /cancel")
+                return
+            file = await bot.get_file(message.document.file_id)
+            words = document_words(stream_file(bot, file.file_path), suffix)
+        elif message.text:
+            words = text_words(message.text)
+        else:
+            await message.answer("So‘zlar ro‘yxatini matn yoki fayl qilib yuboring. /cancel")
+            return
         ADMIN_STATE.pop(message.chat.id, None)
-        await message.answer(
-            f"Imported: {added}, re-enabled: {reenabled}, skipped: {skipped}",
-            reply_markup=admin_menu_kb(),
+        status = await message.answer("⏳ Import boshlandi…")
+
+        async def report(progress: ImportResult) -> None:
+            text = "⏳ Saqlanmoqda…" if progress.merging else f"⏳ O‘qildi: {progress.read}"
+            try:
+                await status.edit_text(text)
+            except Exception:
+                pass
+
+        try:
+            async with sessionmaker() as session:
+                result = await import_words(
+                    session, scope, message.from_user.id, words, normalize_input, progress=report
+                )
+        except Exception:
+            logger.exception("Bulk import failed")
+            await status.edit_text("❌ Import failed; nothing was saved.")
+            await message.answer("Admin panel:", reply_markup=admin_menu_kb())
+            return
+        await group_registry.refresh_words(scope)
+        await status.edit_text(
+            f"Imported: {result.added}, re-enabled: {result.reenabled}, "
+            f"unchanged: {result.unchanged}, duplicates: {result.duplicates}, skipped: {result.skipped}"
         )
+        await message.answer("Admin panel:", reply_markup=admin_menu_kb())
         return
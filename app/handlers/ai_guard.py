@@ -3,30 +3,32 @@ import logging
 import random
 from datetime import datetime, timezone
 
-from aiogram import Bot, Router, F
+from aiogram import Bot, Router
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
-from app.db.models import ModerationReason, UserProfile
+from app.db.fastpath import fastpath
+from app.db.models import ModerationReason
 from app.services.ai_moderation import AiModerator
-from app.services.moderation import punish_user_for_message
-from app.services.prohibited import ProhibitedCache
-from app.services.user_profiles import get_profile, upsert_profile
-from app.services.verification import is_approved
+from app.services.degradation import DegradationLevel
+from app.services.groups import GroupConfig, ManagedGroup
+from app.services.moderation import already_moderated, punish_user_for_message
+from app.services.prohibited import record_hit
 
 logger = logging.getLogger(__name__)
 
 router = Router()
 
 
-@router.message(F.chat.id == settings.GROUP_ID)
+@router.message(ManagedGroup())
 async def ai_guard(
     message: Message,
     bot: Bot,
     sessionmaker: async_sessionmaker[AsyncSession],
-    prohibited_cache: ProhibitedCache,
+    group: GroupConfig,
     ai_moderator: AiModerator,
+    degradation_level: DegradationLevel = DegradationLevel.NORMAL,
 ) -> None:
     logger.info("Handler ai_guard chat_id=%s message_id=%s", message.chat.id, message.message_id)
     if message.from_user is None or message.from_user.is_bot:
@@ -37,40 +39,51 @@ async def ai_guard(
         logger.info("ai_guard stop: service message")
         return
 
+    if degradation_level >= DegradationLevel.DELETE_ONLY:
+        logger.info("ai_guard stop: degraded to delete-only")
+        return
+
     text = message.text or message.caption or ""
     if not text:
         logger.info("ai_guard stop: no text")
         return
 
+    # Redelivered update; skips the admin lookup and a second AI call
+    if already_moderated(message):
+        logger.info("ai_guard stop: already moderated")
+        return
+
+    if degradation_level >= DegradationLevel.KEYWORD_ONLY:
+        await keyword_only_guard(message, bot, sessionmaker, group, text)
+        return
+
     # skip admins
     try:
-        member = await bot.get_chat_member(settings.GROUP_ID, message.from_user.id)
+        member = await bot.get_chat_member(group.chat_id, message.from_user.id)
         if member.status in {"administrator", "creator"}:
             logger.info("ai_guard stop: admin user")
             return
     except Exception:
         logger.exception("Failed to check member status for AI moderation")
 
-    async with sessionmaker() as session:
-        await upsert_profile(session, message.from_user)
-        profile = await get_profile(session, message.from_user.id)
-        if not profile:
-            profile = UserProfile(user_id=message.from_user.id, first_name=message.from_user.first_name or "")
-        approved = await is_approved(session, settings.GROUP_ID, message.from_user.id)
-        await session.commit()
+    if degradation_level < DegradationLevel.SKIP_PROFILES:
+        await fastpath.upsert_profile(message.from_user, datetime.now(tz=timezone.utc))
+    approved = await fastpath.is_approved(group.chat_id, message.from_user.id)
 
     if not approved:
         logger.info("ai_guard stop: not approved")
         return
 
     # keyword check first
-    matched = prohibited_cache.match(text)
+    matched = group.match(text)
     if matched:
+        record_hit(matched)
         async with sessionmaker() as session:
             await punish_user_for_message(
                 bot=bot,
                 session=session,
                 message=message,
+                group=group,
                 reason=ModerationReason.KEYWORD,
                 matched_word=matched.original,
             )
@@ -79,7 +92,11 @@ async def ai_guard(
         logger.info("locally: no keyword match")
 
     # AI moderation
-    if not settings.AI_MODERATION_ENABLED:
+    if degradation_level >= DegradationLevel.SKIP_AI:
+        logger.info("ai_guard stop: AI skipped by degradation")
+        return
+
+    if not group.setting("AI_MODERATION_ENABLED"):
         logger.info("ai_guard stop: AI moderation disabled")
         return
 
@@ -93,16 +110,9 @@ async def ai_guard(
 
     now = datetime.now(tz=timezone.utc)
     # cooldown (DB based via user_profiles)
-    async with sessionmaker() as session:
-        prof = await get_profile(session, message.from_user.id)
-        if prof and prof.last_ai_check_at:
-            delta = (now - prof.last_ai_check_at).total_seconds()
-            if delta < settings.AI_MODERATION_COOLDOWN_SEC:
-                logger.info("ai_guard stop: cooldown")
-                return
-        if prof:
-            prof.last_ai_check_at = now
-            await session.commit()
+    if not await fastpath.claim_ai_check(message.from_user.id, now, settings.AI_MODERATION_COOLDOWN_SEC):
+        logger.info("ai_guard stop: cooldown")
+        return
 
     try:
         decision = await ai_moderator.classify_text(text)
@@ -140,6 +150,7 @@ async def ai_guard(
             bot=bot,
             session=session,
             message=message,
+            group=group,
             reason=ModerationReason.AI,
             ai_decision=decision,
         )
@@ -150,3 +161,37 @@ async def ai_guard(
         decision.label,
         decision.confidence,
     )
+
+
+async def keyword_only_guard(
+    message: Message,
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group: GroupConfig,
+    text: str,
+) -> None:
+    # Cheapest path: in-memory match first, DB only for actual hits, no Bot API lookups.
+    matched = group.match(text)
+    if not matched:
+        logger.info("ai_guard stop: keyword-only, no match")
+        return
+
+    if message.from_user.id in group.admin_ids:
+        logger.info("ai_guard stop: admin user")
+        return
+
+    approved = await fastpath.is_approved(group.chat_id, message.from_user.id)
+    if not approved:
+        logger.info("ai_guard stop: not approved")
+        return
+
+    record_hit(matched)
+    async with sessionmaker() as session:
+        await punish_user_for_message(
+            bot=bot,
+            session=session,
+            message=message,
+            group=group,
+            reason=ModerationReason.KEYWORD,
+            matched_word=matched.original,
+        )
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
 from app.db.models import VerificationSession
+from app.services.groups import GroupConfig, ManagedGroup
 from app.security import decode_session_id, verify_callback_signature, build_start_payload
 from app.texts import ALERT_TEXT
 
@@ -15,14 +16,14 @@ logger = logging.getLogger(__name__)
 router = Router()
 
 
-@router.callback_query(lambda c: c.data and c.data.startswith("agree:"))
+@router.callback_query(lambda c: c.data and c.data.startswith("agree:"), ManagedGroup())
 async def on_agree_callback(
-    callback: CallbackQuery, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]
+    callback: CallbackQuery,
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group: GroupConfig,
 ) -> None:
     logger.info("Handler on_agree_callback from_user=%s", callback.from_user.id if callback.from_user else None)
-    if callback.message and callback.message.chat.id != settings.GROUP_ID:
-        logger.info("on_agree_callback stop: wrong group")
-        return
 
     data = callback.data.split(":", 3)
     if len(data) != 4:
@@ -43,7 +44,7 @@ async def on_agree_callback(
         return
 
     if not verify_callback_signature(
-        settings.SECRET_KEY, settings.GROUP_ID, intended_user_id, session_id, signature
+        settings.SECRET_KEY, group.chat_id, intended_user_id, session_id, signature
     ):
         await callback.answer()
         logger.info("on_agree_callback stop: signature invalid")
@@ -55,12 +56,12 @@ async def on_agree_callback(
             await callback.answer()
             logger.info("on_agree_callback stop: session not found")
             return
-        if result.user_id != intended_user_id or result.group_id != settings.GROUP_ID:
+        if result.user_id != intended_user_id or result.group_id != group.chat_id:
             await callback.answer()
             logger.info("on_agree_callback stop: session mismatch")
             return
 
-    payload = build_start_payload(settings.SECRET_KEY, settings.GROUP_ID, intended_user_id, session_id)
+    payload = build_start_payload(settings.SECRET_KEY, group.chat_id, intended_user_id, session_id)
     deep_link = await create_start_link(bot, payload=f"agree_{payload}", encode=False)
     await callback.answer(url=deep_link)
     logger.info("Redirected user %s to DM", intended_user_id)
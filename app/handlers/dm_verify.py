@@ -5,11 +5,11 @@ from aiogram import Bot, Router
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.config import settings
 from app.db.models import SessionState
+from app.services.groups import GroupRegistry
 from app.services.user_profiles import upsert_profile
 from app.services.verification import (
-    get_active_session,
+    get_pending_sessions,
     mark_approved,
     unrestrict_user,
 )
@@ -27,7 +27,10 @@ def normalize_word(text: str) -> str:
 
 @router.message(lambda message: message.chat.type == "private")
 async def on_dm_message(
-    message: Message, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]
+    message: Message,
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group_registry: GroupRegistry,
 ) -> None:
     logger.info("Handler on_dm_message chat_id=%s user_id=%s", message.chat.id, message.from_user.id if message.from_user else None)
     if message.chat.type != "private":
@@ -44,52 +47,72 @@ async def on_dm_message(
 
     async with sessionmaker() as session:
         await upsert_profile(session, message.from_user, phone_number=phone_number)
-        ver_session = await get_active_session(session, settings.GROUP_ID, message.from_user.id)
-        if not ver_session:
+        candidates = [
+            item
+            for item in await get_pending_sessions(session, message.from_user.id)
+            if group_registry.get(item.group_id) is not None
+        ]
+        if not candidates:
             await session.commit()
             logger.info("on_dm_message stop: no session")
             return
 
-        if ver_session.state not in {SessionState.WAITING_DM_CONFIRM, SessionState.JOINED_LOCKED}:
+        # A user joining several groups at once has one session per group; the word picks one.
+        candidates = [
+            item
+            for item in candidates
+            if item.state in {SessionState.WAITING_DM_CONFIRM, SessionState.JOINED_LOCKED}
+        ]
+        if not candidates:
             await session.commit()
             logger.info("on_dm_message stop: wrong state")
             return
 
-        if ver_session.expires_at <= datetime.now(tz=timezone.utc):
+        candidates = [item for item in candidates if item.expires_at > datetime.now(tz=timezone.utc)]
+        if not candidates:
             await session.commit()
             logger.info("on_dm_message stop: expired")
             return
 
-        if normalize_word(message.text or "") != normalize_word(ver_session.magic_word):
+        ver_session = next(
+            (
+                item
+                for item in candidates
+                if normalize_word(message.text or "") == normalize_word(item.magic_word)
+            ),
+            None,
+        )
+        if ver_session is None:
             await session.commit()
             logger.info("on_dm_message stop: word mismatch")
             return
 
-        await unrestrict_user(bot, settings.GROUP_ID, message.from_user.id)
-        await mark_approved(session, settings.GROUP_ID, message.from_user.id)
+        group = group_registry.get(ver_session.group_id)
+        await unrestrict_user(bot, group.chat_id, message.from_user.id)
+        await mark_approved(session, group.chat_id, message.from_user.id)
         ver_session.state = SessionState.CONFIRMED_UNLOCKED
         ver_session.updated_at = datetime.now(tz=timezone.utc)
-        ver_session.reminder_count = settings.MAX_REMINDERS
+        ver_session.reminder_count = group.setting("MAX_REMINDERS")
         ver_session.remind_at = ver_session.expires_at
         await session.commit()
 
     try:
         if ver_session.welcome_message_id:
             await bot.edit_message_text(
-                chat_id=settings.GROUP_ID,
+                chat_id=group.chat_id,
                 message_id=ver_session.welcome_message_id,
                 text=render_success(message.from_user.id, message.from_user.full_name),
                 parse_mode="HTML",
             )
         else:
             await bot.send_message(
-                chat_id=settings.GROUP_ID,
+                chat_id=group.chat_id,
                 text=render_success(message.from_user.id, message.from_user.full_name),
                 parse_mode="HTML",
             )
     except Exception:
         await bot.send_message(
-            chat_id=settings.GROUP_ID,
+            chat_id=group.chat_id,
             text=render_success(message.from_user.id, message.from_user.full_name),
             parse_mode="HTML",
         )
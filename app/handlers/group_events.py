@@ -8,8 +8,9 @@ from aiogram.filters.chat_member_updated import IS_MEMBER, IS_NOT_MEMBER
 from aiogram.types import ChatMemberUpdated, Message
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.config import settings, get_admin_ids
+from app.db.fastpath import fastpath
 from app.db.models import SessionState
+from app.services.groups import GroupConfig, ManagedGroup
 from app.services.user_profiles import upsert_profile
 from app.services.verification import (
     get_active_session,
@@ -26,28 +27,25 @@ router = Router()
 
 
 class IsUnapproved(BaseFilter):
-    async def __call__(self, message: Message, sessionmaker: async_sessionmaker[AsyncSession]) -> bool:
+    async def __call__(self, message: Message) -> bool:
         if message.from_user is None or message.from_user.is_bot:
             return False
         if message.new_chat_members or message.left_chat_member:
             return False
-        async with sessionmaker() as session:
-            if await is_approved(session, settings.GROUP_ID, message.from_user.id):
-                return False
-            ver_session = await get_active_session(session, settings.GROUP_ID, message.from_user.id)
-            if ver_session and ver_session.state == SessionState.CONFIRMED_UNLOCKED:
-                return False
-        return True
+        if await fastpath.is_approved(message.chat.id, message.from_user.id):
+            return False
+        state = await fastpath.get_session_state(message.chat.id, message.from_user.id)
+        return state != SessionState.CONFIRMED_UNLOCKED
 
 
-@router.chat_member(ChatMemberUpdatedFilter(IS_NOT_MEMBER >> IS_MEMBER))
+@router.chat_member(ChatMemberUpdatedFilter(IS_NOT_MEMBER >> IS_MEMBER), ManagedGroup())
 async def on_user_join(
-    event: ChatMemberUpdated, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]
+    event: ChatMemberUpdated,
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group: GroupConfig,
 ) -> None:
     logger.info("Handler on_user_join chat_id=%s user_id=%s", event.chat.id, event.new_chat_member.user.id)
-    if event.chat.id != settings.GROUP_ID:
-        logger.info("on_user_join stop: not target group")
-        return
 
     user = event.new_chat_member.user
     if user.is_bot:
@@ -56,18 +54,24 @@ async def on_user_join(
 
     async with sessionmaker() as session:
         await upsert_profile(session, user)
-        if await is_approved(session, settings.GROUP_ID, user.id):
+        if await is_approved(session, group.chat_id, user.id):
             logger.info("on_user_join stop: already approved")
             return
 
-        ver_session = await upsert_session(session, settings.GROUP_ID, user.id)
+        ver_session = await upsert_session(
+            session,
+            group.chat_id,
+            user.id,
+            remind_after_min=group.setting("REMIND_AFTER_MIN"),
+            expire_after_min=group.setting("EXPIRE_AFTER_MIN"),
+        )
         await session.commit()
 
-    await restrict_user(bot, settings.GROUP_ID, user.id)
+    await restrict_user(bot, group.chat_id, user.id)
 
     try:
         message = await bot.send_message(
-            chat_id=settings.GROUP_ID,
+            chat_id=group.chat_id,
             text=render_welcome(user.id, user.full_name),
             parse_mode="HTML",
             reply_markup=build_agree_keyboard(ver_session),
@@ -78,18 +82,16 @@ async def on_user_join(
         return
 
     async with sessionmaker() as session:
-        existing = await get_active_session(session, settings.GROUP_ID, user.id)
+        existing = await get_active_session(session, group.chat_id, user.id)
         if existing and existing.state != SessionState.CONFIRMED_UNLOCKED:
             existing.welcome_message_id = message.message_id
             existing.updated_at = datetime.now(tz=timezone.utc)
             await session.commit()
 
-    logger.info("New user %s locked in group %s", user.id, settings.GROUP_ID)
+    logger.info("New user %s locked in group %s", user.id, group.chat_id)
 
 
-@router.message(
-    (F.chat.id == settings.GROUP_ID) & (F.new_chat_members | F.left_chat_member)
-)
+@router.message(ManagedGroup(), F.new_chat_members | F.left_chat_member)
 async def delete_service_messages(message: Message, bot: Bot) -> None:
     logger.info("Handler delete_service_messages chat_id=%s message_id=%s", message.chat.id, message.message_id)
     try:
@@ -98,11 +100,11 @@ async def delete_service_messages(message: Message, bot: Bot) -> None:
         pass
 
 
-@router.message(F.chat.id == settings.GROUP_ID, IsUnapproved())
+@router.message(ManagedGroup(), IsUnapproved())
 async def delete_unapproved_messages(
-    message: Message, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]
+    message: Message, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession], group: GroupConfig
 ) -> None:
-    if message.from_user.id in get_admin_ids():
+    if message.from_user.id in group.admin_ids:
         logger.info("delete_unapproved_messages stop: admin user")
         return
     logger.info("Handler delete_unapproved_messages chat_id=%s message_id=%s", message.chat.id, message.message_id)
@@ -3,12 +3,13 @@ from datetime import datetime, timedelta, timezone
 from html import escape
 from zoneinfo import ZoneInfo
 
-from aiogram import Bot, Router, F
+from aiogram import Bot, Router
 from aiogram.types import ChatPermissions, Message
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.config import settings, get_primary_admin_id
-from app.services.prohibited import ProhibitedCache
+from app.config import settings
+from app.services.groups import GroupConfig, ManagedGroup
+from app.services.prohibited import record_hit
 from app.services.user_profiles import format_user_admin_card, get_profile, upsert_profile
 from app.services.verification import is_approved
 
@@ -43,12 +44,12 @@ def format_until(dt_utc: datetime) -> str:
     return local_dt.strftime("%Y-%m-%d %H:%M")
 
 
-@router.message(F.chat.id == settings.GROUP_ID)
+@router.message(ManagedGroup())
 async def prohibited_guard(
     message: Message,
     bot: Bot,
     sessionmaker: async_sessionmaker[AsyncSession],
-    prohibited_cache: ProhibitedCache,
+    group: GroupConfig,
 ) -> None:
     logger.info("Handler prohibited_guard chat_id=%s message_id=%s", message.chat.id, message.message_id)
     if message.from_user is None or message.from_user.is_bot:
@@ -62,34 +63,35 @@ async def prohibited_guard(
 
     async with sessionmaker() as session:
         await upsert_profile(session, message.from_user)
-        approved = await is_approved(session, settings.GROUP_ID, message.from_user.id)
+        approved = await is_approved(session, group.chat_id, message.from_user.id)
         profile = await get_profile(session, message.from_user.id)
         await session.commit()
     if not approved:
         logger.info("prohibited_guard stop: not approved")
         return
 
-    matched = prohibited_cache.match(text)
+    matched = group.match(text)
     if not matched:
         logger.info("prohibited_guard stop: no match")
         return
 
     now = datetime.now(tz=timezone.utc)
-    until = now + timedelta(minutes=settings.MUTE_MINUTES)
+    until = now + timedelta(minutes=group.setting("MUTE_MINUTES"))
     until_str = format_until(until)
 
     is_admin = False
     try:
-        member = await bot.get_chat_member(settings.GROUP_ID, message.from_user.id)
+        member = await bot.get_chat_member(group.chat_id, message.from_user.id)
         if member.status in {"administrator", "creator"}:
             is_admin = True
     except Exception:
         logger.exception("Failed to get chat member for prohibited moderation")
 
     if not is_admin:
+        record_hit(matched)
         try:
             await bot.restrict_chat_member(
-                chat_id=settings.GROUP_ID,
+                chat_id=group.chat_id,
                 user_id=message.from_user.id,
                 permissions=ChatPermissions(
                     can_send_messages=False,
@@ -109,7 +111,7 @@ async def prohibited_guard(
     if throttle.should_notify(message.from_user.id, now):
         try:
             await bot.send_message(
-                chat_id=settings.GROUP_ID,
+                chat_id=group.chat_id,
                 text=(
                     f"{html_mention(message.from_user.id, message.from_user.full_name)} "
                     f"guruhda taqiqlangan mavzudagi gaplari uchun {until_str} gacha "
@@ -120,7 +122,7 @@ async def prohibited_guard(
         except Exception:
             logger.exception("Failed to send prohibited group notification")
 
-    admin_id = get_primary_admin_id()
+    admin_id = group.primary_admin_id
     if admin_id is None:
         logger.exception("No admin id configured")
         return
@@ -128,7 +130,7 @@ async def prohibited_guard(
     try:
         await bot.forward_message(
             chat_id=admin_id,
-            from_chat_id=settings.GROUP_ID,
+            from_chat_id=group.chat_id,
             message_id=message.message_id,
         )
     except Exception:
@@ -142,7 +144,7 @@ async def prohibited_guard(
                 profile=profile,
                 matched_word=matched.original,
                 until_dt=until,
-                group_id=settings.GROUP_ID,
+                group_id=group.chat_id,
                 until_str=until_str,
             ),
             parse_mode="HTML",
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.config import settings
 from app.db.models import SessionState, VerificationSession
 from app.security import parse_start_payload, verify_start_payload
+from app.services.groups import GroupRegistry
 from app.services.verification import update_session_state
 from app.texts import render_rules
 
@@ -19,7 +20,10 @@ router = Router()
 
 @router.message(CommandStart(deep_link=True))
 async def on_start(
-    message: Message, bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]
+    message: Message,
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group_registry: GroupRegistry,
 ) -> None:
     logger.info("Handler on_start chat_id=%s user_id=%s", message.chat.id, message.from_user.id if message.from_user else None)
     if message.chat.type != "private":
@@ -47,12 +51,8 @@ async def on_start(
         if not ver_session:
             logger.info("Start ignored: session not found session_id=%s", session_id)
             return
-        if ver_session.group_id != settings.GROUP_ID:
-            logger.info(
-                "Start ignored: group mismatch session_group=%s expected=%s",
-                ver_session.group_id,
-                settings.GROUP_ID,
-            )
+        if group_registry.get(ver_session.group_id) is None:
+            logger.info("Start ignored: group not managed session_group=%s", ver_session.group_id)
             return
         if message.from_user.id != ver_session.user_id:
             logger.info(
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import logging
+import signal
 
 from aiogram import Bot, Dispatcher
 from aiogram.types import BotCommand, BotCommandScopeAllPrivateChats
@@ -9,13 +10,26 @@ from alembic import command
 from alembic.config import Config
 
 from app.config import settings
-from app.db.session import AsyncSessionLocal
+from app.db.fastpath import fastpath
+from app.db.session import AsyncSessionLocal, engine, warm_up_pool
 from app.handlers import callbacks, dm_verify, group_events, start, prohibited_guard, admin_panel, ai_guard
 from app.logging_config import setup_logging
-from app.services.prohibited import ProhibitedCache, seed_from_file_if_empty
+from app.services.groups import GroupRegistry, seed_default_group
+from app.services.leader import LeaderElector
+from app.services.prohibited import seed_from_file_if_empty
 from app.services.ai_moderation import AiModerator
+from app.services.audit_writer import audit_writer
 from app.services.runtime_settings import load_runtime_settings, apply_runtime_settings
+from app.services.degradation import DegradationController, degradation_watcher, parse_steps
+from app.services.metrics import metrics_reporter
 from app.services.reminders import reminder_worker
+from app.services.startup_drain import StartupDrain, startup_drain_watcher
+from app.services.moderation_maintenance import moderation_maintenance
+from app.services.sweeper import expiry_sweeper
+from app.services.update_queue import QueueIngestMiddleware, UpdateQueueWorker
+from app.services.update_scheduler import UpdateScheduler
+from app.services.word_stats import flush_word_hits, word_stats_flusher
+from app.webhook import run_webhook
 
 logger = logging.getLogger(__name__)
 
@@ -26,26 +40,132 @@ def run_migrations() -> None:
     command.upgrade(alembic_cfg, "head")
 
 
+async def cache_refresher(group_registry: GroupRegistry) -> None:
+    while True:
+        await asyncio.sleep(settings.CACHE_REFRESH_INTERVAL_SEC)
+        try:
+            async with AsyncSessionLocal() as session:
+                apply_runtime_settings(await load_runtime_settings(session))
+            await group_registry.refresh()
+        except Exception:
+            logger.exception("Cache refresh failed")
+
+
+def stop_on_signals() -> asyncio.Event:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+    return stop
+
+
+async def poll_updates(bot: Bot, dp: Dispatcher) -> None:
+    # getUpdates is rejected while a webhook is set, e.g. after switching modes.
+    await bot.delete_webhook(drop_pending_updates=False)
+    polling = asyncio.create_task(dp.start_polling(bot, handle_signals=False, close_bot_session=False))
+    try:
+        await asyncio.shield(polling)
+    except asyncio.CancelledError:
+        # Cancelling start_polling directly leaves its getUpdates task running.
+        try:
+            await dp.stop_polling()
+        except RuntimeError:
+            polling.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await polling
+        raise
+
+
+async def run_duties(bot: Bot, dp: Dispatcher, group_registry: GroupRegistry) -> None:
+    # Work that must run in exactly one replica: two pollers conflict, two reminder
+    # workers send duplicates.
+    await group_registry.refresh()
+    async with asyncio.TaskGroup() as duties:
+        duties.create_task(reminder_worker(bot, AsyncSessionLocal, group_registry))
+        duties.create_task(expiry_sweeper(bot, AsyncSessionLocal))
+        duties.create_task(moderation_maintenance(AsyncSessionLocal))
+        if settings.BOT_MODE == "polling":
+            duties.create_task(poll_updates(bot, dp))
+
+
+async def run_until_stopped(coro, stop: asyncio.Event) -> None:
+    task = asyncio.create_task(coro)
+    stopped = asyncio.create_task(stop.wait())
+    await asyncio.wait({task, stopped}, return_when=asyncio.FIRST_COMPLETED)
+    stopped.cancel()
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+async def run_queue_worker(bot: Bot, dp: Dispatcher, stop: asyncio.Event) -> None:
+    worker = UpdateQueueWorker(
+        bot=bot,
+        dp=dp,
+        sessionmaker=AsyncSessionLocal,
+        concurrency=settings.QUEUE_WORKER_CONCURRENCY,
+        poll_interval_sec=settings.QUEUE_POLL_INTERVAL_MS / 1000,
+        visibility_timeout_sec=settings.QUEUE_VISIBILITY_TIMEOUT_SEC,
+    )
+    await worker.run(stop)
+
+
 async def main() -> None:
     setup_logging()
-    logger.info("Starting bot in polling mode")
+    logger.info("Starting bot role=%s mode=%s", settings.APP_ROLE, settings.BOT_MODE)
 
     bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
     await bot.set_my_commands(
         [BotCommand(command="start", description="Botni ishga tushurish")],
         scope=BotCommandScopeAllPrivateChats(),
     )
+    await warm_up_pool(engine, settings.DB_POOL_WARMUP)
+    await fastpath.start()
+    audit_writer.start(AsyncSessionLocal)
     dp = Dispatcher()
     dp["sessionmaker"] = AsyncSessionLocal
     await seed_from_file_if_empty(AsyncSessionLocal)
+    await seed_default_group(AsyncSessionLocal)
     async with AsyncSessionLocal() as session:
         overrides = await load_runtime_settings(session)
         apply_runtime_settings(overrides)
-    prohibited_cache = ProhibitedCache(AsyncSessionLocal)
-    await prohibited_cache.refresh()
-    dp["prohibited_cache"] = prohibited_cache
+    group_registry = GroupRegistry(AsyncSessionLocal)
+    await group_registry.refresh()
+    if not len(group_registry):
+        logger.warning("No groups configured; set GROUP_ID or add one from the admin panel")
+    dp["group_registry"] = group_registry
     ai_moderator = AiModerator()
     dp["ai_moderator"] = ai_moderator
+    if settings.APP_ROLE == "ingest":
+        # Must run before the scheduler: queued updates are scheduled by the workers.
+        dp.update.outer_middleware(QueueIngestMiddleware(AsyncSessionLocal))
+    startup_drain = StartupDrain(
+        max_age_sec=settings.STARTUP_STALE_AGE_SEC,
+        mode=settings.STARTUP_STALE_MODE,
+        max_duration_sec=settings.STARTUP_DRAIN_MAX_SEC,
+    )
+    # Before the scheduler, so updates are judged in arrival order: one fresh update
+    # leaving an idle lane must not end the drain while stale ones are still queued.
+    # The degradation controller after it leaves the stale updates it marks out.
+    dp.update.outer_middleware(startup_drain)
+    dp["startup_drain"] = startup_drain
+    update_scheduler = UpdateScheduler(
+        lanes=settings.UPDATE_LANES,
+        concurrency=settings.UPDATE_CONCURRENCY,
+        low_priority_share=settings.UPDATE_LOW_PRIORITY_SHARE,
+    )
+    dp.update.outer_middleware(update_scheduler)
+    dp["update_scheduler"] = update_scheduler
+    degradation = DegradationController(
+        lag_steps=parse_steps(settings.DEGRADATION_LAG_STEPS),
+        depth_steps=parse_steps(settings.DEGRADATION_DEPTH_STEPS),
+        recover_after_sec=settings.DEGRADATION_RECOVER_SEC,
+        escalate_after_sec=settings.DEGRADATION_ESCALATE_SEC,
+        enabled=settings.DEGRADATION_ENABLED,
+    )
+    dp.update.outer_middleware(degradation)
+    dp["degradation"] = degradation
 
     dp.include_router(admin_panel.router)
     dp.include_router(group_events.router)
@@ -54,15 +174,48 @@ async def main() -> None:
     dp.include_router(start.router)
     dp.include_router(dm_verify.router)
 
-    reminder_task = asyncio.create_task(reminder_worker(bot, AsyncSessionLocal))
+    background_tasks = []
+    if settings.APP_ROLE != "standalone" or settings.LEADER_ELECTION_ENABLED:
+        # Admin changes made in another process only reach this one through the DB;
+        # this also keeps a standby's caches warm for a failover.
+        background_tasks.append(asyncio.create_task(cache_refresher(group_registry)))
+    if settings.METRICS_LOG_INTERVAL_SEC > 0:
+        background_tasks.append(asyncio.create_task(metrics_reporter(settings.METRICS_LOG_INTERVAL_SEC)))
+    background_tasks.append(asyncio.create_task(word_stats_flusher(AsyncSessionLocal)))
+    if settings.DEGRADATION_ENABLED:
+        background_tasks.append(asyncio.create_task(degradation_watcher(degradation, update_scheduler)))
+    if startup_drain.active:
+        background_tasks.append(asyncio.create_task(startup_drain_watcher(startup_drain)))
 
+    stop = stop_on_signals()
     try:
-        await dp.start_polling(bot)
+        if settings.APP_ROLE == "worker":
+            await run_queue_worker(bot, dp, stop)
+        else:
+            transports = []
+            if settings.BOT_MODE == "webhook":
+                # Every replica serves the webhook; only the duties need a single owner.
+                transports.append(run_webhook(bot, dp, stop))
+            if settings.LEADER_ELECTION_ENABLED:
+                elector = LeaderElector(engine, settings.LEADER_LOCK_KEY, settings.LEADER_HEARTBEAT_SEC)
+                dp["leader_elector"] = elector
+                transports.append(elector.run(lambda: run_duties(bot, dp, group_registry), stop))
+            else:
+                transports.append(run_until_stopped(run_duties(bot, dp, group_registry), stop))
+            await asyncio.gather(*transports)
     finally:
-        reminder_task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await reminder_task
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
         await ai_moderator.close()
+        try:
+            await flush_word_hits(AsyncSessionLocal)
+        except Exception:
+            logger.exception("Final word hit flush failed")
+        await audit_writer.close()
+        await fastpath.close()
         await bot.session.close()
 
 
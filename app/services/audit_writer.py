@@ -0,0 +1,244 @@
+import asyncio
+import contextlib
+import enum
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from sqlalchemy import DateTime, insert
+from sqlalchemy.exc import DBAPIError, StatementError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db.models import Base, ModerationEvent
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Models the writer may persist, by table name; the spill file refers to them by it.
+AUDIT_MODELS: dict[str, type[Base]] = {ModerationEvent.__tablename__: ModerationEvent}
+# SQLSTATE classes that blame the rows themselves (data exception, integrity
+# violation); retrying them can never succeed.
+ROW_ERROR_CLASSES = ("22", "23")
+
+
+def encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def decode_row(model: type[Base], values: dict[str, Any]) -> dict[str, Any]:
+    for column in model.__table__.columns:
+        if isinstance(column.type, DateTime) and isinstance(values.get(column.key), str):
+            values[column.key] = datetime.fromisoformat(values[column.key])
+    return values
+
+
+def rejects_rows(exc: Exception) -> bool:
+    if isinstance(exc, DBAPIError):
+        sqlstate = getattr(exc.orig, "sqlstate", None) or ""
+        return sqlstate[:2] in ROW_ERROR_CLASSES
+    # Values that could not even be bound to the statement.
+    return isinstance(exc, StatementError)
+
+
+class AuditWriter:
+    """Persists audit rows in the background so handlers never wait on them.
+
+    Rows are queued in memory (bounded by AUDIT_QUEUE_SIZE) and written with one
+    multi-row INSERT per table every AUDIT_FLUSH_INTERVAL_MS, or as soon as
+    AUDIT_BATCH_SIZE rows are waiting. A batch the database rejects, and rows that do
+    not fit in the queue, are appended to AUDIT_SPILL_PATH as JSON lines. The file is
+    replayed after the next successful flush. Pending rows are flushed on close.
+
+    Replay streams the file in batches and records the offset of the last committed
+    one, so a replay cut short resumes where it stopped. Rows the database rejects
+    as invalid are moved to a `.rejected` file next to the spill file instead of
+    blocking the replay.
+    """
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[tuple[type[Base], dict[str, Any]]] = asyncio.Queue(settings.AUDIT_QUEUE_SIZE)
+        self.batch_size = max(1, settings.AUDIT_BATCH_SIZE)
+        self.flush_interval = settings.AUDIT_FLUSH_INTERVAL_MS / 1000
+        self.spill_path = Path(settings.AUDIT_SPILL_PATH)
+        self.replay_path = self.spill_path.with_name(self.spill_path.name + ".replay")
+        self.offset_path = self.spill_path.with_name(self.spill_path.name + ".replay.offset")
+        self.rejected_path = self.spill_path.with_name(self.spill_path.name + ".rejected")
+        self.sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self._full = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+        self._depth = metrics.gauge("audit_queue_depth")
+
+    def start(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        self.sessionmaker = sessionmaker
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, model: type[Base], values: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait((model, values))
+        except asyncio.QueueFull:
+            metrics.counter("audit_queue_full_total").inc()
+            self._spill([(model, values)])
+            return
+        self._depth.set(self.queue.qsize())
+        if self.queue.qsize() >= self.batch_size:
+            self._full.set()
+
+    def _take_batch(self) -> list[tuple[type[Base], dict[str, Any]]]:
+        batch = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        self._depth.set(self.queue.qsize())
+        return batch
+
+    async def _run(self) -> None:
+        # Never cancelled: close() asks the loop to drain and waits for it, so no batch
+        # is lost halfway through an insert.
+        if self.replay_path.exists() or self.spill_path.exists():
+            await self._replay()
+        while not (self._closing and self.queue.empty()):
+            if not self._closing and self.queue.qsize() < self.batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            self._full.clear()
+            if not self.queue.empty():
+                await self._flush(self._take_batch())
+
+    async def _insert(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        statements: dict[tuple[type[Base], tuple[str, ...]], list[dict[str, Any]]] = {}
+        for model, values in batch:
+            statements.setdefault((model, tuple(sorted(values))), []).append(values)
+        # One transaction, so a failed batch can be spilled or replayed whole.
+        async with self.sessionmaker() as session:
+            for (model, _keys), rows in statements.items():
+                for start in range(0, len(rows), self.batch_size):
+                    await session.execute(insert(model).values(rows[start : start + self.batch_size]))
+            await session.commit()
+
+    async def _flush(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._insert(batch)
+        except Exception:
+            logger.exception("Audit flush failed; spilling %s rows to %s", len(batch), self.spill_path)
+            await asyncio.to_thread(self._spill, batch)
+            return
+        metrics.counter("audit_rows_written_total").inc(len(batch))
+        metrics.histogram("audit_flush_seconds").observe(time.perf_counter() - started)
+        if self.replay_path.exists() or self.spill_path.exists():
+            await self._replay()
+
+    def _write_rows(self, path: Path, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as target:
+            for model, values in batch:
+                target.write(json.dumps({"table": model.__tablename__, "values": values}, default=encode_value))
+                target.write("\n")
+
+    def _spill(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        try:
+            self._write_rows(self.spill_path, batch)
+            metrics.counter("audit_rows_spilled_total").inc(len(batch))
+        except Exception:
+            metrics.counter("audit_rows_lost_total").inc(len(batch))
+            logger.exception("Failed to spill %s audit rows", len(batch))
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text())
+        except (OSError, ValueError):
+            return 0
+
+    def _read_replay_batch(self, replay: BinaryIO) -> tuple[list[tuple[type[Base], dict[str, Any]]], bool]:
+        # The next batch of the replay file, and whether the file is exhausted.
+        batch = []
+        while len(batch) < self.batch_size:
+            position = replay.tell()
+            line = replay.readline()
+            if not line:
+                return batch, True
+            try:
+                record = json.loads(line)
+                model = AUDIT_MODELS[record["table"]]
+                batch.append((model, decode_row(model, record["values"])))
+            except (ValueError, KeyError, TypeError):
+                # Most likely a line cut short by a crash while spilling.
+                logger.warning("Skipping unreadable audit spill line at byte %s", position)
+        return batch, False
+
+    async def _insert_each(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> int:
+        # Finds the rows the database refuses; any other failure stops the replay.
+        rejected = []
+        for row in batch:
+            try:
+                await self._insert([row])
+            except Exception as exc:
+                if not rejects_rows(exc):
+                    raise
+                logger.warning("Audit row rejected by the database: %s", exc)
+                rejected.append(row)
+        if rejected:
+            await asyncio.to_thread(self._write_rows, self.rejected_path, rejected)
+            metrics.counter("audit_rows_rejected_total").inc(len(rejected))
+        return len(rejected)
+
+    async def _replay(self) -> None:
+        replayed = rejected = 0
+        try:
+            # New spills go to a fresh file while the renamed one is replayed.
+            if not self.replay_path.exists():
+                self.spill_path.rename(self.replay_path)
+                await asyncio.to_thread(self.offset_path.unlink, missing_ok=True)
+            offset = await asyncio.to_thread(self._read_offset)
+            replay = await asyncio.to_thread(self.replay_path.open, "rb")
+            try:
+                await asyncio.to_thread(replay.seek, offset)
+                done = False
+                while not done:
+                    batch, done = await asyncio.to_thread(self._read_replay_batch, replay)
+                    if batch:
+                        try:
+                            await self._insert(batch)
+                        except Exception as exc:
+                            if not rejects_rows(exc):
+                                raise
+                            rejected += await self._insert_each(batch)
+                        replayed += len(batch)
+                    # A crash before this write replays the last batch once more.
+                    offset = replay.tell()
+                    await asyncio.to_thread(self.offset_path.write_text, str(offset))
+            finally:
+                replay.close()
+            self.replay_path.unlink()
+            self.offset_path.unlink(missing_ok=True)
+        except Exception:
+            logger.exception(
+                "Audit spill replay stopped after %s rows; will resume after the next flush", replayed
+            )
+        else:
+            logger.info("Replayed %s audit rows from %s (%s rejected)", replayed - rejected, self.spill_path, rejected)
+        metrics.counter("audit_rows_replayed_total").inc(replayed - rejected)
+
+    async def close(self) -> None:
+        self._closing = True
+        self._full.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                logger.exception("Audit writer loop failed")
+            self._task = None
+        while not self.queue.empty():
+            # Not started, or the loop died; flush what is left directly.
+            await self._flush(self._take_batch())
+
+
+audit_writer = AuditWriter()
@@ -0,0 +1,175 @@
+import asyncio
+import enum
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.services.metrics import metrics
+from app.services.update_scheduler import UpdatePriority
+
+logger = logging.getLogger(__name__)
+
+# How often the watcher re-evaluates the level while no updates arrive.
+DEGRADATION_TICK_SEC = 5.0
+
+
+class DegradationLevel(enum.IntEnum):
+    NORMAL = 0
+    SKIP_AI = 1
+    SKIP_PROFILES = 2
+    KEYWORD_ONLY = 3
+    DELETE_ONLY = 4
+
+
+LEVEL_DESCRIPTIONS = {
+    DegradationLevel.NORMAL: "full moderation",
+    DegradationLevel.SKIP_AI: "AI checks skipped",
+    DegradationLevel.SKIP_PROFILES: "AI checks and profile upserts skipped",
+    DegradationLevel.KEYWORD_ONLY: "keyword matching only",
+    DegradationLevel.DELETE_ONLY: "only unapproved users' messages are deleted",
+}
+
+
+def parse_steps(raw: str) -> list[float]:
+    steps = [float(item) for item in raw.split(",") if item.strip()]
+    if len(steps) != len(DegradationLevel) - 1:
+        raise ValueError(f"Expected {len(DegradationLevel) - 1} comma-separated thresholds")
+    return steps
+
+
+class DegradationController(BaseMiddleware):
+    """Steps moderation down while the update backlog is large and back up as it drains.
+
+    Pressure is the larger of the update age (now - message.date of new messages;
+    edits carry the original send time) and the number of queued low-priority updates,
+    each compared against per-level thresholds. A level is entered once pressure has
+    stayed above it for `escalate_after_sec`, at the lowest level seen in that window,
+    so one stale update does not move it. Levels go down one step at a time once
+    pressure has stayed below half of the current level's thresholds for
+    `recover_after_sec`; `tick` keeps that going while no updates arrive.
+    """
+
+    def __init__(
+        self,
+        lag_steps: list[float],
+        depth_steps: list[float],
+        recover_after_sec: float,
+        escalate_after_sec: float = 0.0,
+        enabled: bool = True,
+    ) -> None:
+        self.lag_steps = lag_steps
+        self.depth_steps = depth_steps
+        self.recover_after_sec = recover_after_sec
+        self.escalate_after_sec = escalate_after_sec
+        self.enabled = enabled
+        self.level = DegradationLevel.NORMAL
+        self.last_lag = 0.0
+        self.last_depth = 0
+        self._calm_since: float | None = None
+        self._hot_since: float | None = None
+        self._hot_target = DegradationLevel.NORMAL
+        self._last_sample = time.monotonic()
+        self._gauge = metrics.gauge("degradation_level")
+
+    def _target(self, lag: float, depth: int) -> DegradationLevel:
+        target = DegradationLevel.NORMAL
+        for index, (lag_step, depth_step) in enumerate(zip(self.lag_steps, self.depth_steps)):
+            if lag >= lag_step or depth >= depth_step:
+                target = DegradationLevel(index + 1)
+        return target
+
+    def _is_calm(self, lag: float, depth: int) -> bool:
+        index = self.level - 1
+        return lag < self.lag_steps[index] / 2 and depth < self.depth_steps[index] / 2
+
+    def _set_level(self, level: DegradationLevel, lag: float, depth: int) -> None:
+        if level == self.level:
+            return
+        log = logger.warning if level > self.level else logger.info
+        log(
+            "Degradation level %s -> %s (%s) lag=%.1fs depth=%s",
+            self.level.name,
+            level.name,
+            LEVEL_DESCRIPTIONS[level],
+            lag,
+            depth,
+        )
+        self.level = level
+        self._gauge.set(int(level))
+
+    def observe(self, lag: float | None, depth: int) -> DegradationLevel:
+        if not self.enabled:
+            return DegradationLevel.NORMAL
+        lag = max(0.0, lag) if lag is not None else 0.0
+        self.last_lag = lag
+        self.last_depth = depth
+        now = time.monotonic()
+        self._last_sample = now
+
+        target = self._target(lag, depth)
+        if target > self.level:
+            self._calm_since = None
+            if self._hot_since is None:
+                self._hot_since = now
+                self._hot_target = target
+            else:
+                self._hot_target = min(self._hot_target, target)
+            if now - self._hot_since >= self.escalate_after_sec:
+                self._hot_since = None
+                self._set_level(self._hot_target, lag, depth)
+            return self.level
+        self._hot_since = None
+        if self.level > DegradationLevel.NORMAL and self._is_calm(lag, depth):
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_after_sec:
+                self._calm_since = now
+                self._set_level(DegradationLevel(self.level - 1), lag, depth)
+        else:
+            self._calm_since = None
+        return self.level
+
+    def tick(self, depth: int) -> None:
+        # No recent updates means no update lag; only the queued backlog still counts.
+        if time.monotonic() - self._last_sample >= DEGRADATION_TICK_SEC:
+            self.observe(None, depth)
+
+    def describe(self) -> str:
+        return (
+            f"{self.level.name} ({LEVEL_DESCRIPTIONS[self.level]}), "
+            f"lag={self.last_lag:.0f}s, backlog={self.last_depth}"
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        lag = None
+        # Edits keep the original send time, so their age says nothing about the backlog;
+        # neither does the offline backlog the startup drain is fast-forwarding.
+        if (
+            isinstance(event, Update)
+            and event.message is not None
+            and event.message.date
+            and not data.get("startup_stale")
+        ):
+            lag = (datetime.now(tz=timezone.utc) - event.message.date).total_seconds()
+        scheduler = data.get("update_scheduler")
+        depth = scheduler.pending_for(UpdatePriority.LOW) if scheduler else 0
+        level = self.observe(lag, depth)
+        # The startup drain may already have asked for a lower level of moderation.
+        data["degradation_level"] = max(data.get("degradation_level", DegradationLevel.NORMAL), level)
+        return await handler(event, data)
+
+
+async def degradation_watcher(controller: DegradationController, scheduler) -> None:
+    # Levels only change when observed; this lets them recover on a quiet group.
+    while True:
+        await asyncio.sleep(DEGRADATION_TICK_SEC)
+        controller.tick(scheduler.pending_for(UpdatePriority.LOW))
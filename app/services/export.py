@@ -0,0 +1,207 @@
+import asyncio
+import csv
+import enum
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Callable
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ApprovedMember, ModerationEvent, ProhibitedWord
+from app.services.groups import GLOBAL_SCOPE
+from app.services.word_import import exported_word
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("txt", "json", "csv")
+# Rows fetched per round trip from the server-side cursor and written per batch.
+EXPORT_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    name: str
+    title: str
+    columns: tuple[str, ...]
+    # Columns written by the txt format, tab-separated.
+    text_columns: tuple[str, ...]
+    query: Callable[[int], Select]
+    # Builds the txt line from a row's values instead of text_columns.
+    text_line: Callable[[dict[str, Any]], str] | None = None
+
+
+def scoped(stmt: Select, column, scope: int) -> Select:
+    # The global scope exports every group.
+    if scope == GLOBAL_SCOPE:
+        return stmt
+    return stmt.where(column == scope)
+
+
+def words_query(scope: int) -> Select:
+    # Word lists are per scope: the global list is its own scope, not all groups.
+    return (
+        select(
+            ProhibitedWord.word,
+            func.coalesce(ProhibitedWord.original, ProhibitedWord.word).label("original"),
+            ProhibitedWord.match_type,
+            ProhibitedWord.created_at,
+        )
+        .where(ProhibitedWord.enabled.is_(True), ProhibitedWord.group_id == scope)
+        .order_by(ProhibitedWord.word)
+    )
+
+
+def word_line(values: dict[str, Any]) -> str:
+    # The importable spelling, so a word switched to STEM keeps its `*` mark.
+    return exported_word(values["original"], values["match_type"])
+
+
+def events_query(scope: int) -> Select:
+    stmt = select(
+        ModerationEvent.created_at,
+        ModerationEvent.group_id,
+        ModerationEvent.user_id,
+        ModerationEvent.message_id,
+        ModerationEvent.action,
+        ModerationEvent.reason_type,
+        ModerationEvent.matched_word,
+        ModerationEvent.ai_label,
+        ModerationEvent.ai_confidence,
+        ModerationEvent.ai_summary,
+    ).order_by(ModerationEvent.created_at, ModerationEvent.id)
+    return scoped(stmt, ModerationEvent.group_id, scope)
+
+
+def members_query(scope: int) -> Select:
+    stmt = select(ApprovedMember.group_id, ApprovedMember.user_id, ApprovedMember.approved_at).order_by(
+        ApprovedMember.group_id, ApprovedMember.approved_at
+    )
+    return scoped(stmt, ApprovedMember.group_id, scope)
+
+
+EXPORTS: dict[str, ExportSpec] = {
+    spec.name: spec
+    for spec in (
+        ExportSpec(
+            name="words",
+            title="Prohibited words",
+            columns=("word", "original", "match_type", "created_at"),
+            text_columns=("original",),
+            query=words_query,
+            text_line=word_line,
+        ),
+        ExportSpec(
+            name="events",
+            title="Moderation events",
+            columns=(
+                "created_at",
+                "group_id",
+                "user_id",
+                "message_id",
+                "action",
+                "reason_type",
+                "matched_word",
+                "ai_label",
+                "ai_confidence",
+                "ai_summary",
+            ),
+            text_columns=("created_at", "group_id", "user_id", "reason_type", "matched_word", "ai_label"),
+            query=events_query,
+        ),
+        ExportSpec(
+            name="members",
+            title="Approved members",
+            columns=("group_id", "user_id", "approved_at"),
+            text_columns=("group_id", "user_id", "approved_at"),
+            query=members_query,
+        ),
+    )
+}
+
+
+def plain_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class ExportWriter:
+    """Writes rows of one format into a binary stream, batch by batch."""
+
+    def __init__(self, stream: BinaryIO, spec: ExportSpec, fmt: str) -> None:
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.spec = spec
+        self.fmt = fmt
+        self.count = 0
+        if fmt == "csv":
+            self.csv = csv.writer(self.text)
+            self.csv.writerow(spec.columns)
+        elif fmt == "json":
+            self.text.write("[")
+
+    def write(self, rows: list[Any]) -> None:
+        for row in rows:
+            values = {column: plain_value(getattr(row, column)) for column in self.spec.columns}
+            if self.fmt == "csv":
+                self.csv.writerow([values[column] for column in self.spec.columns])
+            elif self.fmt == "json":
+                self.text.write(",\n" if self.count else "\n")
+                self.text.write(json.dumps(values, ensure_ascii=False))
+            else:
+                if self.spec.text_line is not None:
+                    line = self.spec.text_line(values)
+                else:
+                    line = "\t".join("" if values[c] is None else str(values[c]) for c in self.spec.text_columns)
+                self.text.write(line.replace("\n", " ") + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self.text.write("\n]\n")
+        # Detached rather than closed: the caller owns the stream, which may be stdout.
+        self.text.flush()
+        self.text.detach()
+
+
+async def write_export(session: AsyncSession, name: str, scope: int, fmt: str, stream: BinaryIO) -> int:
+    """Streams an export from a server-side cursor into `stream` and returns the row count.
+
+    Only one batch of rows is held in memory at a time; encoding (and compression, for
+    a gzip stream) runs in a thread. The stream is flushed but left open for the caller.
+    """
+    spec = EXPORTS[name]
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    writer = ExportWriter(stream, spec, fmt)
+    result = await session.stream(spec.query(scope).execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for rows in result.partitions(EXPORT_BATCH_SIZE):
+        await asyncio.to_thread(writer.write, rows)
+    await asyncio.to_thread(writer.close)
+    logger.info("Exported %s rows of %s scope=%s format=%s", writer.count, name, scope, fmt)
+    return writer.count
+
+
+async def export_to_file(session: AsyncSession, name: str, scope: int, fmt: str) -> tuple[str, int]:
+    """Writes a gzip-compressed export into a temp file; the caller removes the file."""
+    handle, path = tempfile.mkstemp(prefix=f"export-{name}-", suffix=f".{fmt}.gz")
+    try:
+        with os.fdopen(handle, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as stream:
+            count = await write_export(session, name, scope, fmt, stream)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, count
+
+
+def export_filename(name: str, scope: int, fmt: str, now: datetime) -> str:
+    label = "global" if scope == GLOBAL_SCOPE else str(scope)
+    return f"{name}-{label}-{now:%Y%m%d-%H%M}.{fmt}.gz"
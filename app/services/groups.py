@@ -0,0 +1,198 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from aiogram.filters import BaseFilter
+from aiogram.types import CallbackQuery, ChatMemberUpdated, Message
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_admin_ids, get_primary_admin_id, parse_id_list, settings
+from app.db.models import Group, ProhibitedWord
+from app.services.prohibited import ProhibitedCache, ProhibitedEntry, normalize_text, tokenize
+from app.services.runtime_settings import SUPPORTED_KEYS, coerce_value, load_group_overrides
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = 0
+
+
+@dataclass
+class GroupConfig:
+    chat_id: int
+    title: str | None
+    words: ProhibitedCache
+    global_words: ProhibitedCache
+    overrides: dict[str, Any] = field(default_factory=dict)
+    group_admin_ids: list[int] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.title or str(self.chat_id)
+
+    def setting(self, key: str) -> Any:
+        # Global values are read at call time so admin changes to them apply everywhere.
+        return self.overrides.get(key, getattr(settings, key))
+
+    def apply_overrides(self, values: dict[str, str]) -> None:
+        for key, raw in values.items():
+            if key not in SUPPORTED_KEYS:
+                continue
+            try:
+                self.overrides[key] = coerce_value(key, raw)
+            except Exception:
+                logger.exception("Failed to apply setting %s for group %s", key, self.chat_id)
+        self.group_admin_ids = parse_id_list(self.overrides.get("ADMIN_IDS"))
+
+    def current_settings(self) -> dict[str, str]:
+        return {key: str(self.setting(key)) for key in SUPPORTED_KEYS}
+
+    @property
+    def admin_ids(self) -> set[int]:
+        # Global admins manage every group; ADMIN_IDS set for a group adds its own admins.
+        return get_admin_ids() | set(self.group_admin_ids)
+
+    @property
+    def primary_admin_id(self) -> int | None:
+        return self.group_admin_ids[0] if self.group_admin_ids else get_primary_admin_id()
+
+    def match(self, text: str) -> ProhibitedEntry | None:
+        if not text:
+            return None
+        cleaned = normalize_text(text)
+        tokens = set(tokenize(cleaned))
+        return self.words.find(cleaned, tokens) or self.global_words.find(cleaned, tokens)
+
+
+class GroupRegistry:
+    """In-memory config of every enabled group, keyed by chat id.
+
+    Word lists, runtime setting overrides and admins are loaded per group, so an
+    update only needs a dict lookup to find the config of the chat it came from.
+    The global word list (group_id 0) is shared by every group.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        self.sessionmaker = sessionmaker
+        self.global_words = ProhibitedCache(sessionmaker, GLOBAL_SCOPE)
+        self.groups: dict[int, GroupConfig] = {}
+
+    def get(self, chat_id: int) -> GroupConfig | None:
+        return self.groups.get(chat_id)
+
+    def __iter__(self):
+        return iter(self.groups.values())
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def admin_groups(self, user_id: int) -> list[GroupConfig]:
+        return [group for group in self.groups.values() if user_id in group.admin_ids]
+
+    def is_admin(self, user_id: int) -> bool:
+        return user_id in get_admin_ids() or any(
+            user_id in group.group_admin_ids for group in self.groups.values()
+        )
+
+    def max_setting(self, key: str) -> Any:
+        values = [group.setting(key) for group in self.groups.values()]
+        return max(values) if values else getattr(settings, key)
+
+    def words_for(self, scope: int) -> ProhibitedCache | None:
+        if scope == GLOBAL_SCOPE:
+            return self.global_words
+        group = self.groups.get(scope)
+        return group.words if group else None
+
+    async def refresh(self) -> None:
+        async with self.sessionmaker() as session:
+            result = await session.execute(select(Group).where(Group.enabled.is_(True)))
+            rows = result.scalars().all()
+            overrides = await load_group_overrides(session)
+            result = await session.execute(
+                select(ProhibitedWord).where(ProhibitedWord.enabled.is_(True))
+            )
+            words_by_group: dict[int, list[ProhibitedWord]] = {}
+            for word in result.scalars().all():
+                words_by_group.setdefault(word.group_id, []).append(word)
+            result = await session.execute(
+                select(ProhibitedWord.group_id, func.count()).group_by(ProhibitedWord.group_id)
+            )
+            stored = dict(result.all())
+
+        self.global_words.load(words_by_group.get(GLOBAL_SCOPE, []))
+        self.global_words.stored = stored.get(GLOBAL_SCOPE, 0)
+        groups: dict[int, GroupConfig] = {}
+        for row in rows:
+            words = ProhibitedCache(self.sessionmaker, row.chat_id)
+            words.load(words_by_group.get(row.chat_id, []))
+            words.stored = stored.get(row.chat_id, 0)
+            group = GroupConfig(
+                chat_id=row.chat_id, title=row.title, words=words, global_words=self.global_words
+            )
+            group.apply_overrides(overrides.get(row.chat_id, {}))
+            groups[row.chat_id] = group
+        self.groups = groups
+        logger.info(
+            "Group registry refreshed. groups=%s global_words=%s", len(groups), len(self.global_words)
+        )
+
+    async def refresh_words(self, scope: int) -> None:
+        cache = self.words_for(scope)
+        if cache is not None:
+            await cache.refresh()
+
+    def apply_overrides(self, scope: int, values: dict[str, str]) -> None:
+        group = self.groups.get(scope)
+        if group is not None:
+            group.apply_overrides(values)
+
+
+async def add_group(
+    sessionmaker: async_sessionmaker[AsyncSession], chat_id: int, title: str | None, created_by: int
+) -> None:
+    stmt = (
+        pg_insert(Group)
+        .values(
+            chat_id=chat_id,
+            title=title,
+            enabled=True,
+            created_at=datetime.now(tz=timezone.utc),
+            created_by=created_by,
+        )
+        .on_conflict_do_update(index_elements=["chat_id"], set_={"enabled": True, "title": title})
+    )
+    async with sessionmaker() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def seed_default_group(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    if settings.GROUP_ID is None:
+        return
+    async with sessionmaker() as session:
+        result = await session.execute(select(Group.chat_id).limit(1))
+        if result.scalar_one_or_none() is not None:
+            return
+    await add_group(sessionmaker, settings.GROUP_ID, None, settings.ADMIN_ID or 0)
+    logger.info("Seeded groups table with GROUP_ID=%s", settings.GROUP_ID)
+
+
+class ManagedGroup(BaseFilter):
+    """Passes events from enabled groups and injects their config as `group`."""
+
+    async def __call__(
+        self, event: Message | ChatMemberUpdated | CallbackQuery, group_registry: GroupRegistry
+    ) -> bool | dict[str, Any]:
+        if isinstance(event, CallbackQuery):
+            if event.message is None:
+                return False
+            chat = event.message.chat
+        else:
+            chat = event.chat
+        group = group_registry.get(chat.id)
+        if group is None:
+            return False
+        return {"group": group}
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def wait_or_stop(stop: asyncio.Event, timeout: float) -> None:
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(stop.wait(), timeout)
+
+
+class LeaderElector:
+    """Runs singleton duties in one replica at a time, coordinated by a Postgres advisory lock.
+
+    The lock is session-level and held on a dedicated connection, so Postgres releases
+    it as soon as the leader's connection ends. Standbys retry every `heartbeat_sec`
+    and take over within that interval after a leader exits or crashes. The leader
+    pings its connection at the same interval and stops its duties when the ping
+    fails, because by then another replica may already hold the lock.
+    """
+
+    def __init__(self, engine: AsyncEngine, lock_key: int, heartbeat_sec: float) -> None:
+        self.engine = engine
+        self.lock_key = lock_key
+        self.heartbeat_sec = heartbeat_sec
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self.terms = 0
+        self._conn: AsyncConnection | None = None
+        self._gauge = metrics.gauge("leader")
+
+    def describe(self) -> str:
+        role = "leader" if self.is_leader else "standby"
+        return f"{role} ({self.identity}), terms={self.terms}"
+
+    async def _try_acquire(self) -> bool:
+        conn = await self.engine.connect()
+        try:
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            # The lock outlives the transaction; do not leave the session idle in one.
+            await conn.commit()
+        except Exception:
+            await conn.invalidate()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def _heartbeat(self) -> None:
+        await asyncio.wait_for(self._conn.execute(text("SELECT 1")), timeout=self.heartbeat_sec)
+        await self._conn.commit()
+
+    async def _release(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+            await conn.commit()
+            await conn.close()
+        except Exception:
+            # Dropping the server session releases the lock as well.
+            logger.warning("Failed to unlock leader lock cleanly; discarding connection")
+            with contextlib.suppress(Exception):
+                await conn.invalidate()
+
+    def _set_leader(self, value: bool) -> None:
+        self.is_leader = value
+        self._gauge.set(int(value))
+
+    async def _lead(self, duties: Callable[[], Awaitable[None]], stop: asyncio.Event) -> None:
+        self.terms += 1
+        self._set_leader(True)
+        logger.info("Leadership acquired by %s (lock=%s)", self.identity, self.lock_key)
+        task = asyncio.create_task(duties())
+        stopped = asyncio.create_task(stop.wait())
+        try:
+            while True:
+                await asyncio.wait(
+                    {task, stopped}, timeout=self.heartbeat_sec, return_when=asyncio.FIRST_COMPLETED
+                )
+                if stopped.done() or task.done():
+                    break
+                await self._heartbeat()
+        finally:
+            self._set_leader(False)
+            stopped.cancel()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Leader duties failed")
+            await self._release()
+            logger.info("Leadership released by %s", self.identity)
+
+    async def run(self, duties: Callable[[], Awaitable[None]], stop: asyncio.Event) -> None:
+        logger.info("Leader election started identity=%s lock=%s", self.identity, self.lock_key)
+        standby_logged = False
+        while not stop.is_set():
+            try:
+                if await self._try_acquire():
+                    standby_logged = False
+                    await self._lead(duties, stop)
+                elif not standby_logged:
+                    logger.info("Standing by: leader lock %s is held by another replica", self.lock_key)
+                    standby_logged = True
+            except Exception:
+                logger.exception("Leader election error")
+                await self._release()
+            await wait_or_stop(stop, self.heartbeat_sec)
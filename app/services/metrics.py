@@ -0,0 +1,148 @@
+import asyncio
+import bisect
+import logging
+import threading
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+@dataclass
+class Counter:
+    name: str
+    labels: LabelKey
+    value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+@dataclass
+class Gauge:
+    name: str
+    labels: LabelKey
+    value: float = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+@dataclass
+class Histogram:
+    name: str
+    labels: LabelKey
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound below which `q` of the observations fall."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[tuple[str, LabelKey], Counter | Gauge | Histogram] = {}
+
+    def _get(self, kind: type, name: str, labels: dict[str, object], **kwargs):
+        key = (name, _label_key(labels))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = kind(name=name, labels=key[1], **kwargs)
+                    self._metrics[key] = metric
+        return metric
+
+    def counter(self, name: str, **labels: object) -> Counter:
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels: object) -> Gauge:
+        return self._get(Gauge, name, labels)
+
+    def histogram(
+        self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **labels: object
+    ) -> Histogram:
+        return self._get(Histogram, name, labels, buckets=buckets)
+
+    def render_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (float("inf"),), metric.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {metric.total}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Compact one-line summary suitable for periodic log output."""
+        parts: list[str] = []
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            label = _format_labels(labels)
+            if isinstance(metric, Histogram):
+                if metric.count:
+                    parts.append(
+                        f"{name}{label} n={metric.count} p50={metric.quantile(0.5)} p95={metric.quantile(0.95)}"
+                    )
+            else:
+                parts.append(f"{name}{label}={metric.value:g}")
+        return " ".join(parts)
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in labels)
+    return "{" + inner + "}"
+
+
+metrics = MetricsRegistry()
+
+
+async def metrics_reporter(interval_sec: int) -> None:
+    while True:
+        await asyncio.sleep(interval_sec)
+        summary = metrics.summary()
+        if summary:
+            logger.info("Metrics %s", summary)
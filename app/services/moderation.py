@@ -1,19 +1,81 @@
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from html import escape
 from zoneinfo import ZoneInfo
 
 from aiogram import Bot
 from aiogram.types import ChatPermissions, Message
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings, get_primary_admin_id
-from app.db.models import ModerationAction, ModerationEvent, ModerationReason
+from app.config import settings
+from app.db.models import ModerationAction, ModerationClaim, ModerationEvent, ModerationReason
 from app.services.ai_moderation import AiDecision
+from app.services.audit_writer import audit_writer
+from app.services.groups import GroupConfig
+from app.services.metrics import metrics
 from app.services.user_profiles import format_user_admin_card, get_profile, upsert_profile
 
 logger = logging.getLogger(__name__)
 
+RECENT_MODERATED_SIZE = 10_000
+
+
+class RecentMessages:
+    """Bounded, insertion-ordered set of recently moderated (chat_id, message_id) pairs.
+
+    Only a shortcut for repeats seen by this process; the unique claim in
+    moderation_claims is what makes moderation idempotent across restarts and replicas.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = maxlen
+        self._keys: OrderedDict[tuple[int, int], None] = OrderedDict()
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: tuple[int, int]) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxlen:
+            self._keys.popitem(last=False)
+
+
+recent_moderated = RecentMessages(RECENT_MODERATED_SIZE)
+
+
+def already_moderated(message: Message) -> bool:
+    if (message.chat.id, message.message_id) in recent_moderated:
+        metrics.counter("moderation_duplicates_total", source="memory").inc()
+        return True
+    return False
+
+
+async def claim_moderation(session: AsyncSession, group_id: int, message_id: int, now: datetime) -> bool:
+    """Claim a message for moderation; False if it was already moderated.
+
+    Runs before any side effect. A concurrent claim for the same message waits for the
+    first one to commit and then inserts nothing. The claim lives in its own table
+    because the partitioned events table cannot enforce the unique key.
+    """
+    stmt = (
+        pg_insert(ModerationClaim)
+        .values(group_id=group_id, message_id=message_id, created_at=now)
+        .on_conflict_do_nothing(index_elements=["group_id", "message_id"])
+        .returning(ModerationClaim.message_id)
+    )
+    claimed = (await session.execute(stmt)).scalar_one_or_none()
+    recent_moderated.add((group_id, message_id))
+    if claimed is None:
+        metrics.counter("moderation_duplicates_total", source="db").inc()
+        return False
+    return True
+
 
 def format_until(dt_utc: datetime) -> str:
     tz = ZoneInfo(settings.TIMEZONE)
@@ -64,29 +126,56 @@ async def punish_user_for_message(
     bot: Bot,
     session: AsyncSession,
     message: Message,
+    group: GroupConfig,
     reason: ModerationReason,
     matched_word: str | None = None,
     ai_decision: AiDecision | None = None,
 ) -> None:
     now = datetime.now(tz=timezone.utc)
-    until = now + timedelta(minutes=settings.MUTE_MINUTES)
+    until = now + timedelta(minutes=group.setting("MUTE_MINUTES"))
     until_str = format_until(until)
 
-    admin_id = get_primary_admin_id()
+    admin_id = group.primary_admin_id
     if admin_id is None:
         logger.exception("No admin id configured")
         return
 
-    # Ensure profile exists and load phone data
+    if already_moderated(message):
+        logger.info("Skip moderation: message already moderated message_id=%s", message.message_id)
+        return
+
+    if not await claim_moderation(session, group.chat_id, message.message_id, now):
+        await session.rollback()
+        logger.info("Skip moderation: duplicate message_id=%s", message.message_id)
+        return
+
+    # Ensure profile exists and load phone data; commits the claim as well
     await upsert_profile(session, message.from_user)
     profile = await get_profile(session, message.from_user.id)
     await session.commit()
 
+    # The event itself is only history; it is written in the background.
+    audit_writer.submit(
+        ModerationEvent,
+        {
+            "group_id": group.chat_id,
+            "user_id": message.from_user.id,
+            "message_id": message.message_id,
+            "action": ModerationAction.MUTED,
+            "reason_type": reason,
+            "matched_word": matched_word,
+            "ai_label": ai_decision.label if ai_decision else None,
+            "ai_confidence": ai_decision.confidence if ai_decision else None,
+            "ai_summary": ai_decision.reason if ai_decision else None,
+            "created_at": now,
+        },
+    )
+
     # Forward original before deleting
     try:
         await bot.forward_message(
             chat_id=admin_id,
-            from_chat_id=settings.GROUP_ID,
+            from_chat_id=group.chat_id,
             message_id=message.message_id,
         )
     except Exception:
@@ -101,7 +190,7 @@ async def punish_user_for_message(
     # Restrict user
     try:
         await bot.restrict_chat_member(
-            chat_id=settings.GROUP_ID,
+            chat_id=group.chat_id,
             user_id=message.from_user.id,
             permissions=ChatPermissions(
                 can_send_messages=False,
@@ -121,7 +210,7 @@ async def punish_user_for_message(
     # Group notification
     try:
         await bot.send_message(
-            chat_id=settings.GROUP_ID,
+            chat_id=group.chat_id,
             text=(
                 f"{html_mention(message.from_user.id, message.from_user.full_name)} "
                 f"guruhda taqiqlangan mavzudagi gaplari uchun {until_str} gacha "
@@ -142,7 +231,7 @@ async def punish_user_for_message(
                     profile=profile,
                     matched_word=matched_word or "",
                     until_dt=until,
-                    group_id=settings.GROUP_ID,
+                    group_id=group.chat_id,
                     until_str=until_str,
                 ),
                 parse_mode="HTML",
@@ -169,19 +258,3 @@ async def punish_user_for_message(
             )
     except Exception:
         logger.exception("Failed to send admin detail message")
-
-    # Persist moderation event
-    event = ModerationEvent(
-        group_id=settings.GROUP_ID,
-        user_id=message.from_user.id,
-        message_id=message.message_id,
-        action=ModerationAction.MUTED,
-        reason_type=reason,
-        matched_word=matched_word,
-        ai_label=ai_decision.label if ai_decision else None,
-        ai_confidence=ai_decision.confidence if ai_decision else None,
-        ai_summary=ai_decision.reason if ai_decision else None,
-        created_at=now,
-    )
-    session.add(event)
-    await session.commit()
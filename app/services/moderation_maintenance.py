@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db.models import ModerationClaim, ModerationDailyStat, ModerationReason
+from app.services.groups import GLOBAL_SCOPE
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "moderation_events"
+DEFAULT_PARTITION = "moderation_events_default"
+PARTITION_NAME = re.compile(r"^moderation_events_p(\d{4})(\d{2})$")
+# Telegram drops undelivered updates after 24 hours, so claims only need to outlive that.
+CLAIM_RETENTION = timedelta(days=7)
+
+PARTITIONS_SQL = """
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = :parent
+"""
+
+# Recounts whole days from :since, so rerunning it is safe.
+ROLLUP_SQL = """
+INSERT INTO moderation_daily_stats (day, group_id, reason_type, label, word, count)
+SELECT (created_at AT TIME ZONE :tz)::date, group_id, reason_type,
+       COALESCE(ai_label, ''), COALESCE(matched_word, ''), count(*)
+FROM moderation_events
+WHERE created_at >= :since
+GROUP BY 1, 2, 3, 4, 5
+ON CONFLICT (day, group_id, reason_type, label, word) DO UPDATE SET count = EXCLUDED.count
+"""
+
+
+def add_months(month: date, months: int) -> date:
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def create_partition_sql(month: date) -> str:
+    # Bounds are UTC; a bare date would be read in the session time zone.
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def local_today() -> date:
+    return datetime.now(tz=ZoneInfo(settings.TIMEZONE)).date()
+
+
+async def list_partitions(session: AsyncSession) -> set[str]:
+    result = await session.execute(text(PARTITIONS_SQL), {"parent": PARENT_TABLE})
+    return set(result.scalars().all())
+
+
+async def ensure_partitions(session: AsyncSession, now: datetime) -> list[str]:
+    existing = await list_partitions(session)
+    current = now.date().replace(day=1)
+    created = []
+    for offset in range(settings.MODERATION_PARTITIONS_AHEAD + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            await session.execute(text(create_partition_sql(month)))
+            await session.commit()
+            created.append(name)
+        except Exception:
+            # Fails if the default partition already holds rows for that month.
+            await session.rollback()
+            logger.exception("Failed to create partition %s", name)
+    return created
+
+
+async def drop_expired_partitions(session: AsyncSession, now: datetime) -> list[str]:
+    if settings.MODERATION_RETENTION_DAYS <= 0:
+        return []
+    cutoff = (now - timedelta(days=settings.MODERATION_RETENTION_DAYS)).date()
+    dropped = []
+    for name in sorted(await list_partitions(session)):
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if add_months(month, 1) <= cutoff:
+            await session.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    await session.commit()
+    return dropped
+
+
+async def rollup_daily_stats(session: AsyncSession) -> None:
+    tz = ZoneInfo(settings.TIMEZONE)
+    last_day = await session.scalar(select(func.max(ModerationDailyStat.day)))
+    if last_day is None:
+        since = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    else:
+        # The last rolled-up day was partial, and the day before it may have late commits.
+        since = datetime.combine(last_day - timedelta(days=1), dt_time.min, tzinfo=tz)
+    await session.execute(text(ROLLUP_SQL), {"tz": settings.TIMEZONE, "since": since})
+    await session.commit()
+
+
+async def purge_claims(session: AsyncSession, now: datetime) -> int:
+    result = await session.execute(delete(ModerationClaim).where(ModerationClaim.created_at < now - CLAIM_RETENTION))
+    await session.commit()
+    return result.rowcount or 0
+
+
+async def run_maintenance(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    started = time.monotonic()
+    now = datetime.now(tz=timezone.utc)
+    async with sessionmaker() as session:
+        # Roll up before dropping, so expiring partitions are counted first.
+        await rollup_daily_stats(session)
+        created = await ensure_partitions(session, now)
+        dropped = await drop_expired_partitions(session, now)
+        purged = await purge_claims(session, now)
+        in_default = await session.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION})"))
+    if in_default:
+        logger.warning("Moderation events landed in %s; monthly partitions are missing", DEFAULT_PARTITION)
+    metrics.counter("moderation_partitions_dropped_total").inc(len(dropped))
+    logger.info(
+        "Moderation maintenance done created=%s dropped=%s purged_claims=%s elapsed=%.2fs",
+        created,
+        dropped,
+        purged,
+        time.monotonic() - started,
+    )
+
+
+async def moderation_maintenance(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    while True:
+        try:
+            await run_maintenance(sessionmaker)
+        except Exception:
+            logger.exception("Moderation maintenance loop error")
+
+        await asyncio.sleep(settings.MODERATION_MAINTENANCE_INTERVAL_SEC)
+
+
+@dataclass
+class ModerationStats:
+    by_reason: dict[ModerationReason, int]
+    top_words: list[tuple[str, int]]
+    top_labels: list[tuple[str, int]]
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_reason.values())
+
+
+def scoped(stmt, scope: int):
+    # The global scope reports on all groups.
+    if scope == GLOBAL_SCOPE:
+        return stmt
+    return stmt.where(ModerationDailyStat.group_id == scope)
+
+
+async def count_by_reason(session: AsyncSession, scope: int, since: date) -> dict[ModerationReason, int]:
+    result = await session.execute(
+        scoped(
+            select(ModerationDailyStat.reason_type, func.sum(ModerationDailyStat.count))
+            .where(ModerationDailyStat.day >= since)
+            .group_by(ModerationDailyStat.reason_type),
+            scope,
+        )
+    )
+    return {reason: int(total) for reason, total in result.all()}
+
+
+async def top_values(
+    session: AsyncSession, scope: int, since: date, reason: ModerationReason, limit: int
+) -> list[tuple[str, int]]:
+    column = ModerationDailyStat.word if reason == ModerationReason.KEYWORD else ModerationDailyStat.label
+    total = func.sum(ModerationDailyStat.count)
+    result = await session.execute(
+        scoped(
+            select(column, total)
+            .where(ModerationDailyStat.day >= since, ModerationDailyStat.reason_type == reason, column != "")
+            .group_by(column)
+            .order_by(total.desc())
+            .limit(limit),
+            scope,
+        )
+    )
+    return [(value, int(count)) for value, count in result.all()]
+
+
+async def get_moderation_stats(session: AsyncSession, scope: int, days: int, top: int = 5) -> ModerationStats:
+    since = local_today() - timedelta(days=days - 1)
+    return ModerationStats(
+        by_reason=await count_by_reason(session, scope, since),
+        top_words=await top_values(session, scope, since, ModerationReason.KEYWORD, top),
+        top_labels=await top_values(session, scope, since, ModerationReason.AI, top),
+    )
@@ -1,23 +1,82 @@
 import json
 import logging
 import re
+import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
 from app.db.models import MatchType, ProhibitedWord
+from app.services.word_stats import word_hits
 
 logger = logging.getLogger(__name__)
 
-TOKEN_RE = re.compile(r"[a-zA-Z0-9]+", re.UNICODE)
+# Letters and digits of any script; Cyrillic is transliterated before tokenizing.
+TOKEN_RE = re.compile(r"[^\W_]+")
+# Same tokens for ASCII text, which most messages are, but cheaper to run.
+ASCII_TOKEN_RE = re.compile(r"[a-zA-Z0-9]+")
 APOSTROPHES = ["'", "’", "‘", "ʻ", "ʼ", "`", "´", "ˈ"]
 PLUS_PATTERN = re.compile(r"(\\d+)\\+")
+# Uzbek Cyrillic (and the Russian letters it shares) to Uzbek Latin, without the
+# apostrophes of oʻ/gʻ, which normalization drops anyway. Words and messages in either
+# script normalize to the same tokens.
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "s",
+    "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "", "ы": "i", "ь": "", "э": "e", "ю": "yu",
+    "я": "ya", "ў": "o", "қ": "q", "ғ": "g", "ҳ": "h",
+}
+FOLD_CACHE_SIZE = 65536
+SEARCH_LIMIT = 50
+SIMILAR_LIMIT = 5
+# Endings a STEM word may be followed by, in normalized form (apostrophes dropped):
+# plural, possessive, case, predicate and common derivational suffixes. They may be
+# chained, as in kazino+lar+da.
+UZBEK_SUFFIXES = (
+    "lar", "ler", "im", "ing", "imiz", "ingiz", "i", "si", "m", "ng", "miz", "ngiz",
+    "ning", "ni", "ga", "ka", "qa", "da", "ta", "dan", "tan", "dagi", "gacha", "dek", "day",
+    "man", "san", "siz", "dir", "mi", "chi", "ku", "yu", "u", "lik", "li", "cha", "roq",
+)
+SUFFIX_SET = frozenset(UZBEK_SUFFIXES)
+SUFFIX_LENGTHS = sorted({len(suffix) for suffix in UZBEK_SUFFIXES})
+# Longest suffix chain and token checked against STEM words; real inflections
+# (kazino+chi+lar+imiz+dagi) stay well below both.
+MAX_SUFFIX_CHAIN = 24
+MAX_STEM_TOKEN = 64
+# Marks a STEM word in admin input and word files, e.g. `kazino*`.
+STEM_MARK = "*"
+
+
+def is_suffix_chain(token: str, start: int) -> bool:
+    """Whether `token[start:]` is a chain of UZBEK_SUFFIXES (empty included).
+
+    Tracks which positions a chain can reach, so the check is linear in the rest of the
+    token; the suffixes overlap (im, i+m, imiz), and a backtracking regex over them is
+    exponential on input like `imimim...q`.
+    """
+    end = len(token)
+    if end - start > MAX_SUFFIX_CHAIN:
+        return False
+    reachable = [False] * (end - start + 1)
+    reachable[0] = True
+    for offset in range(end - start):
+        if not reachable[offset]:
+            continue
+        position = start + offset
+        for length in SUFFIX_LENGTHS:
+            if position + length > end:
+                break
+            if token[position : position + length] in SUFFIX_SET:
+                reachable[offset + length] = True
+    return reachable[-1]
 
 
 @dataclass
@@ -25,47 +84,126 @@ class ProhibitedEntry:
     word: str
     original: str
     match_type: MatchType
+    # Row id for hit counting; None for lists that are not stored, e.g. in the evaluator.
+    id: int | None = None
+
+
+def record_hit(entry: ProhibitedEntry) -> None:
+    # Called by the guards once the sender is known to be moderated, so admin and
+    # exempt messages do not count towards the word stats.
+    if entry.id is not None:
+        word_hits.hit(entry.id)
+
+
+class StemTrie:
+    """Prefix trie of STEM words, built at refresh time.
+
+    `find` walks a token once, so a lookup is O(token length) whatever the number of
+    stems; at every stem that ends inside the token, the rest must be a chain of
+    UZBEK_SUFFIXES. Tokens longer than MAX_STEM_TOKEN are not checked.
+    """
+
+    END = ""
+
+    def __init__(self) -> None:
+        self.root: dict = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, stem: str, entry: ProhibitedEntry) -> None:
+        node = self.root
+        for char in stem:
+            node = node.setdefault(char, {})
+        if self.END not in node:
+            self.size += 1
+        node[self.END] = entry
+
+    def find(self, token: str) -> ProhibitedEntry | None:
+        if len(token) > MAX_STEM_TOKEN:
+            return None
+        node = self.root
+        for index, char in enumerate(token):
+            node = node.get(char)
+            if node is None:
+                return None
+            entry = node.get(self.END)
+            if entry is not None and is_suffix_chain(token, index + 1):
+                return entry
+        return None
 
 
 class ProhibitedCache:
-    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], group_id: int = 0) -> None:
         self.sessionmaker = sessionmaker
+        self.group_id = group_id
         self.tokens: dict[str, ProhibitedEntry] = {}
         self.phrases: list[ProhibitedEntry] = []
+        self.stems = StemTrie()
+        # All rows of the scope, disabled ones included; the admin list shows them all.
+        self.stored: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.tokens) + len(self.phrases) + len(self.stems)
 
     async def refresh(self) -> None:
         async with self.sessionmaker() as session:
             result = await session.execute(
-                select(ProhibitedWord).where(ProhibitedWord.enabled.is_(True))
+                select(ProhibitedWord).where(
+                    ProhibitedWord.enabled.is_(True), ProhibitedWord.group_id == self.group_id
+                )
             )
             rows = result.scalars().all()
+            self.stored = await session.scalar(
+                select(func.count()).select_from(ProhibitedWord).where(ProhibitedWord.group_id == self.group_id)
+            )
+        self.load(rows)
+        logger.info(
+            "Prohibited cache refreshed. group=%s tokens=%s phrases=%s stems=%s",
+            self.group_id,
+            len(self.tokens),
+            len(self.phrases),
+            len(self.stems),
+        )
 
+    def load(self, rows: Iterable[ProhibitedWord]) -> None:
         tokens: dict[str, ProhibitedEntry] = {}
         phrases: list[ProhibitedEntry] = []
+        stems = StemTrie()
         for row in rows:
             display = row.original or row.word
-            entry = ProhibitedEntry(word=row.word, original=display, match_type=row.match_type)
+            entry = ProhibitedEntry(word=row.word, original=display, match_type=row.match_type, id=row.id)
             if row.match_type == MatchType.PHRASE:
                 entry.word = normalize_text(row.word)
                 phrases.append(entry)
+            elif row.match_type == MatchType.STEM:
+                stems.add(normalize_word(row.word), entry)
             else:
                 tokens[normalize_word(row.word)] = entry
 
         self.tokens = tokens
         self.phrases = phrases
-        logger.info("Prohibited cache refreshed. tokens=%s phrases=%s", len(tokens), len(phrases))
+        self.stems = stems
 
     def match(self, text: str) -> ProhibitedEntry | None:
         if not text:
             return None
         cleaned = normalize_text(text)
-        tokens = set(tokenize(cleaned))
+        return self.find(cleaned, set(tokenize(cleaned)))
 
+    def find(self, cleaned: str, tokens: set[str]) -> ProhibitedEntry | None:
         for token in tokens:
             entry = self.tokens.get(token)
             if entry:
                 return entry
 
+        if self.stems.size:
+            for token in tokens:
+                entry = self.stems.find(token)
+                if entry:
+                    return entry
+
         for entry in self.phrases:
             if entry.word and entry.word in cleaned:
                 return entry
@@ -73,16 +211,148 @@ class ProhibitedCache:
         return None
 
 
+FOLD_TABLE = str.maketrans(
+    {
+        **CYRILLIC_TO_LATIN,
+        **{cyrillic.upper(): latin.capitalize() for cyrillic, latin in CYRILLIC_TO_LATIN.items()},
+    }
+)
+
+
+# Look-alikes that are never meant as themselves in these chats: accented Latin and
+# Greek letters, by shape.
+VISUAL_TABLE = str.maketrans(
+    {
+        **{ch: "a" for ch in "àáâãäåāα"},
+        **{ch: "e" for ch in "èéêëēε"},
+        **{ch: "i" for ch in "ìíîïīι"},
+        **{ch: "o" for ch in "òóôõöøōο"},
+        **{ch: "u" for ch in "ùúûüūυ"},
+        "ç": "c", "ñ": "n", "β": "b", "κ": "k", "ν": "v", "ρ": "p", "τ": "t", "χ": "x",
+    }
+)
+# Cyrillic letters that look like Latin ones. Applied instead of transliteration to
+# tokens that mix both scripts, where they stand in for the Latin letter (kаzinо).
+HOMOGLYPH_TABLE = str.maketrans(
+    {
+        "а": "a", "в": "b", "е": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+        "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ј": "j", "ѕ": "s",
+    }
+)
+# Digits and symbols written for letters inside a word (k4z1n0, $ex).
+LEET_TABLE = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g", "@": "a", "$": "s"})
+# A word with leet: letters, then at least one leet character, or `$` before a letter.
+# Tokens that start with a digit are numbers (5ta, 100ming) and are left alone.
+LEET_RE = re.compile(r"[^\W\d_]+[0-9@$][\w@$]*|\$[^\W\d_][\w@$]*")
+# Three or more of the same letter; doubled letters are common in real words (jalla,
+# dabba, pullar) and are kept.
+REPEAT_RE = re.compile(r"([^\W\d_])\1{2,}")
+SYMBOLS_RE = re.compile(r"[@$]+")
+# Tokens with the leet symbols kept, so they can be folded as part of the word.
+RAW_TOKEN_RE = re.compile(r"(?:[^\W_]|[@$])+")
+ASCII_RAW_TOKEN_RE = re.compile(r"[a-zA-Z0-9@$]+")
+# At least this many one-letter tokens in a row are joined back into a word (k a z i n o).
+SPACED_RUN_MIN = 3
+
+
+@lru_cache(maxsize=FOLD_CACHE_SIZE)
+def transliterate(token: str) -> str:
+    return token.translate(FOLD_TABLE)
+
+
+def deobfuscate_token(token: str) -> tuple[str, ...]:
+    if LEET_RE.fullmatch(token):
+        token = token.translate(LEET_TABLE)
+    parts = []
+    for part in SYMBOLS_RE.split(token):
+        if not part.isascii():
+            part = unicodedata.normalize("NFKC", part).translate(VISUAL_TABLE)
+            if not part.isascii() and any(ch.isascii() for ch in part):
+                part = part.translate(HOMOGLYPH_TABLE)
+            part = part.translate(FOLD_TABLE)
+        part = REPEAT_RE.sub(r"\1", part)
+        if part:
+            parts.append(part)
+    return tuple(parts)
+
+
+# Folded tokens by raw token; chat vocabulary repeats, so most lookups hit.
+_deobfuscated: dict[str, tuple[str, ...]] = {}
+
+
+def clear_fold_caches() -> None:
+    transliterate.cache_clear()
+    _deobfuscated.clear()
+
+
+def join_spaced(tokens: list[str]) -> list[str]:
+    joined: list[str] = []
+    run: list[str] = []
+    for token in tokens:
+        if len(token) == 1:
+            run.append(token)
+            continue
+        if run:
+            joined.extend(["".join(run)] if len(run) >= SPACED_RUN_MIN else run)
+            run = []
+        joined.append(token)
+    if run:
+        joined.extend(["".join(run)] if len(run) >= SPACED_RUN_MIN else run)
+    return joined
+
+
+def fold_tokens(text: str, deobfuscate: bool = True) -> list[str]:
+    """Tokens of `text` in Latin script, without apostrophes and `+`.
+
+    `deobfuscate` undoes common evasions: leet digits and symbols inside words,
+    letters repeated three or more times, look-alike letters from other scripts (and fullwidth or styled
+    ones, via NFKC) and words spelled out letter by letter. Each distinct token is
+    folded once and then served from a cache, so a message costs a regex pass and a
+    dict lookup per token. Words and messages go through the same steps.
+
+    Without it, Cyrillic is only transliterated: ASCII text (most messages, Uzbek
+    Latin included once apostrophes are gone) is tokenized with the ASCII regex and
+    only non-ASCII tokens are transliterated.
+    """
+    for ch in APOSTROPHES:
+        text = text.replace(ch, "")
+    text = text.replace("+", "")
+    if not deobfuscate:
+        if text.isascii():
+            return ASCII_TOKEN_RE.findall(text)
+        tokens = []
+        for token in TOKEN_RE.findall(text):
+            if not token.isascii():
+                token = transliterate(token)
+            if token:
+                tokens.append(token)
+        return tokens
+    cache = _deobfuscated
+    if len(cache) > FOLD_CACHE_SIZE:
+        cache.clear()
+    tokens = []
+    for token in (ASCII_RAW_TOKEN_RE if text.isascii() else RAW_TOKEN_RE).findall(text):
+        folded = cache.get(token)
+        if folded is None:
+            folded = cache[token] = deobfuscate_token(token)
+        tokens.extend(folded)
+    return join_spaced(tokens)
+
+
 def normalize_word(word: str) -> str:
     word = word.strip()
     if settings.CASE_INSENSITIVE:
         word = word.lower()
     word = PLUS_PATTERN.sub(r"\\1plus", word)
-    for ch in APOSTROPHES:
-        word = word.replace(ch, "")
-    word = word.replace("+", "")
-    tokens = TOKEN_RE.findall(word)
-    return "".join(tokens)
+    return "".join(fold_tokens(word))
+
+
+def normalize_input(text: str) -> str | None:
+    # Words entered by admins or imported; single characters would match too much.
+    norm = normalize_word(text)
+    if not norm or len(norm) < 2:
+        return None
+    return norm
 
 
 def normalize_text(text: str) -> str:
@@ -90,15 +360,62 @@ def normalize_text(text: str) -> str:
     if settings.CASE_INSENSITIVE:
         text = text.lower()
     text = PLUS_PATTERN.sub(r"\\1plus", text)
-    for ch in APOSTROPHES:
-        text = text.replace(ch, "")
-    text = text.replace("+", "")
-    tokens = TOKEN_RE.findall(text)
-    return " ".join(tokens)
+    return " ".join(fold_tokens(text))
 
 
 def tokenize(text: str) -> Iterable[str]:
-    return TOKEN_RE.findall(text)
+    return (ASCII_TOKEN_RE if text.isascii() else TOKEN_RE).findall(text)
+
+
+def match_type_for(raw: str, norm: str) -> MatchType:
+    if " " in norm:
+        return MatchType.PHRASE
+    if raw.strip().endswith(STEM_MARK):
+        return MatchType.STEM
+    return MatchType.TOKEN
+
+
+async def search_words(
+    session: AsyncSession, group_id: int, query: str, limit: int = SEARCH_LIMIT
+) -> list[ProhibitedWord]:
+    """Substring and fuzzy matches of a normalized query, best first.
+
+    Both conditions are served by the pg_trgm GIN index on `word`. Fuzzy matches
+    are those above pg_trgm.similarity_threshold (0.3 by default).
+    """
+    similarity = func.similarity(ProhibitedWord.word, query)
+    result = await session.execute(
+        select(ProhibitedWord)
+        .where(
+            ProhibitedWord.group_id == group_id,
+            or_(
+                # Normalized queries are letters and digits only; nothing to escape.
+                ProhibitedWord.word.ilike(f"%{query}%"),
+                ProhibitedWord.word.op("%")(query),
+            ),
+        )
+        .order_by((ProhibitedWord.word == query).desc(), similarity.desc(), ProhibitedWord.word)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def similar_words(
+    session: AsyncSession, group_id: int, word: str, limit: int = SIMILAR_LIMIT
+) -> list[ProhibitedWord]:
+    """Existing words close to `word` (not equal to it), for duplicate warnings."""
+    similarity = func.similarity(ProhibitedWord.word, word)
+    result = await session.execute(
+        select(ProhibitedWord)
+        .where(
+            ProhibitedWord.group_id == group_id,
+            ProhibitedWord.word != word,
+            ProhibitedWord.word.op("%")(word),
+        )
+        .order_by(similarity.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
 
 
 def parse_words_from_file(path: str) -> list[str]:
@@ -137,7 +454,7 @@ async def seed_from_file_if_empty(sessionmaker: async_sessionmaker[AsyncSession]
             norm = normalize_word(raw)
             if not norm or len(norm) < 3:
                 continue
-            match_type = MatchType.PHRASE if " " in norm else MatchType.TOKEN
+            match_type = match_type_for(raw, norm)
             rows.append(
                 {
                     "word": norm,
@@ -146,11 +463,12 @@ async def seed_from_file_if_empty(sessionmaker: async_sessionmaker[AsyncSession]
                     "match_type": match_type,
                     "created_at": now,
                     "created_by": settings.ADMIN_ID or 0,
+                    "group_id": 0,
                 }
             )
         if rows:
             stmt = pg_insert(ProhibitedWord).values(rows)
-            stmt = stmt.on_conflict_do_nothing(index_elements=["word"])
+            stmt = stmt.on_conflict_do_nothing(index_elements=["group_id", "word"])
             await session.execute(stmt)
             await session.commit()
             logger.info("Seeded prohibited words from file: %s", len(rows))
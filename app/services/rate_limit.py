@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in FIFO order so a burst is served in arrival order.
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SendLimiter:
+    """Keeps outgoing Bot API calls under Telegram's global and per-chat limits."""
+
+    def __init__(self, global_rate_per_sec: float, chat_rate_per_min: float) -> None:
+        self.global_bucket = TokenBucket(global_rate_per_sec, max(1.0, global_rate_per_sec))
+        self.chat_rate_per_min = chat_rate_per_min
+        self.chat_buckets: dict[int, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self.chat_rate_per_min / 60
+            bucket = TokenBucket(rate, max(1.0, self.chat_rate_per_min / 6))
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: int | None = None) -> None:
+        # Private chats are only bound by the global limit.
+        if chat_id is not None and chat_id < 0:
+            await self._chat_bucket(chat_id).acquire()
+        await self.global_bucket.acquire()
+
+    async def call(self, chat_id: int | None, func: Callable[[], Awaitable[T]]) -> T:
+        await self.acquire(chat_id)
+        try:
+            return await func()
+        except TelegramRetryAfter as exc:
+            metrics.counter("telegram_retry_after_total").inc()
+            logger.warning("Telegram flood control chat=%s retry_after=%s", chat_id, exc.retry_after)
+            await asyncio.sleep(exc.retry_after)
+            await self.acquire(chat_id)
+            return await func()
+
+
+send_limiter = SendLimiter(
+    global_rate_per_sec=settings.TELEGRAM_GLOBAL_RATE_PER_SEC,
+    chat_rate_per_min=settings.TELEGRAM_GROUP_RATE_PER_MIN,
+)
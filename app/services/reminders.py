@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
+from uuid import UUID
 
 from aiogram import Bot
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
@@ -10,6 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.config import settings
 from app.db.models import SessionState, VerificationSession
 from app.security import build_callback_signature, encode_session_id
+from app.services.groups import GroupConfig, GroupRegistry
+from app.services.metrics import metrics
+from app.services.rate_limit import send_limiter
 from app.texts import render_reminder
 
 logger = logging.getLogger(__name__)
@@ -27,11 +32,19 @@ def build_agree_keyboard(session: VerificationSession) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[[button]])
 
 
-async def handle_due_session(bot: Bot, session_db: AsyncSession, session: VerificationSession) -> None:
+async def handle_due_session(
+    bot: Bot, session_db: AsyncSession, session: VerificationSession, group: GroupConfig | None
+) -> None:
     if session.state == SessionState.CONFIRMED_UNLOCKED:
         return
 
-    if session.reminder_count >= settings.MAX_REMINDERS:
+    if group is None:
+        return
+
+    max_reminders = group.setting("MAX_REMINDERS")
+    if session.reminder_count >= max_reminders:
+        # Selected because another group allows more reminders; park it until expiry.
+        session.remind_at = session.expires_at
         return
 
     if session.expires_at <= now_utc():
@@ -39,10 +52,12 @@ async def handle_due_session(bot: Bot, session_db: AsyncSession, session: Verifi
 
     display_name = "User"
     try:
-        member = await bot.get_chat_member(session.group_id, session.user_id)
+        member = await send_limiter.call(
+            None, lambda: bot.get_chat_member(session.group_id, session.user_id)
+        )
         display_name = member.user.full_name
         if member.status in {"left", "kicked"}:
-            session.reminder_count = settings.MAX_REMINDERS
+            session.reminder_count = max_reminders
             session.remind_at = session.expires_at
             session.updated_at = now_utc()
             return
@@ -50,38 +65,89 @@ async def handle_due_session(bot: Bot, session_db: AsyncSession, session: Verifi
         logger.exception("Failed to check chat member for reminder")
 
     try:
-        await bot.send_message(
-            chat_id=session.group_id,
-            text=render_reminder(session.user_id, display_name),
-            parse_mode="HTML",
-            reply_markup=build_agree_keyboard(session),
+        sent = await send_limiter.call(
+            session.group_id,
+            lambda: bot.send_message(
+                chat_id=session.group_id,
+                text=render_reminder(session.user_id, display_name),
+                parse_mode="HTML",
+                reply_markup=build_agree_keyboard(session),
+            ),
         )
         session.reminder_count += 1
-        session.remind_at = now_utc() + timedelta(minutes=settings.REMIND_AFTER_MIN)
+        session.reminder_message_ids = [*(session.reminder_message_ids or []), sent.message_id]
+        session.remind_at = now_utc() + timedelta(minutes=group.setting("REMIND_AFTER_MIN"))
         session.updated_at = now_utc()
+        metrics.counter("reminders_sent_total").inc()
         logger.info("Sent reminder to user %s in group %s", session.user_id, session.group_id)
     except Exception:
+        metrics.counter("reminders_failed_total").inc()
         logger.exception("Failed to send reminder for user %s", session.user_id)
 
 
-async def reminder_worker(bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+async def process_due_session(
+    bot: Bot,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    group_registry: GroupRegistry,
+    session_id: UUID,
+) -> None:
+    # Each session gets its own transaction so one failure cannot hold back the rest.
+    async with sessionmaker() as session:
+        item = await session.get(VerificationSession, session_id)
+        if not item:
+            return
+        await handle_due_session(bot, session, item, group_registry.get(item.group_id))
+        await session.commit()
+
+
+async def run_reminder_batch(
+    bot: Bot, sessionmaker: async_sessionmaker[AsyncSession], group_registry: GroupRegistry
+) -> int:
+    started = time.monotonic()
+    async with sessionmaker() as session:
+        now = now_utc()
+        result = await session.execute(
+            select(VerificationSession.id)
+            .where(
+                VerificationSession.state != SessionState.CONFIRMED_UNLOCKED,
+                VerificationSession.remind_at <= now,
+                VerificationSession.reminder_count < group_registry.max_setting("MAX_REMINDERS"),
+                VerificationSession.expires_at > now,
+            )
+            .order_by(VerificationSession.remind_at)
+            .limit(settings.REMINDER_BATCH_SIZE)
+        )
+        session_ids = result.scalars().all()
+
+    metrics.gauge("reminder_batch_size").set(len(session_ids))
+    if not session_ids:
+        return 0
+
+    semaphore = asyncio.Semaphore(max(1, settings.REMINDER_CONCURRENCY))
+
+    async def run_one(session_id: UUID) -> None:
+        async with semaphore:
+            try:
+                await process_due_session(bot, sessionmaker, group_registry, session_id)
+            except Exception:
+                metrics.counter("reminders_failed_total").inc()
+                logger.exception("Failed to process reminder session %s", session_id)
+
+    await asyncio.gather(*(run_one(session_id) for session_id in session_ids))
+
+    elapsed = time.monotonic() - started
+    metrics.histogram("reminder_drain_seconds").observe(elapsed)
+    logger.info("Reminder batch processed size=%s elapsed=%.2fs", len(session_ids), elapsed)
+    return len(session_ids)
+
+
+async def reminder_worker(
+    bot: Bot, sessionmaker: async_sessionmaker[AsyncSession], group_registry: GroupRegistry
+) -> None:
     while True:
         try:
-            async with sessionmaker() as session:
-                now = now_utc()
-                result = await session.execute(
-                    select(VerificationSession).where(
-                        VerificationSession.state != SessionState.CONFIRMED_UNLOCKED,
-                        VerificationSession.remind_at <= now,
-                        VerificationSession.reminder_count < settings.MAX_REMINDERS,
-                        VerificationSession.expires_at > now,
-                    )
-                )
-                sessions = result.scalars().all()
-                for item in sessions:
-                    await handle_due_session(bot, session, item)
-                await session.commit()
+            await run_reminder_batch(bot, sessionmaker, group_registry)
         except Exception:
             logger.exception("Reminder worker loop error")
 
-        await asyncio.sleep(20)
+        await asyncio.sleep(settings.REMINDER_POLL_INTERVAL_SEC)
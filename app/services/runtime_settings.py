@@ -54,18 +54,34 @@ def get_current_settings() -> dict[str, str]:
     return {key: str(getattr(settings, key)) for key in SUPPORTED_KEYS}
 
 
-async def load_runtime_settings(session: AsyncSession) -> dict[str, str]:
-    result = await session.execute(select(AppSetting).where(AppSetting.key.in_(SUPPORTED_KEYS)))
+async def load_runtime_settings(session: AsyncSession, group_id: int = 0) -> dict[str, str]:
+    result = await session.execute(
+        select(AppSetting).where(AppSetting.group_id == group_id, AppSetting.key.in_(SUPPORTED_KEYS))
+    )
     rows = result.scalars().all()
     return {row.key: row.value for row in rows}
 
 
-async def upsert_setting(session: AsyncSession, key: str, value: str, user_id: int) -> None:
+async def load_group_overrides(session: AsyncSession) -> dict[int, dict[str, str]]:
+    result = await session.execute(
+        select(AppSetting).where(AppSetting.group_id != 0, AppSetting.key.in_(SUPPORTED_KEYS))
+    )
+    overrides: dict[int, dict[str, str]] = {}
+    for row in result.scalars().all():
+        overrides.setdefault(row.group_id, {})[row.key] = row.value
+    return overrides
+
+
+async def upsert_setting(
+    session: AsyncSession, key: str, value: str, user_id: int, group_id: int = 0
+) -> None:
     now = datetime.now(tz=timezone.utc)
-    row = await session.get(AppSetting, key)
+    row = await session.get(AppSetting, (group_id, key))
     if row:
         row.value = value
         row.updated_at = now
         row.updated_by = user_id
     else:
-        session.add(AppSetting(key=key, value=value, updated_at=now, updated_by=user_id))
+        session.add(
+            AppSetting(group_id=group_id, key=key, value=value, updated_at=now, updated_by=user_id)
+        )
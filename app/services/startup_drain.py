@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.services.degradation import DegradationLevel
+from app.services.metrics import metrics
+from app.services.update_scheduler import UpdatePriority, classify_update
+
+logger = logging.getLogger(__name__)
+
+# Telegram hands the backlog over in quick succession; this long without an update
+# means it has been delivered.
+DRAIN_IDLE_SEC = 10.0
+DRAIN_CHECK_SEC = 1.0
+
+
+def update_date(update: Update) -> datetime | None:
+    message = update.message or update.edited_message
+    if message is not None:
+        return message.date
+    if update.chat_member:
+        return update.chat_member.date
+    return None
+
+
+class StartupDrain(BaseMiddleware):
+    """Fast-forwards group-message moderation for updates that piled up while offline.
+
+    The drain is active from startup until the first update younger than `max_age_sec`
+    arrives, no update has arrived for DRAIN_IDLE_SEC after the first one, or
+    `max_duration_sec` passes. While it is active, stale group messages are either
+    skipped or reduced to the keyword check; joins, DMs and callbacks are handled as
+    usual. Stale updates are marked with `startup_stale`, so the degradation controller
+    leaves them out of its lag signal. A report is logged when the drain ends.
+    """
+
+    def __init__(self, max_age_sec: float, mode: str, max_duration_sec: float) -> None:
+        self.max_age_sec = max_age_sec
+        self.mode = mode
+        self.max_duration_sec = max_duration_sec
+        self.active = max_age_sec > 0
+        self.started = time.monotonic()
+        # Idle time only counts once the backlog has started arriving.
+        self.last_update: float | None = None
+        self.fast_forwarded = 0
+        self.processed = 0
+        self.report = ""
+
+    def _finish(self) -> None:
+        self.active = False
+        elapsed = time.monotonic() - self.started
+        self.report = (
+            f"fast-forwarded={self.fast_forwarded} ({self.mode}), "
+            f"processed={self.processed}, duration={elapsed:.1f}s"
+        )
+        logger.info("Startup drain finished: %s", self.report)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not self.active or not isinstance(event, Update):
+            return await handler(event, data)
+
+        self.last_update = time.monotonic()
+        if self.last_update - self.started > self.max_duration_sec:
+            self._finish()
+            return await handler(event, data)
+
+        date = update_date(event)
+        age = (datetime.now(tz=timezone.utc) - date).total_seconds() if date else None
+        if age is not None and age < self.max_age_sec:
+            self._finish()
+            return await handler(event, data)
+
+        if age is not None:
+            data["startup_stale"] = True
+        if age is None or classify_update(event) != UpdatePriority.LOW:
+            self.processed += 1
+            return await handler(event, data)
+
+        self.fast_forwarded += 1
+        metrics.counter("startup_fast_forwarded_total", mode=self.mode).inc()
+        if self.mode == "skip":
+            return None
+        data["degradation_level"] = max(
+            data.get("degradation_level", DegradationLevel.NORMAL), DegradationLevel.KEYWORD_ONLY
+        )
+        return await handler(event, data)
+
+    def check(self) -> None:
+        if not self.active:
+            return
+        now = time.monotonic()
+        idle = self.last_update is not None and now - self.last_update >= DRAIN_IDLE_SEC
+        if idle or now - self.started > self.max_duration_sec:
+            self._finish()
+
+
+async def startup_drain_watcher(drain: StartupDrain) -> None:
+    # Ends the drain on a quiet group, where no fresh update may come for a long time.
+    while drain.active:
+        await asyncio.sleep(DRAIN_CHECK_SEC)
+        drain.check()
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from aiogram import Bot
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db.models import ApprovedMember, SessionState, VerificationSession
+from app.services.metrics import metrics
+from app.services.rate_limit import send_limiter
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATES = (SessionState.JOINED_LOCKED, SessionState.WAITING_DM_CONFIRM)
+# Other sweepers skip a claimed session this long; if the claiming process dies, it
+# is swept again once the claim runs out.
+SWEEP_LEASE_SEC = 900
+
+
+def now_utc() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+async def kick_user(
+    bot: Bot, group_id: int, user_id: int, still_due: Callable[[], Awaitable[bool]] | None = None
+) -> bool:
+    async def ban() -> bool:
+        # Checked once the limiter grants the call; waiting for it may take minutes.
+        if still_due is not None and not await still_due():
+            return False
+        await bot.ban_chat_member(group_id, user_id)
+        return True
+
+    try:
+        if not await send_limiter.call(None, ban):
+            return False
+        await send_limiter.call(
+            None, lambda: bot.unban_chat_member(group_id, user_id, only_if_banned=True)
+        )
+        logger.info("Kicked unverified user %s from group %s", user_id, group_id)
+        return True
+    except Exception:
+        logger.exception("Failed to kick unverified user %s from group %s", user_id, group_id)
+        return False
+
+
+async def delete_session_messages(bot: Bot, session: VerificationSession) -> None:
+    message_ids = [session.welcome_message_id, *(session.reminder_message_ids or [])]
+    for message_id in message_ids:
+        if not message_id:
+            continue
+        try:
+            await send_limiter.call(None, lambda: bot.delete_message(session.group_id, message_id))
+        except Exception:
+            logger.debug("Failed to delete message %s in group %s", message_id, session.group_id)
+
+
+async def claim_expired(sessionmaker: async_sessionmaker[AsyncSession], lease_until: datetime) -> list[VerificationSession]:
+    # A short transaction: the rows are locked only while their lease is written.
+    async with sessionmaker() as session:
+        result = await session.execute(
+            select(VerificationSession)
+            .where(
+                VerificationSession.state.in_(PENDING_STATES),
+                VerificationSession.expires_at <= now_utc(),
+                or_(
+                    VerificationSession.sweep_claimed_until.is_(None),
+                    VerificationSession.sweep_claimed_until <= now_utc(),
+                ),
+            )
+            .order_by(VerificationSession.expires_at)
+            .limit(settings.EXPIRY_SWEEP_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        expired = result.scalars().all()
+        if expired:
+            await session.execute(
+                update(VerificationSession)
+                .where(VerificationSession.id.in_([item.id for item in expired]))
+                .values(sweep_claimed_until=lease_until)
+            )
+            await session.commit()
+        return expired
+
+
+def still_claimed(item: VerificationSession, lease_until: datetime):
+    # A confirmation changes the state and a rejoin resets expires_at and the claim;
+    # either one means the session is no longer this sweeper's to close.
+    return (
+        VerificationSession.id == item.id,
+        VerificationSession.state.in_(PENDING_STATES),
+        VerificationSession.expires_at == item.expires_at,
+        VerificationSession.sweep_claimed_until == lease_until,
+    )
+
+
+async def claim_status(
+    sessionmaker: async_sessionmaker[AsyncSession], item: VerificationSession, lease_until: datetime
+) -> tuple[bool, bool]:
+    # Whether the session is still this sweeper's to close, and whether the user is approved.
+    async with sessionmaker() as session:
+        claimed = await session.scalar(select(VerificationSession.id).where(*still_claimed(item, lease_until)))
+        approved = await session.scalar(
+            select(ApprovedMember.id).where(
+                ApprovedMember.group_id == item.group_id, ApprovedMember.user_id == item.user_id
+            )
+        )
+    return claimed is not None, approved is not None
+
+
+async def close_expired(
+    bot: Bot, sessionmaker: async_sessionmaker[AsyncSession], item: VerificationSession, lease_until: datetime
+) -> bool:
+    async def still_due() -> bool:
+        claimed, approved = await claim_status(sessionmaker, item, lease_until)
+        return claimed and not approved
+
+    if settings.EXPIRY_KICK_ENABLED and await kick_user(bot, item.group_id, item.user_id, still_due):
+        metrics.counter("expired_users_kicked_total").inc()
+    claimed, _approved = await claim_status(sessionmaker, item, lease_until)
+    if not claimed:
+        metrics.counter("expired_sessions_reclaimed_total").inc()
+        return False
+    await delete_session_messages(bot, item)
+    async with sessionmaker() as session:
+        await session.execute(delete(VerificationSession).where(*still_claimed(item, lease_until)))
+        await session.commit()
+    return True
+
+
+async def sweep_expired_batch(bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    """Claims a batch of expired sessions, then kicks and cleans up outside the transaction.
+
+    Telegram calls go through the rate limiter and may take minutes for a large batch,
+    so no row lock or connection is held while they run. Returns the number claimed.
+    """
+    lease_until = now_utc() + timedelta(seconds=SWEEP_LEASE_SEC)
+    expired = await claim_expired(sessionmaker, lease_until)
+    if not expired:
+        return 0
+    closed = await asyncio.gather(*(close_expired(bot, sessionmaker, item, lease_until) for item in expired))
+    metrics.counter("expired_sessions_purged_total").inc(sum(closed))
+    return len(expired)
+
+
+async def purge_confirmed_sessions(sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    # Approval is kept in approved_members, so confirmed sessions are only history.
+    cutoff = now_utc() - timedelta(days=settings.SESSION_RETENTION_DAYS)
+    async with sessionmaker() as session:
+        result = await session.execute(
+            delete(VerificationSession).where(
+                VerificationSession.state == SessionState.CONFIRMED_UNLOCKED,
+                VerificationSession.updated_at < cutoff,
+            )
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def expiry_sweeper(bot: Bot, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    while True:
+        try:
+            started = time.monotonic()
+            total = 0
+            while True:
+                swept = await sweep_expired_batch(bot, sessionmaker)
+                total += swept
+                if swept < settings.EXPIRY_SWEEP_BATCH_SIZE:
+                    break
+            purged = await purge_confirmed_sessions(sessionmaker)
+            if total or purged:
+                logger.info(
+                    "Expiry sweep done expired=%s purged_confirmed=%s elapsed=%.2fs",
+                    total,
+                    purged,
+                    time.monotonic() - started,
+                )
+        except Exception:
+            logger.exception("Expiry sweeper loop error")
+
+        await asyncio.sleep(settings.EXPIRY_SWEEP_INTERVAL_SEC)
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.types import TelegramObject, Update
+from sqlalchemy import delete, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_admin_ids
+from app.db.models import QueuedUpdate
+from app.services.metrics import metrics
+from app.services.update_scheduler import classify_update, update_shard_key
+
+logger = logging.getLogger(__name__)
+
+# A row is claimable only while it is the oldest row of its shard (user). Rows are
+# deleted after processing, so a user's next update waits until the previous one is
+# done, wherever it ran. Rows without a shard key have no ordering constraint.
+CLAIM_SQL = text(
+    """
+    UPDATE update_queue AS q
+    SET claimed_at = now(), claimed_by = :worker
+    WHERE q.id IN (
+        SELECT c.id FROM update_queue AS c
+        WHERE c.claimed_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM update_queue AS p
+              WHERE p.shard_key = c.shard_key AND p.id < c.id
+          )
+        ORDER BY c.priority, c.id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING q.id, q.payload
+    """
+)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def is_admin_update(update: Update, data: dict[str, Any]) -> bool:
+    user = data.get("event_from_user")
+    if user is None:
+        return False
+    group_registry = data.get("group_registry")
+    if not (group_registry.is_admin(user.id) if group_registry else user.id in get_admin_ids()):
+        return False
+    if update.callback_query:
+        return bool(update.callback_query.data and update.callback_query.data.startswith("admin:"))
+    return bool(update.message and update.message.chat.type == "private")
+
+
+async def enqueue_update(
+    sessionmaker: async_sessionmaker[AsyncSession], update: Update, data: dict[str, Any]
+) -> None:
+    stmt = (
+        pg_insert(QueuedUpdate)
+        .values(
+            update_id=update.update_id,
+            shard_key=update_shard_key(update, data),
+            priority=int(classify_update(update)),
+            payload=update.model_dump(mode="json", exclude_none=True, by_alias=True),
+            enqueued_at=datetime.now(tz=timezone.utc),
+        )
+        .on_conflict_do_nothing(index_elements=["update_id"])
+    )
+    async with sessionmaker() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+class QueueIngestMiddleware(BaseMiddleware):
+    """Ingest role: persists updates to the shared queue instead of handling them.
+
+    Admin panel traffic is still handled in-process because the admin flow state
+    lives in this process's memory.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        self.sessionmaker = sessionmaker
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update) or is_admin_update(event, data):
+            return await handler(event, data)
+        await enqueue_update(self.sessionmaker, event, data)
+        metrics.counter("update_queue_enqueued_total").inc()
+        return None
+
+
+async def claim_updates(
+    sessionmaker: async_sessionmaker[AsyncSession], worker_id: str, limit: int
+) -> list[tuple[int, dict]]:
+    async with sessionmaker() as session:
+        result = await session.execute(CLAIM_SQL, {"worker": worker_id, "limit": limit})
+        rows = [(row.id, row.payload) for row in result]
+        await session.commit()
+    return rows
+
+
+async def ack_update(sessionmaker: async_sessionmaker[AsyncSession], row_id: int) -> None:
+    async with sessionmaker() as session:
+        await session.execute(delete(QueuedUpdate).where(QueuedUpdate.id == row_id))
+        await session.commit()
+
+
+async def release_stale_claims(
+    sessionmaker: async_sessionmaker[AsyncSession], older_than_sec: int
+) -> int:
+    async with sessionmaker() as session:
+        result = await session.execute(
+            update(QueuedUpdate)
+            .where(QueuedUpdate.claimed_at < datetime.now(tz=timezone.utc) - timedelta(seconds=older_than_sec))
+            .values(claimed_at=None, claimed_by=None)
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+class UpdateQueueWorker:
+    """Worker role: claims queued updates and feeds them through the local dispatcher."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        dp: Dispatcher,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        poll_interval_sec: float,
+        visibility_timeout_sec: int,
+        worker_id: str | None = None,
+    ) -> None:
+        self.bot = bot
+        self.dp = dp
+        self.sessionmaker = sessionmaker
+        self.concurrency = max(1, concurrency)
+        self.poll_interval_sec = poll_interval_sec
+        self.visibility_timeout_sec = visibility_timeout_sec
+        self.worker_id = worker_id or default_worker_id()
+        self.in_flight: set[asyncio.Task] = set()
+        self.processed = 0
+
+    async def _process(self, row_id: int, payload: dict) -> None:
+        started = time.monotonic()
+        try:
+            update = Update.model_validate(payload, context={"bot": self.bot})
+            await self.dp.feed_update(self.bot, update)
+        except Exception:
+            logger.exception("Failed to process queued update row=%s", row_id)
+        finally:
+            # Failed updates are dropped as well; polling would not redeliver them either.
+            await ack_update(self.sessionmaker, row_id)
+            self.processed += 1
+            metrics.counter("update_queue_processed_total").inc()
+            metrics.histogram("update_queue_process_seconds").observe(time.monotonic() - started)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info("Update queue worker %s started concurrency=%s", self.worker_id, self.concurrency)
+        last_release = 0.0
+        while not stop.is_set():
+            try:
+                now = time.monotonic()
+                if now - last_release > self.visibility_timeout_sec / 2:
+                    released = await release_stale_claims(self.sessionmaker, self.visibility_timeout_sec)
+                    if released:
+                        logger.warning("Released %s stale update claims", released)
+                    last_release = now
+
+                free = self.concurrency - len(self.in_flight)
+                if free <= 0:
+                    await asyncio.wait(
+                        self.in_flight, timeout=self.poll_interval_sec, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    continue
+                rows = await claim_updates(self.sessionmaker, self.worker_id, free)
+                for row_id, payload in rows:
+                    task = asyncio.create_task(self._process(row_id, payload))
+                    self.in_flight.add(task)
+                    task.add_done_callback(self.in_flight.discard)
+                if rows:
+                    metrics.counter("update_queue_claimed_total").inc(len(rows))
+                    # Give the tasks a chance to finish before claiming more.
+                    await asyncio.sleep(0)
+                    continue
+            except Exception:
+                logger.exception("Update queue worker loop error")
+            await asyncio.sleep(self.poll_interval_sec)
+
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        logger.info("Update queue worker %s stopped processed=%s", self.worker_id, self.processed)
@@ -0,0 +1,244 @@
+import asyncio
+import enum
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update, User
+
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class UpdatePriority(enum.IntEnum):
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+
+
+# Share of freed slots each class receives while several classes are waiting.
+PRIORITY_WEIGHTS = {
+    UpdatePriority.HIGH: 8,
+    UpdatePriority.MEDIUM: 4,
+    UpdatePriority.LOW: 1,
+}
+
+
+def classify_update(update: Update) -> UpdatePriority:
+    if update.callback_query:
+        return UpdatePriority.HIGH
+    if update.chat_member or update.my_chat_member or update.chat_join_request:
+        return UpdatePriority.MEDIUM
+    message = update.message or update.edited_message
+    if message is not None:
+        if message.chat.type == "private":
+            return UpdatePriority.HIGH
+        if message.new_chat_members or message.left_chat_member:
+            return UpdatePriority.MEDIUM
+    return UpdatePriority.LOW
+
+
+def update_shard_key(update: Update, data: dict[str, Any]) -> int | None:
+    # For joins the actor may be an inviter; order by the member whose state changes.
+    if update.chat_member:
+        return update.chat_member.new_chat_member.user.id
+    user: User | None = data.get("event_from_user")
+    return user.id if user else None
+
+
+class PrioritySemaphore:
+    """Counting semaphore that hands freed slots to waiting classes by weight.
+
+    Each class can additionally be capped below the total limit, which keeps slots
+    free for higher classes even when a lower class alone could saturate them.
+    """
+
+    def __init__(self, limit: int, weights: dict[UpdatePriority, int], caps: dict[UpdatePriority, int]) -> None:
+        self.limit = limit
+        self.weights = weights
+        self.caps = caps
+        self.active = 0
+        self.active_by: dict[UpdatePriority, int] = {priority: 0 for priority in UpdatePriority}
+        self.waiters: dict[UpdatePriority, deque[asyncio.Future]] = {
+            priority: deque() for priority in UpdatePriority
+        }
+        self.credits: dict[UpdatePriority, int] = {priority: 0 for priority in UpdatePriority}
+
+    def _can_run(self, priority: UpdatePriority) -> bool:
+        return self.active < self.limit and self.active_by[priority] < self.caps.get(priority, self.limit)
+
+    def _grant(self, priority: UpdatePriority) -> None:
+        self.active += 1
+        self.active_by[priority] += 1
+
+    def _pick(self) -> UpdatePriority | None:
+        # Smooth weighted round-robin over the classes that have waiters and spare cap.
+        candidates = [
+            priority
+            for priority in UpdatePriority
+            if self.waiters[priority] and self._can_run(priority)
+        ]
+        if not candidates:
+            return None
+        total = 0
+        for priority in candidates:
+            self.credits[priority] += self.weights[priority]
+            total += self.weights[priority]
+        best = max(candidates, key=lambda priority: (self.credits[priority], -priority))
+        self.credits[best] -= total
+        return best
+
+    def _wake(self) -> None:
+        while self.active < self.limit:
+            priority = self._pick()
+            if priority is None:
+                return
+            waiter = self.waiters[priority].popleft()
+            if waiter.done():
+                continue
+            self._grant(priority)
+            waiter.set_result(None)
+
+    async def acquire(self, priority: UpdatePriority) -> None:
+        if not self.waiters[priority] and self._can_run(priority):
+            self._grant(priority)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(priority)
+            else:
+                try:
+                    self.waiters[priority].remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, priority: UpdatePriority) -> None:
+        self.active -= 1
+        self.active_by[priority] -= 1
+        self._wake()
+
+
+class Lane:
+    """One shard of the per-user ordering state, with its own metrics.
+
+    Each user with updates in flight has a FIFO lock here, dropped when the user's
+    last update is done; only updates of the same user wait on each other.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        # asyncio.Lock wakes waiters in FIFO order, which is what keeps per-user ordering.
+        self.users: dict[int, asyncio.Lock] = {}
+        self.queued: dict[int, int] = {}
+        self.depth = 0
+        self.max_depth = 0
+        self.depth_gauge = metrics.gauge("update_lane_depth", lane=index)
+        self.max_depth_gauge = metrics.gauge("update_lane_max_depth", lane=index)
+        self.wait_histogram = metrics.histogram("update_lane_wait_seconds", lane=index)
+
+    def enter(self, key: int) -> asyncio.Lock:
+        self.queued[key] = self.queued.get(key, 0) + 1
+        lock = self.users.get(key)
+        if lock is None:
+            lock = self.users[key] = asyncio.Lock()
+        self.depth += 1
+        self.depth_gauge.set(self.depth)
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+            self.max_depth_gauge.set(self.max_depth)
+        return lock
+
+    def leave(self, key: int) -> None:
+        self.queued[key] -= 1
+        if not self.queued[key]:
+            del self.queued[key]
+            del self.users[key]
+        self.depth -= 1
+        self.depth_gauge.set(self.depth)
+
+
+class UpdateScheduler(BaseMiddleware):
+    """Runs updates of one user in order while unrelated users proceed in parallel.
+
+    Updates of one user run one at a time in arrival order, whatever their class, so a
+    user's join is always handled before that user's next message: the join handler
+    is what restricts a new member, and until it runs nothing stops them posting.
+    Updates of different users only compete for the `concurrency` slots of the
+    weighted semaphore, where the class (callbacks and DMs high, joins medium,
+    group-message moderation low) decides who runs next. Users are sharded into
+    `lanes` for bookkeeping and metrics; a lane does not limit concurrency.
+    """
+
+    def __init__(self, lanes: int, concurrency: int, low_priority_share: float = 0.75) -> None:
+        self.lanes = [Lane(index) for index in range(max(1, lanes))]
+        self.concurrency = max(1, concurrency)
+        low_cap = max(1, int(self.concurrency * low_priority_share))
+        self.slots = PrioritySemaphore(
+            self.concurrency, PRIORITY_WEIGHTS, caps={UpdatePriority.LOW: low_cap}
+        )
+        self.pending_by: dict[UpdatePriority, int] = {priority: 0 for priority in UpdatePriority}
+        self.in_flight_gauge = metrics.gauge("updates_in_flight")
+
+    @property
+    def pending(self) -> int:
+        return sum(self.pending_by.values())
+
+    def pending_for(self, priority: UpdatePriority) -> int:
+        return self.pending_by[priority]
+
+    def lane_for(self, key: int) -> Lane:
+        return self.lanes[key % len(self.lanes)]
+
+    async def _run(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+        priority: UpdatePriority,
+        received: float,
+    ) -> Any:
+        await self.slots.acquire(priority)
+        label = priority.name.lower()
+        metrics.histogram("update_queue_wait_seconds", priority=label).observe(time.monotonic() - received)
+        self.in_flight_gauge.set(self.slots.active)
+        try:
+            return await handler(event, data)
+        finally:
+            self.slots.release(priority)
+            self.in_flight_gauge.set(self.slots.active)
+            metrics.histogram("update_latency_seconds", priority=label).observe(time.monotonic() - received)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        received = time.monotonic()
+        if not isinstance(event, Update):
+            return await handler(event, data)
+        priority = classify_update(event)
+        metrics.counter("updates_total", priority=priority.name.lower()).inc()
+        self.pending_by[priority] += 1
+        try:
+            key = update_shard_key(event, data)
+            if key is None:
+                return await self._run(handler, event, data, priority, received)
+            lane = self.lane_for(key)
+            lock = lane.enter(key)
+            try:
+                async with lock:
+                    lane.wait_histogram.observe(time.monotonic() - received)
+                    return await self._run(handler, event, data, priority, received)
+            finally:
+                lane.leave(key)
+        finally:
+            self.pending_by[priority] -= 1
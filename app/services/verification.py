@@ -29,7 +29,13 @@ async def is_approved(session: AsyncSession, group_id: int, user_id: int) -> boo
     return result.scalar_one_or_none() is not None
 
 
-async def upsert_session(session: AsyncSession, group_id: int, user_id: int) -> VerificationSession:
+async def upsert_session(
+    session: AsyncSession,
+    group_id: int,
+    user_id: int,
+    remind_after_min: int | None = None,
+    expire_after_min: int | None = None,
+) -> VerificationSession:
     result = await session.execute(
         select(VerificationSession).where(
             VerificationSession.group_id == group_id, VerificationSession.user_id == user_id
@@ -41,8 +47,12 @@ async def upsert_session(session: AsyncSession, group_id: int, user_id: int) ->
 
     magic_word = choice(WORDS)
     now = now_utc()
-    remind_at = now + timedelta(minutes=settings.REMIND_AFTER_MIN)
-    expires_at = now + timedelta(minutes=settings.EXPIRE_AFTER_MIN)
+    if remind_after_min is None:
+        remind_after_min = settings.REMIND_AFTER_MIN
+    if expire_after_min is None:
+        expire_after_min = settings.EXPIRE_AFTER_MIN
+    remind_at = now + timedelta(minutes=remind_after_min)
+    expires_at = now + timedelta(minutes=expire_after_min)
 
     if existing:
         existing.state = SessionState.JOINED_LOCKED
@@ -50,6 +60,7 @@ async def upsert_session(session: AsyncSession, group_id: int, user_id: int) ->
         existing.reminder_count = 0
         existing.remind_at = remind_at
         existing.expires_at = expires_at
+        existing.sweep_claimed_until = None
         existing.updated_at = now
         return existing
 
@@ -134,6 +145,18 @@ async def get_active_session(
     return result.scalar_one_or_none()
 
 
+async def get_pending_sessions(session: AsyncSession, user_id: int) -> list[VerificationSession]:
+    result = await session.execute(
+        select(VerificationSession)
+        .where(
+            VerificationSession.user_id == user_id,
+            VerificationSession.state != SessionState.CONFIRMED_UNLOCKED,
+        )
+        .order_by(VerificationSession.updated_at.desc())
+    )
+    return list(result.scalars().all())
+
+
 async def update_session_state(
     session: AsyncSession, session_id: UUID, state: SessionState
 ) -> None:
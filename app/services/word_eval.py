@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app.db.models import ProhibitedWord
+from app.services.prohibited import ProhibitedCache, match_type_for, normalize_word
+
+logger = logging.getLogger(__name__)
+
+# Corpus lines handed to a worker at once; large enough to amortize pickling.
+EVAL_CHUNK_LINES = 5000
+SAMPLES_PER_WORD = 3
+SAMPLE_CHARS = 120
+
+
+@dataclass
+class EvalResult:
+    messages: int = 0
+    invalid: int = 0
+    # Messages labelled `"prohibited": true` in the corpus, and how many of them matched.
+    labelled: int = 0
+    caught: int = 0
+    hits: Counter = field(default_factory=Counter)
+    # Hits on messages not labelled prohibited: the false-positive candidates.
+    unexpected: Counter = field(default_factory=Counter)
+    samples: dict[str, list[str]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def matched(self) -> int:
+        return sum(self.hits.values())
+
+    @property
+    def per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: "EvalResult") -> None:
+        self.messages += other.messages
+        self.invalid += other.invalid
+        self.labelled += other.labelled
+        self.caught += other.caught
+        self.hits.update(other.hits)
+        self.unexpected.update(other.unexpected)
+        for word, texts in other.samples.items():
+            kept = self.samples.setdefault(word, [])
+            kept.extend(texts[: SAMPLES_PER_WORD - len(kept)])
+
+
+def candidate_rows(words: Iterable[str]) -> list[ProhibitedWord]:
+    # Normalized the way the admin panel and the file seed store them.
+    rows = {}
+    for raw in words:
+        norm = normalize_word(raw)
+        if norm and norm not in rows:
+            match_type = match_type_for(raw, norm)
+            rows[norm] = ProhibitedWord(word=norm, original=raw, match_type=match_type)
+    return list(rows.values())
+
+
+def build_cache(words: list[str]) -> ProhibitedCache:
+    cache = ProhibitedCache(sessionmaker=None)
+    cache.load(candidate_rows(words))
+    return cache
+
+
+_worker_cache: ProhibitedCache | None = None
+
+
+def init_worker(words: list[str]) -> None:
+    global _worker_cache
+    _worker_cache = build_cache(words)
+
+
+def evaluate_lines(lines: list[str], cache: ProhibitedCache | None = None) -> EvalResult:
+    """Matches one chunk of JSONL corpus lines (`{"text": ..., "prohibited": bool}`)."""
+    cache = cache or _worker_cache
+    result = EvalResult()
+    for line in lines:
+        try:
+            record = json.loads(line)
+            text = record["text"]
+        except (ValueError, KeyError, TypeError):
+            result.invalid += 1
+            continue
+        if not isinstance(text, str):
+            result.invalid += 1
+            continue
+        result.messages += 1
+        labelled = record.get("prohibited") is True
+        result.labelled += labelled
+        entry = cache.match(text)
+        if entry is None:
+            continue
+        # Attributed to the entry production would report for this message.
+        result.hits[entry.original] += 1
+        if labelled:
+            result.caught += 1
+            continue
+        result.unexpected[entry.original] += 1
+        samples = result.samples.setdefault(entry.original, [])
+        if len(samples) < SAMPLES_PER_WORD:
+            samples.append(" ".join(text.split())[:SAMPLE_CHARS])
+    return result
+
+
+def read_chunks(path: Path, size: int) -> Iterator[list[str]]:
+    chunk = []
+    with path.open(encoding="utf-8") as corpus:
+        for line in corpus:
+            if line.strip():
+                chunk.append(line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_corpus(corpus: Path, words: list[str], workers: int | None = None) -> EvalResult:
+    """Runs the production matcher over a JSONL corpus in a pool of processes.
+
+    Every worker builds its own ProhibitedCache from `words`; the corpus is read in
+    chunks with a bounded number in flight, so its size does not matter. With one
+    worker everything runs in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    result = EvalResult()
+    started = time.perf_counter()
+    if workers == 1:
+        cache = build_cache(words)
+        for chunk in read_chunks(corpus, EVAL_CHUNK_LINES):
+            result.merge(evaluate_lines(chunk, cache))
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(words,)) as pool:
+            pending: set[Future] = set()
+            for chunk in read_chunks(corpus, EVAL_CHUNK_LINES):
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result.merge(future.result())
+                pending.add(pool.submit(evaluate_lines, chunk))
+            for future in pending:
+                result.merge(future.result())
+    result.elapsed = time.perf_counter() - started
+    logger.info(
+        "Evaluated %s messages against %s words in %.2fs (%.0f msg/s, workers=%s)",
+        result.messages,
+        len(words),
+        result.elapsed,
+        result.per_second,
+        workers,
+    )
+    return result
@@ -0,0 +1,292 @@
+import codecs
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+from aiogram import Bot
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import MatchType
+from app.services.prohibited import STEM_MARK, match_type_for
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = (".txt", ".csv", ".json")
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT_SEC = 600
+PROGRESS_INTERVAL_SEC = 2.0
+MAX_WORD_LEN = 256
+# Bound on buffered JSON text that does not parse into an array item.
+MAX_JSON_ITEM_CHARS = 64 * 1024
+CSV_HEADERS = {"word", "words", "original"}
+
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE word_import (
+    line_no BIGINT NOT NULL,
+    word TEXT NOT NULL,
+    original TEXT NOT NULL,
+    match_type TEXT NOT NULL
+) ON COMMIT DROP
+"""
+
+COUNT_STAGED_SQL = """
+SELECT count(*) FILTER (WHERE p.id IS NULL),
+       count(*) FILTER (WHERE p.enabled IS FALSE),
+       count(*)
+FROM (SELECT DISTINCT word FROM word_import) i
+LEFT JOIN prohibited_words p ON p.group_id = :group_id AND p.word = i.word
+"""
+
+# The first occurrence of a word wins; a duplicate in the VALUES of one upsert would
+# make Postgres reject the whole statement.
+MERGE_STAGED_SQL = """
+INSERT INTO prohibited_words (word, original, enabled, match_type, created_at, created_by, group_id)
+SELECT DISTINCT ON (word) word, original, true, match_type::match_type, :now, :created_by, :group_id
+FROM word_import
+ORDER BY word, line_no
+ON CONFLICT (group_id, word) DO UPDATE SET enabled = true, original = EXCLUDED.original, match_type = EXCLUDED.match_type
+"""
+
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    skipped: int = 0
+    distinct: int = 0
+    added: int = 0
+    reenabled: int = 0
+    merging: bool = False
+
+    @property
+    def unchanged(self) -> int:
+        return self.distinct - self.added - self.reenabled
+
+    @property
+    def duplicates(self) -> int:
+        return self.read - self.skipped - self.distinct
+
+
+async def stream_file(bot: Bot, file_path: str) -> AsyncIterator[bytes]:
+    if bot.session.api.is_local:
+        with open(bot.session.api.wrap_local_file.to_local(file_path), "rb") as local:
+            while chunk := local.read(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+        return
+    async for chunk in bot.session.stream_content(
+        url=bot.session.api.file_url(bot.token, file_path),
+        timeout=DOWNLOAD_TIMEOUT_SEC,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        raise_for_status=True,
+    ):
+        yield chunk
+
+
+async def decode_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # Multi-byte characters may be split across chunks; the BOM is dropped.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    async for chunk in chunks:
+        decoded = decoder.decode(chunk)
+        if decoded:
+            yield decoded
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def split_lines(texts: AsyncIterator[str]) -> AsyncIterator[list[str]]:
+    pending = ""
+    async for chunk in texts:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        if lines:
+            yield [line.rstrip("\r") for line in lines]
+    if pending:
+        yield [pending.rstrip("\r")]
+
+
+async def txt_words(texts: AsyncIterator[str]) -> AsyncIterator[str]:
+    # Same rules as parse_words_from_file: one word per line, `#` comments.
+    async for lines in split_lines(texts):
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def exported_word(original: str, match_type: str | None) -> str:
+    """The importable spelling of a row from a words export.
+
+    The export's `match_type` wins over the STEM mark in `original`, which an admin
+    may have toggled since the word was added.
+    """
+    original = original.strip()
+    if not match_type:
+        return original
+    word = original.removesuffix(STEM_MARK).rstrip()
+    return word + STEM_MARK if match_type == MatchType.STEM.value else word
+
+
+async def csv_words(texts: AsyncIterator[str]) -> AsyncIterator[str]:
+    # The first column holds the word. A header row is skipped; with the columns of a
+    # words export, `original` and `match_type` are read instead.
+    first = True
+    word_column = 0
+    type_column = None
+    async for lines in split_lines(texts):
+        for row in csv.reader(lines):
+            if first:
+                first = False
+                header = [cell.strip().lower() for cell in row]
+                if header and header[0] in CSV_HEADERS:
+                    if "original" in header:
+                        word_column = header.index("original")
+                    if "match_type" in header:
+                        type_column = header.index("match_type")
+                    continue
+            cell = row[word_column].strip() if len(row) > word_column else ""
+            if not cell or cell.startswith("#"):
+                continue
+            if type_column is not None and len(row) > type_column:
+                cell = exported_word(cell, row[type_column].strip())
+            yield cell
+
+
+def json_item_word(item: object) -> str:
+    if isinstance(item, dict):
+        original = item.get("original") or item.get("word")
+        if not isinstance(original, str):
+            return ""
+        return exported_word(original, item.get("match_type"))
+    return str(item).strip()
+
+
+async def json_words(texts: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Items of the first JSON array: `{"words": [...]}` as in parse_words_from_file, or a bare list.
+
+    Items are decoded one at a time as text arrives, so the document is never held
+    in memory as a whole. Object items, as in a words export, give their `original`
+    (or `word`) and `match_type`.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = finished = False
+    async for chunk in texts:
+        buffer += chunk
+        if not started:
+            start = buffer.find("[")
+            if start < 0:
+                if len(buffer) > MAX_JSON_ITEM_CHARS:
+                    raise ValueError("Invalid JSON format: no word list found")
+                continue
+            buffer = buffer[start + 1 :]
+            started = True
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                finished = True
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break
+            if end >= len(buffer):
+                # A number or literal may continue in the next chunk.
+                break
+            pos = end
+            word = json_item_word(item)
+            if word:
+                yield word
+        buffer = buffer[pos:]
+        if finished:
+            return
+        if len(buffer) > MAX_JSON_ITEM_CHARS:
+            raise ValueError("Invalid JSON format: unreadable item")
+    if not started:
+        raise ValueError("Invalid JSON format: no word list found")
+    # A truncated upload; raising aborts the import transaction, so nothing is merged.
+    raise ValueError("Invalid JSON format: word list is not closed")
+
+
+def document_words(chunks: AsyncIterator[bytes], suffix: str) -> AsyncIterator[str]:
+    texts = decode_chunks(chunks)
+    if suffix == ".json":
+        return json_words(texts)
+    if suffix == ".csv":
+        return csv_words(texts)
+    return txt_words(texts)
+
+
+async def single_chunk(data: str) -> AsyncIterator[str]:
+    yield data
+
+
+def text_words(data: str) -> AsyncIterator[str]:
+    return txt_words(single_chunk(data))
+
+
+async def import_words(
+    session: AsyncSession,
+    group_id: int,
+    created_by: int,
+    words: AsyncIterator[str],
+    normalize: Callable[[str], str | None],
+    progress: Callable[[ImportResult], Awaitable[None]] | None = None,
+) -> ImportResult:
+    """Streams words into a temp staging table with COPY, then merges them with one upsert.
+
+    Runs in the session's transaction and commits it. Words that normalize to nothing
+    or are too long are skipped.
+    """
+    result = ImportResult()
+    reported = time.monotonic()
+
+    async def records():
+        nonlocal reported
+        async for raw in words:
+            result.read += 1
+            norm = normalize(raw)
+            if not norm or len(norm) > MAX_WORD_LEN:
+                result.skipped += 1
+                continue
+            match_type = match_type_for(raw, norm)
+            yield (result.read, norm, raw[:MAX_WORD_LEN], match_type.value)
+            if progress is not None and time.monotonic() - reported >= PROGRESS_INTERVAL_SEC:
+                reported = time.monotonic()
+                await progress(result)
+
+    await session.execute(text(CREATE_STAGING_SQL))
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    # The staging table lives in this transaction, so COPY must use the same connection.
+    await raw_connection.driver_connection.copy_records_to_table(
+        "word_import", records=records(), columns=["line_no", "word", "original", "match_type"]
+    )
+
+    result.merging = True
+    if progress is not None:
+        await progress(result)
+    counts = await session.execute(text(COUNT_STAGED_SQL), {"group_id": group_id})
+    result.added, result.reenabled, result.distinct = counts.one()
+    await session.execute(
+        text(MERGE_STAGED_SQL),
+        {"now": datetime.now(tz=timezone.utc), "created_by": created_by, "group_id": group_id},
+    )
+    await session.commit()
+    logger.info(
+        "Imported words group=%s read=%s added=%s reenabled=%s skipped=%s",
+        group_id,
+        result.read,
+        result.added,
+        result.reenabled,
+        result.skipped,
+    )
+    return result
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, and_, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db.models import ProhibitedWord, ProhibitedWordStat
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Three columns per row; stays under the 32767 bind parameter limit.
+FLUSH_CHUNK = 5000
+
+
+class WordHits:
+    """Hits per prohibited word id since the last flush.
+
+    Kept apart from the caches, so a cache refresh does not lose counts.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+        self.last_hit: dict[int, datetime] = {}
+
+    def hit(self, word_id: int) -> None:
+        self.counts[word_id] += 1
+        self.last_hit[word_id] = datetime.now(tz=timezone.utc)
+
+    def pending(self, word_id: int) -> int:
+        return self.counts.get(word_id, 0)
+
+    def take(self) -> tuple[Counter[int], dict[int, datetime]]:
+        counts, last_hit = self.counts, self.last_hit
+        self.counts, self.last_hit = Counter(), {}
+        return counts, last_hit
+
+    def restore(self, counts: Counter[int], last_hit: dict[int, datetime]) -> None:
+        self.counts.update(counts)
+        for word_id, hit_at in last_hit.items():
+            if word_id not in self.last_hit or self.last_hit[word_id] < hit_at:
+                self.last_hit[word_id] = hit_at
+
+
+word_hits = WordHits()
+
+
+def pending_hits(rows: list[dict]):
+    # A word deleted between the hit and the flush must not get its stats row back.
+    # The key share lock makes a concurrent delete wait for the flush or be seen by it.
+    data = values(
+        column("word_id", Integer),
+        column("hits", BigInteger),
+        column("last_hit_at", DateTime(timezone=True)),
+        name="pending_hits",
+    ).data([(row["word_id"], row["hits"], row["last_hit_at"]) for row in rows])
+    return (
+        select(data.c.word_id, data.c.hits, data.c.last_hit_at)
+        .join(ProhibitedWord, ProhibitedWord.id == data.c.word_id)
+        .with_for_update(read=True, of=ProhibitedWord, key_share=True)
+    )
+
+
+async def flush_word_hits(sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    counts, last_hit = word_hits.take()
+    if not counts:
+        return 0
+    # Sorted, so replicas flushing at the same time lock rows in the same order.
+    rows = [
+        {"word_id": word_id, "hits": counts[word_id], "last_hit_at": last_hit[word_id]}
+        for word_id in sorted(counts)
+    ]
+    try:
+        async with sessionmaker() as session:
+            for start in range(0, len(rows), FLUSH_CHUNK):
+                stmt = pg_insert(ProhibitedWordStat).from_select(
+                    ["word_id", "hits", "last_hit_at"], pending_hits(rows[start : start + FLUSH_CHUNK])
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["word_id"],
+                    set_={
+                        "hits": ProhibitedWordStat.hits + stmt.excluded.hits,
+                        "last_hit_at": func.greatest(ProhibitedWordStat.last_hit_at, stmt.excluded.last_hit_at),
+                    },
+                )
+                await session.execute(stmt)
+            await session.commit()
+    except Exception:
+        # Counted again with the next flush.
+        word_hits.restore(counts, last_hit)
+        raise
+    metrics.counter("word_hits_flushed_total").inc(sum(counts.values()))
+    return len(rows)
+
+
+async def word_stats_flusher(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    # Every process that matches messages keeps its own counts, so this runs everywhere.
+    while True:
+        await asyncio.sleep(settings.WORD_STATS_FLUSH_INTERVAL_SEC)
+        try:
+            await flush_word_hits(sessionmaker)
+        except Exception:
+            logger.exception("Word hit flush failed")
+
+
+@dataclass
+class WordUsage:
+    id: int
+    word: str
+    original: str
+    hits: int
+    last_hit_at: datetime | None
+
+
+async def get_word_hits(session: AsyncSession, word_id: int) -> tuple[int, datetime | None]:
+    stat = await session.get(ProhibitedWordStat, word_id)
+    stored = stat.hits if stat else 0
+    return stored + word_hits.pending(word_id), stat.last_hit_at if stat else None
+
+
+def usage_query(group_id: int):
+    return (
+        select(
+            ProhibitedWord.id,
+            ProhibitedWord.word,
+            func.coalesce(ProhibitedWord.original, ProhibitedWord.word),
+            func.coalesce(ProhibitedWordStat.hits, 0),
+            ProhibitedWordStat.last_hit_at,
+        )
+        .outerjoin(ProhibitedWordStat, ProhibitedWordStat.word_id == ProhibitedWord.id)
+        .where(ProhibitedWord.group_id == group_id, ProhibitedWord.enabled.is_(True))
+    )
+
+
+async def noisiest_words(session: AsyncSession, group_id: int, limit: int) -> list[WordUsage]:
+    result = await session.execute(
+        usage_query(group_id).order_by(func.coalesce(ProhibitedWordStat.hits, 0).desc(), ProhibitedWord.word).limit(limit)
+    )
+    return [WordUsage(*row) for row in result.all()]
+
+
+def unused_condition(now: datetime, days: int):
+    # Words added within the window have not had the chance to match yet.
+    cutoff = now - timedelta(days=days)
+    return and_(
+        ProhibitedWord.created_at < cutoff,
+        or_(ProhibitedWordStat.last_hit_at.is_(None), ProhibitedWordStat.last_hit_at < cutoff),
+    )
+
+
+async def unused_words(session: AsyncSession, group_id: int, days: int, now: datetime) -> list[WordUsage]:
+    result = await session.execute(
+        usage_query(group_id).where(unused_condition(now, days)).order_by(ProhibitedWord.word)
+    )
+    return [WordUsage(*row) for row in result.all()]
+
+
+async def disable_unused_words(session: AsyncSession, group_id: int, days: int, now: datetime) -> int:
+    unused = select(ProhibitedWord.id).outerjoin(
+        ProhibitedWordStat, ProhibitedWordStat.word_id == ProhibitedWord.id
+    ).where(ProhibitedWord.group_id == group_id, ProhibitedWord.enabled.is_(True), unused_condition(now, days))
+    result = await session.execute(
+        update(ProhibitedWord).where(ProhibitedWord.id.in_(unused)).values(enabled=False)
+    )
+    await session.commit()
+    return result.rowcount or 0
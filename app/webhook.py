@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.config import settings
+from app.security import sign
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def get_webhook_secret() -> str:
+    if settings.WEBHOOK_SECRET:
+        return settings.WEBHOOK_SECRET
+    # Telegram accepts [A-Za-z0-9_-]{1,256}, which is exactly the urlsafe base64 alphabet.
+    return sign(settings.SECRET_KEY, "webhook", length=24)
+
+
+def build_webhook_app(bot: Bot, dp: Dispatcher) -> web.Application:
+    app = web.Application()
+    started_at = time.monotonic()
+
+    async def health(_request: web.Request) -> web.Response:
+        payload = {"status": "ok", "mode": "webhook", "uptime_sec": int(time.monotonic() - started_at)}
+        elector = dp.get("leader_elector")
+        if elector is not None:
+            payload["leader"] = elector.is_leader
+        return web.json_response(payload)
+
+    async def metrics_endpoint(_request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render_text(), content_type="text/plain")
+
+    app.router.add_get(settings.WEBHOOK_HEALTH_PATH, health)
+    app.router.add_get("/metrics", metrics_endpoint)
+
+    handler = SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=get_webhook_secret())
+    handler.register(app, path=settings.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, stop: asyncio.Event) -> None:
+    app = build_webhook_app(bot, dp)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+    logger.info(
+        "Webhook server listening on %s:%s%s",
+        settings.WEBHOOK_HOST,
+        settings.WEBHOOK_PORT,
+        settings.WEBHOOK_PATH,
+    )
+
+    if settings.WEBHOOK_BASE_URL:
+        url = settings.WEBHOOK_BASE_URL.rstrip("/") + settings.WEBHOOK_PATH
+        await bot.set_webhook(
+            url=url,
+            secret_token=get_webhook_secret(),
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook registered url=%s", url)
+    else:
+        logger.warning("WEBHOOK_BASE_URL is not set; webhook not registered with Telegram")
+
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Stopping webhook server")
+        await runner.cleanup()
@@ -0,0 +1,148 @@
+"""Per-call latency of the ORM queries versus the asyncpg fast path.
+
+Runs each per-message query (approval check, session lookup, profile upsert, AI
+cooldown claim) sequentially against a scratch database and prints p50/p99 in
+microseconds. Seeds its own rows under a negative user id range and removes them.
+
+Requires DATABASE_URL to point at a scratch Postgres database (migrations applied):
+
+    python -m benchmarks.fastpath_latency --calls 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from aiogram.types import User
+from sqlalchemy import delete
+
+from app.db.fastpath import fastpath
+from app.db.models import ApprovedMember, SessionState, UserProfile, VerificationSession
+from app.db.session import AsyncSessionLocal, engine
+from app.services.user_profiles import get_profile, upsert_profile
+from app.services.verification import get_active_session, is_approved, upsert_session
+
+GROUP_ID = -1
+FIRST_USER_ID = -10_000
+USERS = 100
+
+
+def users() -> list[User]:
+    return [
+        User(id=FIRST_USER_ID - index, is_bot=False, first_name="bench", username=f"bench{index}")
+        for index in range(USERS)
+    ]
+
+
+async def seed() -> None:
+    now = datetime.now(tz=timezone.utc)
+    async with AsyncSessionLocal() as session:
+        for user in users():
+            await upsert_profile(session, user)
+            await upsert_session(session, GROUP_ID, user.id)
+            session.add(ApprovedMember(group_id=GROUP_ID, user_id=user.id, approved_at=now))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    ids = [user.id for user in users()]
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(ApprovedMember).where(ApprovedMember.user_id.in_(ids)))
+        await session.execute(delete(VerificationSession).where(VerificationSession.user_id.in_(ids)))
+        await session.execute(delete(UserProfile).where(UserProfile.user_id.in_(ids)))
+        await session.commit()
+
+
+async def orm_is_approved(user: User) -> None:
+    async with AsyncSessionLocal() as session:
+        await is_approved(session, GROUP_ID, user.id)
+
+
+async def orm_session_state(user: User) -> None:
+    async with AsyncSessionLocal() as session:
+        item = await get_active_session(session, GROUP_ID, user.id)
+        _ = item.state == SessionState.CONFIRMED_UNLOCKED if item else None
+
+
+async def orm_upsert_profile(user: User) -> None:
+    async with AsyncSessionLocal() as session:
+        await upsert_profile(session, user)
+        await session.commit()
+
+
+async def orm_claim_ai_check(user: User) -> None:
+    now = datetime.now(tz=timezone.utc)
+    async with AsyncSessionLocal() as session:
+        profile = await get_profile(session, user.id)
+        if profile and (
+            profile.last_ai_check_at is None or now - profile.last_ai_check_at >= timedelta(seconds=0)
+        ):
+            profile.last_ai_check_at = now
+            await session.commit()
+
+
+CASES: list[tuple[str, Callable[[User], Awaitable[None]], Callable[[User], Awaitable[None]]]] = [
+    ("is_approved", orm_is_approved, lambda user: fastpath.is_approved(GROUP_ID, user.id)),
+    ("session_state", orm_session_state, lambda user: fastpath.get_session_state(GROUP_ID, user.id)),
+    (
+        "upsert_profile",
+        orm_upsert_profile,
+        lambda user: fastpath.upsert_profile(user, datetime.now(tz=timezone.utc)),
+    ),
+    (
+        "claim_ai_check",
+        orm_claim_ai_check,
+        lambda user: fastpath.claim_ai_check(user.id, datetime.now(tz=timezone.utc), 0),
+    ),
+]
+
+
+async def measure(func: Callable[[User], Awaitable[None]], calls: int) -> list[float]:
+    population = users()
+    samples = []
+    for index in range(calls):
+        started = time.perf_counter()
+        await func(population[index % len(population)])
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(calls: int, warmup: int) -> None:
+    await fastpath.start()
+    await seed()
+    try:
+        print(f"calls={calls} users={USERS}")
+        print(f"{'query':>16} {'orm p50':>9} {'orm p99':>9} {'fast p50':>9} {'fast p99':>9} {'speedup':>8}")
+        for name, orm_func, fast_func in CASES:
+            await measure(orm_func, warmup)
+            await measure(fast_func, warmup)
+            orm = await measure(orm_func, calls)
+            fast = await measure(fast_func, calls)
+            speedup = statistics.median(orm) / statistics.median(fast)
+            print(
+                f"{name:>16} {percentile(orm, 0.5):>9.0f} {percentile(orm, 0.99):>9.0f} "
+                f"{percentile(fast, 0.5):>9.0f} {percentile(fast, 0.99):>9.0f} {speedup:>7.1f}x"
+            )
+    finally:
+        await cleanup()
+        await fastpath.close()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.warmup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Throughput of the prohibited-word matcher over a synthetic message corpus.
+
+Writes --messages random messages (a --bad share of them containing a listed word) to a
+temporary JSONL file, then runs the offline evaluator (`python -m app.cli evaluate`)
+over it with 1, 2, 4, ... up to --workers processes. No database is needed:
+
+    python -m benchmarks.matcher_throughput --messages 500000 --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import string
+import tempfile
+from pathlib import Path
+
+from app.config import settings
+from app.services.prohibited import parse_words_from_file
+from app.services.word_eval import evaluate_corpus
+
+
+def random_word(rnd: random.Random) -> str:
+    return "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(2, 9)))
+
+
+def write_corpus(path: Path, messages: int, bad: float, words: list[str], seed: int) -> None:
+    rnd = random.Random(seed)
+    vocabulary = [random_word(rnd) for _ in range(5000)]
+    with path.open("w", encoding="utf-8") as corpus:
+        for _ in range(messages):
+            tokens = rnd.choices(vocabulary, k=rnd.randint(3, 30))
+            prohibited = rnd.random() < bad
+            if prohibited:
+                tokens.insert(rnd.randrange(len(tokens) + 1), rnd.choice(words))
+            corpus.write(json.dumps({"text": " ".join(tokens), "prohibited": prohibited}) + "\n")
+
+
+def worker_counts(limit: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def run(messages: int, bad: float, workers: int, words_path: str) -> None:
+    words = parse_words_from_file(words_path)
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = Path(scratch) / "corpus.jsonl"
+        write_corpus(corpus, messages, bad, words, seed=1)
+        print(f"messages={messages} words={len(words)} bad={bad:.0%}")
+        print(f"{'workers':>8} {'msg/s':>10} {'seconds':>8} {'caught':>8}")
+        for count in worker_counts(workers):
+            result = evaluate_corpus(corpus, words, count)
+            caught = result.caught / result.labelled if result.labelled else 0.0
+            print(f"{count:>8} {result.per_second:>10.0f} {result.elapsed:>8.2f} {caught:>8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--bad", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--words", default=settings.PROHIBITED_WORDS_PATH)
+    args = parser.parse_args()
+    run(args.messages, args.bad, args.workers, args.words)
+
+
+if __name__ == "__main__":
+    main()
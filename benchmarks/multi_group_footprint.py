@@ -0,0 +1,151 @@
+"""Memory and throughput of one process serving N groups versus N single-group processes.
+
+Each process builds a group registry from synthetic word lists and feeds synthetic group
+messages through a dispatcher whose handler does what the moderation path does in memory:
+the ManagedGroup lookup plus the keyword match. Database and Bot API calls are left out,
+so the numbers show the per-process overhead and the registry cost. The connection
+column is the pool limit each layout allows against Postgres.
+
+No database is needed:
+
+    python -m benchmarks.multi_group_footprint --groups 50 --words 500 --updates 50000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import string
+import time
+from types import SimpleNamespace
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message, Update
+
+from app.db.models import MatchType
+from app.services.groups import GroupConfig, GroupRegistry, ManagedGroup
+from app.services.prohibited import ProhibitedCache
+
+FAKE_TOKEN = "123456:benchmark"
+FIRST_CHAT_ID = -1_000_000_000_000
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status", encoding="utf-8") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def synthetic_words(count: int, seed: int) -> list[SimpleNamespace]:
+    rnd = random.Random(seed)
+    words = []
+    for _ in range(count):
+        word = "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(5, 10)))
+        words.append(SimpleNamespace(word=word, original=word, match_type=MatchType.TOKEN))
+    return words
+
+
+def build_registry(chat_ids: list[int], words: int) -> GroupRegistry:
+    registry = GroupRegistry(sessionmaker=None)
+    registry.global_words.load(synthetic_words(words, seed=0))
+    for chat_id in chat_ids:
+        cache = ProhibitedCache(sessionmaker=None, group_id=chat_id)
+        cache.load(synthetic_words(words, seed=chat_id))
+        registry.groups[chat_id] = GroupConfig(
+            chat_id=chat_id, title=None, words=cache, global_words=registry.global_words
+        )
+    return registry
+
+
+def synthetic_updates(chat_ids: list[int], count: int) -> list[Update]:
+    rnd = random.Random(1)
+    updates = []
+    for update_id in range(count):
+        text = " ".join(
+            "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9))) for _ in range(12)
+        )
+        updates.append(
+            Update.model_validate(
+                {
+                    "update_id": update_id,
+                    "message": {
+                        "message_id": update_id,
+                        "date": 0,
+                        "chat": {"id": chat_ids[update_id % len(chat_ids)], "type": "supergroup"},
+                        "from": {"id": 1_000 + update_id % 500, "is_bot": False, "first_name": "bench"},
+                        "text": text,
+                    },
+                }
+            )
+        )
+    return updates
+
+
+async def run_dispatcher(registry: GroupRegistry, updates: list[Update]) -> float:
+    bot = Bot(token=FAKE_TOKEN)
+    dp = Dispatcher()
+    dp["group_registry"] = registry
+    router = Router()
+
+    @router.message(ManagedGroup())
+    async def handle(message: Message, group: GroupConfig) -> None:
+        group.match(message.text or "")
+
+    dp.include_router(router)
+    started = time.perf_counter()
+    for update in updates:
+        await dp.feed_update(bot, update)
+    elapsed = time.perf_counter() - started
+    await bot.session.close()
+    return elapsed
+
+
+def serve(chat_ids: list[int], words: int, updates: int, results) -> None:
+    registry = build_registry(chat_ids, words)
+    batch = synthetic_updates(chat_ids, updates)
+    elapsed = asyncio.run(run_dispatcher(registry, batch))
+    results.put((rss_kb(), elapsed))
+
+
+def run_layout(processes: int, groups: int, args: argparse.Namespace) -> tuple[int, float, float]:
+    chat_ids = [FIRST_CHAT_ID - index for index in range(groups)]
+    per_process = [chat_ids[index::processes] for index in range(processes)]
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=serve, args=(ids, args.words, args.updates // processes, results))
+        for ids in per_process
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    samples = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+    total_rss = sum(rss for rss, _ in samples)
+    busy = max(elapsed for _, elapsed in samples)
+    return total_rss, args.updates / busy if busy else 0.0, wall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=50000)
+    args = parser.parse_args()
+
+    from app.db.session import engine
+
+    pool_limit = engine.pool.size() + getattr(engine.pool, "_max_overflow", 0)
+    print(f"groups={args.groups} words/group={args.words} updates={args.updates}")
+    print(f"{'layout':>16} {'rss MB':>8} {'updates/s':>10} {'wall s':>7} {'db conns':>9}")
+    for processes in (1, args.groups):
+        rss, throughput, wall = run_layout(processes, args.groups, args)
+        label = "1 process" if processes == 1 else f"{processes} processes"
+        print(f"{label:>16} {rss / 1024:>8.0f} {throughput:>10.0f} {wall:>7.1f} {pool_limit * processes:>9}")
+
+
+if __name__ == "__main__":
+    main()
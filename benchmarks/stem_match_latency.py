@@ -0,0 +1,76 @@
+"""Per-token cost of STEM matching (prefix trie + Uzbek suffix chain) against exact lookup.
+
+Builds --stems random stems, then looks up --tokens tokens: a --inflected share are
+stems followed by one to three Uzbek suffixes, the rest are random words. Reports the
+time per token and how many inflected tokens each lookup finds. No database is needed:
+
+    python -m benchmarks.stem_match_latency --stems 5000 --tokens 200000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.db.models import MatchType
+from app.services.prohibited import UZBEK_SUFFIXES, ProhibitedEntry, StemTrie
+
+
+def random_word(rnd: random.Random, low: int, high: int) -> str:
+    return "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(low, high)))
+
+
+def build(stems: list[str]) -> tuple[dict[str, ProhibitedEntry], StemTrie]:
+    tokens: dict[str, ProhibitedEntry] = {}
+    trie = StemTrie()
+    for stem in stems:
+        entry = ProhibitedEntry(word=stem, original=stem, match_type=MatchType.STEM)
+        tokens[stem] = entry
+        trie.add(stem, entry)
+    return tokens, trie
+
+
+def sample_tokens(rnd: random.Random, stems: list[str], count: int, inflected: float) -> tuple[list[str], int]:
+    tokens = []
+    expected = 0
+    for _ in range(count):
+        if rnd.random() < inflected:
+            suffixes = rnd.choices(UZBEK_SUFFIXES, k=rnd.randint(1, 3))
+            tokens.append(rnd.choice(stems) + "".join(suffixes))
+            expected += 1
+        else:
+            tokens.append(random_word(rnd, 3, 12))
+    return tokens, expected
+
+
+def timed(lookup, tokens: list[str]) -> tuple[float, int]:
+    started = time.perf_counter()
+    found = 0
+    for token in tokens:
+        if lookup(token) is not None:
+            found += 1
+    return (time.perf_counter() - started) / len(tokens) * 1e9, found
+
+
+def run(stems: int, tokens: int, inflected: float) -> None:
+    rnd = random.Random(1)
+    population = sorted({random_word(rnd, 4, 10) for _ in range(stems)})
+    exact, trie = build(population)
+    sample, expected = sample_tokens(rnd, population, tokens, inflected)
+    print(f"stems={len(population)} tokens={tokens} inflected={expected}")
+    print(f"{'lookup':>8} {'ns/token':>10} {'found':>8}")
+    for label, lookup in (("dict", exact.get), ("trie", trie.find)):
+        per_token, found = timed(lookup, sample)
+        print(f"{label:>8} {per_token:>10.0f} {found:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stems", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=200000)
+    parser.add_argument("--inflected", type=float, default=0.1)
+    args = parser.parse_args()
+    run(args.stems, args.tokens, args.inflected)
+
+
+if __name__ == "__main__":
+    main()
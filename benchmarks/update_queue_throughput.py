@@ -0,0 +1,159 @@
+"""Throughput of the shared update queue as worker processes are added.
+
+Enqueues synthetic group messages for a number of users, then drains the queue
+with 1..N worker processes whose handler simulates I/O with a sleep. Checks that
+each user's updates were started in enqueue order across all workers.
+
+Requires DATABASE_URL to point at a scratch Postgres database (migrations applied):
+
+    python -m benchmarks.update_queue_throughput --updates 5000 --users 500 --workers 1,2,4,8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, timezone
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+from sqlalchemy import func, insert, select, text
+
+from app.db.models import QueuedUpdate
+from app.services.update_queue import UpdateQueueWorker
+from app.services.update_scheduler import UpdatePriority
+
+FAKE_TOKEN = "123456:benchmark"
+
+
+def synthetic_rows(updates: int, users: int) -> list[dict]:
+    now = datetime.now(tz=timezone.utc)
+    rows = []
+    for update_id in range(updates):
+        user_id = 1_000_000 + update_id % users
+        rows.append(
+            {
+                "update_id": update_id,
+                "shard_key": user_id,
+                "priority": int(UpdatePriority.LOW),
+                "payload": {
+                    "update_id": update_id,
+                    "message": {
+                        "message_id": update_id,
+                        "date": int(now.timestamp()),
+                        "chat": {"id": -1001, "type": "supergroup"},
+                        "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+                        "text": str(update_id),
+                    },
+                },
+                "enqueued_at": now,
+            }
+        )
+    return rows
+
+
+async def _worker_main(handler_ms: int, concurrency: int, results) -> None:
+    from app.db.session import AsyncSessionLocal
+
+    bot = Bot(token=FAKE_TOKEN)
+    dp = Dispatcher()
+    router = Router()
+    started: list[tuple[int, int, float]] = []
+
+    @router.message()
+    async def handle(message: Message) -> None:
+        started.append((message.from_user.id, int(message.text), time.time()))
+        await asyncio.sleep(handler_ms / 1000)
+
+    dp.include_router(router)
+    worker = UpdateQueueWorker(
+        bot=bot,
+        dp=dp,
+        sessionmaker=AsyncSessionLocal,
+        concurrency=concurrency,
+        poll_interval_sec=0.05,
+        visibility_timeout_sec=300,
+    )
+    stop = asyncio.Event()
+
+    async def stop_when_empty() -> None:
+        while True:
+            await asyncio.sleep(0.5)
+            async with AsyncSessionLocal() as session:
+                remaining = await session.scalar(select(func.count()).select_from(QueuedUpdate))
+            if not remaining:
+                stop.set()
+                return
+
+    watcher = asyncio.create_task(stop_when_empty())
+    await worker.run(stop)
+    await watcher
+    await bot.session.close()
+    results.put(started)
+
+
+def worker_process(handler_ms: int, concurrency: int, results) -> None:
+    asyncio.run(_worker_main(handler_ms, concurrency, results))
+
+
+async def prepare(updates: int, users: int) -> None:
+    from app.db.session import AsyncSessionLocal, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: QueuedUpdate.__table__.create(sync_conn, checkfirst=True))
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE update_queue"))
+        rows = synthetic_rows(updates, users)
+        for start in range(0, len(rows), 1000):
+            await session.execute(insert(QueuedUpdate), rows[start:start + 1000])
+        await session.commit()
+    await engine.dispose()
+
+
+def run_round(workers: int, args: argparse.Namespace) -> tuple[float, bool]:
+    asyncio.run(prepare(args.updates, args.users))
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker_process, args=(args.handler_ms, args.concurrency, results))
+        for _ in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    records: list[tuple[int, int, float]] = []
+    for _ in processes:
+        records.extend(results.get())
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = True
+    by_user: dict[int, list[tuple[float, int]]] = {}
+    for user_id, seq, ts in records:
+        by_user.setdefault(user_id, []).append((ts, seq))
+    for items in by_user.values():
+        seqs = [seq for _, seq in sorted(items)]
+        if seqs != sorted(seqs):
+            ordered = False
+            break
+    return elapsed, ordered and len(records) == args.updates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--handler-ms", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"updates={args.updates} users={args.users} handler={args.handler_ms}ms concurrency={args.concurrency}")
+    print(f"{'workers':>8} {'seconds':>9} {'updates/s':>10} {'ordered':>8}")
+    for workers in [int(item) for item in args.workers.split(",") if item.strip()]:
+        elapsed, ordered = run_round(workers, args)
+        print(f"{workers:>8} {elapsed:>9.2f} {args.updates / elapsed:>10.0f} {str(ordered):>8}")
+
+
+if __name__ == "__main__":
+    main()
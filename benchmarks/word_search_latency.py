@@ -0,0 +1,123 @@
+"""Latency of the admin word search and duplicate suggestions on a large word list.
+
+Seeds --words random words under a scratch scope, then times substring/fuzzy search
+(`search_words`) and near-match lookup (`similar_words`) for random queries, with the
+trigram index and with index scans disabled (the old sequential scan). Seeded rows are
+removed at the end.
+
+Requires DATABASE_URL to point at a scratch Postgres database (migrations applied):
+
+    python -m benchmarks.word_search_latency --words 100000 --queries 200
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.models import MatchType, ProhibitedWord
+from app.db.session import AsyncSessionLocal, engine
+from app.services.prohibited import search_words, similar_words
+
+SCOPE = -2
+# Seven columns per row; stays under the 32767 bind parameter limit.
+CHUNK = 4000
+
+
+def random_words(count: int, seed: int) -> list[str]:
+    rnd = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(5, 12))))
+    return sorted(words)
+
+
+async def seed(words: list[str]) -> None:
+    now = datetime.now(tz=timezone.utc)
+    async with AsyncSessionLocal() as session:
+        for start in range(0, len(words), CHUNK):
+            rows = [
+                {
+                    "word": word,
+                    "original": word,
+                    "enabled": True,
+                    "match_type": MatchType.TOKEN,
+                    "created_at": now,
+                    "created_by": 0,
+                    "group_id": SCOPE,
+                }
+                for word in words[start : start + CHUNK]
+            ]
+            await session.execute(pg_insert(ProhibitedWord).values(rows).on_conflict_do_nothing())
+        await session.commit()
+        await session.execute(text("ANALYZE prohibited_words"))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(ProhibitedWord).where(ProhibitedWord.group_id == SCOPE))
+        await session.commit()
+
+
+async def measure(queries: list[str], use_index: bool) -> tuple[list[float], list[float]]:
+    search, similar = [], []
+    async with AsyncSessionLocal() as session:
+        if not use_index:
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+            await session.execute(text("SET LOCAL enable_indexscan = off"))
+        for query in queries:
+            started = time.perf_counter()
+            await search_words(session, SCOPE, query)
+            search.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            await similar_words(session, SCOPE, query)
+            similar.append((time.perf_counter() - started) * 1000)
+    return search, similar
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(words: int, queries: int) -> None:
+    population = random_words(words, seed=1)
+    rnd = random.Random(2)
+    # Substrings of existing words and slightly misspelled words.
+    sample = []
+    for word in rnd.sample(population, queries):
+        if rnd.random() < 0.5:
+            sample.append(word[1:-1])
+        else:
+            index = rnd.randrange(len(word))
+            sample.append(word[:index] + rnd.choice(string.ascii_lowercase) + word[index + 1 :])
+    await seed(population)
+    try:
+        print(f"words={words} queries={queries}")
+        print(f"{'plan':>10} {'search p50':>11} {'p99':>8} {'similar p50':>12} {'p99':>8}  (ms)")
+        for label, use_index in (("trigram", True), ("seq scan", False)):
+            search, similar = await measure(sample, use_index)
+            print(
+                f"{label:>10} {percentile(search, 0.5):>11.2f} {percentile(search, 0.99):>8.2f} "
+                f"{percentile(similar, 0.5):>12.2f} {percentile(similar, 0.99):>8.2f}"
+            )
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.words, args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Chat, Message, Update, User
+
+from app.services.degradation import DegradationLevel
+from app.services.startup_drain import StartupDrain
+from app.services.update_scheduler import UpdateScheduler
+
+
+def group_message(update_id: int, user: User, age: timedelta) -> Update:
+    chat = Chat(id=-100, type="supergroup")
+    date = datetime.now(tz=timezone.utc) - age
+    message = Message(message_id=update_id, date=date, chat=chat, from_user=user, text="hi")
+    return Update(update_id=update_id, message=message)
+
+
+def test_fresh_update_finishing_first_does_not_end_the_drain_for_queued_stale_ones():
+    async def scenario() -> tuple[dict[int, DegradationLevel], StartupDrain]:
+        drain = StartupDrain(max_age_sec=300, mode="keyword", max_duration_sec=600)
+        dp = Dispatcher()
+        # Same order as app.main: the drain sees updates as they arrive.
+        dp.update.outer_middleware(drain)
+        dp.update.outer_middleware(UpdateScheduler(lanes=1, concurrency=4))
+        router = Router()
+        release = asyncio.Event()
+        levels: dict[int, DegradationLevel] = {}
+
+        @router.message()
+        async def moderate(message: Message, degradation_level: DegradationLevel = DegradationLevel.NORMAL) -> None:
+            if message.message_id == 1:
+                await release.wait()
+            levels[message.message_id] = degradation_level
+
+        dp.include_router(router)
+        bot = Bot(token="123:abc")
+        busy = User(id=1, is_bot=False, first_name="busy")
+        idle = User(id=2, is_bot=False, first_name="idle")
+        stale = timedelta(hours=1)
+        # Two stale messages queue behind each other; a fresh one from another user
+        # arrives last but is handled first.
+        first = asyncio.create_task(dp.feed_update(bot, group_message(1, busy, stale)))
+        second = asyncio.create_task(dp.feed_update(bot, group_message(2, busy, stale)))
+        await asyncio.sleep(0)
+        await dp.feed_update(bot, group_message(3, idle, timedelta(0)))
+        release.set()
+        await asyncio.gather(first, second)
+        await bot.session.close()
+        return levels, drain
+
+    levels, drain = asyncio.run(scenario())
+    assert levels[3] == DegradationLevel.NORMAL
+    assert levels[1] == levels[2] == DegradationLevel.KEYWORD_ONLY
+    assert not drain.active
+    assert drain.fast_forwarded == 2
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timezone
+
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from app.services.update_scheduler import UpdateScheduler
+
+
+def group_message(update_id: int, user: User) -> Update:
+    chat = Chat(id=-100, type="supergroup")
+    message = Message(message_id=update_id, date=datetime.now(tz=timezone.utc), chat=chat, from_user=user, text="hi")
+    return Update(update_id=update_id, message=message)
+
+
+def callback(update_id: int, user: User) -> Update:
+    query = CallbackQuery(id=str(update_id), from_user=user, chat_instance="x", data="agree")
+    return Update(update_id=update_id, callback_query=query)
+
+
+def test_high_priority_update_overtakes_queued_low_work_in_the_same_lane():
+    async def scenario() -> list[int]:
+        # One lane: every user shares it. Low-priority moderation may use one slot.
+        scheduler = UpdateScheduler(lanes=1, concurrency=2, low_priority_share=0.5)
+        release = asyncio.Event()
+        finished: list[int] = []
+
+        async def handler(update: Update, data: dict) -> None:
+            if update.message is not None:
+                await release.wait()
+            finished.append(update.update_id)
+
+        low = [
+            asyncio.create_task(
+                scheduler(handler, group_message(index, user), {"event_from_user": user})
+            )
+            for index, user in enumerate((User(id=uid, is_bot=False, first_name="u") for uid in (1, 2, 3)), start=1)
+        ]
+        await asyncio.sleep(0)
+        verifier = User(id=4, is_bot=False, first_name="v")
+        await asyncio.wait_for(scheduler(handler, callback(10, verifier), {"event_from_user": verifier}), 1)
+        release.set()
+        await asyncio.gather(*low)
+        return finished
+
+    assert asyncio.run(scenario())[0] == 10
+
+
+def test_updates_of_one_user_keep_arrival_order_across_classes():
+    async def scenario() -> list[int]:
+        scheduler = UpdateScheduler(lanes=4, concurrency=4)
+        user = User(id=7, is_bot=False, first_name="u")
+        finished: list[int] = []
+
+        async def handler(update: Update, data: dict) -> None:
+            # The first (low) update is the slowest; the callback must still wait for it.
+            await asyncio.sleep(0.01 if update.update_id == 1 else 0)
+            finished.append(update.update_id)
+
+        await asyncio.gather(
+            scheduler(handler, group_message(1, user), {"event_from_user": user}),
+            scheduler(handler, callback(2, user), {"event_from_user": user}),
+        )
+        assert scheduler.pending == 0
+        assert not scheduler.lanes[user.id % 4].users
+        return finished
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_concurrency_is_not_limited_by_the_lane_count():
+    async def scenario() -> int:
+        scheduler = UpdateScheduler(lanes=1, concurrency=3, low_priority_share=1.0)
+        running = 0
+        peak = 0
+
+        async def handler(update: Update, data: dict) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        users = [User(id=uid, is_bot=False, first_name="u") for uid in (1, 2, 3)]
+        await asyncio.gather(
+            *(scheduler(handler, group_message(user.id, user), {"event_from_user": user}) for user in users)
+        )
+        return peak
+
+    assert asyncio.run(scenario()) == 3